@@ -0,0 +1,121 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional
+
+from common import create_league, parse_args
+from get_draft_data import display_draft_recap
+from get_keeper_analysis import analyze_keepers
+from get_rosters import display_rosters
+from league_cache import print_cache_stats
+from transport import set_rate_limit
+
+REPORTS = ("rosters", "draft", "keeper-analysis")
+
+# Leagues processed at the same time.
+DEFAULT_BATCH_WORKERS = 8
+# Requests per second allowed across all leagues.
+DEFAULT_BATCH_RATE_LIMIT = 10.0
+
+
+class LeagueCredentials(NamedTuple):
+    league_id: int
+    espn_s2: Optional[str]
+    swid: Optional[str]
+
+
+def read_leagues(path: str, default_s2: str = None, default_swid: str = None) -> List[LeagueCredentials]:
+    """
+    Reads one league per line: `league_id[,espn_s2,swid]`. Blank lines and lines
+    starting with # are ignored; leagues without cookies use the defaults.
+    """
+    leagues = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = [field.strip() for field in line.split(",")]
+            espn_s2 = fields[1] if len(fields) > 2 else default_s2
+            swid = fields[2] if len(fields) > 2 else default_swid
+            leagues.append(LeagueCredentials(int(fields[0]), espn_s2, swid))
+    return leagues
+
+
+def run_league(creds: LeagueCredentials, season: int, reports: List[str], output_dir: str) -> str:
+    """Loads one league season and writes each requested report as a CSV file."""
+    prefix = os.path.join(output_dir, f"{creds.league_id}_{season}")
+    league = None
+    if "rosters" in reports or "draft" in reports:
+        league = create_league(creds.league_id, season, espn_s2=creds.espn_s2, swid=creds.swid, roster_only=True)
+    if "rosters" in reports:
+        display_rosters(league, f"{prefix}_rosters.csv")
+    if "draft" in reports:
+        display_draft_recap(league, f"{prefix}_draft.csv")
+    if "keeper-analysis" in reports:
+        # Seasons of one league are loaded one at a time; parallelism comes from running leagues side by side
+        analyze_keepers(f"{prefix}_keeper_analysis.csv", max_workers=1, league_id=creds.league_id,
+                        espn_s2=creds.espn_s2, swid=creds.swid, latest_season=season)
+    return prefix
+
+
+def run_batch(leagues: List[LeagueCredentials], season: int, reports: List[str], output_dir: str,
+              max_workers: int = DEFAULT_BATCH_WORKERS):
+    """Runs the reports for many leagues in parallel over the shared, rate-limited HTTP session."""
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.monotonic()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(run_league, creds, season, reports, output_dir): creds for creds in leagues}
+        for future in as_completed(futures):
+            creds = futures[future]
+            try:
+                print(f"League {creds.league_id}: reports written to {future.result()}_*.csv")
+            except Exception as e:
+                failures += 1
+                print(f"League {creds.league_id}: failed. Error: {e}")
+
+    elapsed = time.monotonic() - start
+    print(f"\nProcessed {len(leagues)} leagues in {elapsed:.1f} seconds ({failures} failed).")
+
+
+def main():
+    """Main function to run reports for a list of leagues."""
+    parser = argparse.ArgumentParser(description="Run reports for many leagues in one process.")
+    parser.add_argument("leagues", nargs="*", type=int, help="League IDs to process.")
+    parser.add_argument("--file", help="File with one `league_id[,espn_s2,swid]` per line.")
+    parser.add_argument("--season", type=int, default=int(os.environ.get("SEASON_ID", 0)) or None,
+                        help="Season to report on (default: SEASON_ID).")
+    parser.add_argument("--reports", default="rosters,draft",
+                        help=f"Comma-separated reports to write: {', '.join(REPORTS)} (default: rosters,draft).")
+    parser.add_argument("--output-dir", default="reports", help="Directory for the report files (default: reports).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help=f"Leagues processed at once (default: {DEFAULT_BATCH_WORKERS}).")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_BATCH_RATE_LIMIT,
+                        help=f"Maximum requests per second across all leagues (default: {DEFAULT_BATCH_RATE_LIMIT}).")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve all ESPN data from the local cache without touching the network.")
+    args = parse_args(parser)
+
+    reports = [report.strip() for report in args.reports.split(",") if report.strip()]
+    unknown = [report for report in reports if report not in REPORTS]
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}")
+    if args.season is None:
+        parser.error("--season is required when SEASON_ID is not set")
+
+    default_s2, default_swid = os.environ.get("ESPN_S2"), os.environ.get("SWID")
+    leagues = [LeagueCredentials(league_id, default_s2, default_swid) for league_id in args.leagues]
+    if args.file:
+        leagues += read_leagues(args.file, default_s2, default_swid)
+    if not leagues:
+        parser.error("give league IDs on the command line or with --file")
+
+    set_rate_limit(args.rate_limit)
+    run_batch(leagues, args.season, reports, args.output_dir, max_workers=args.workers)
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
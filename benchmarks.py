@@ -0,0 +1,374 @@
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+from common import create_league
+from draft_analytics import DraftAnalytics
+from draft_simulator import PickModel, board_from_draft_detail, simulate_scenarios
+from draft_store import DraftStore
+from get_draft_data import display_draft_recap
+from get_keeper_analysis import analyze_keepers
+from get_keepers import LEAGUE_YEAR, display_keepers
+from get_rosters import display_rosters
+from keeper_optimizer import KeeperCandidate, optimize_keepers
+from keeper_parser import extract_keeper_teams
+from keeper_streaks import keeper_counts, store_streaks
+from player_index import reset_player_index
+from replay import KEEPER_SAMPLE, replaying, synthesize_fixtures
+from weekly_stats import POINTS, PROJECTED, WeeklyStats
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> Tuple[float, int]:
+    """
+    Runs func `repeat` times and returns (best wall time in ms, peak traced memory in KB).
+
+    Timing and memory are measured on separate runs, since tracemalloc slows
+    allocation-heavy code down considerably.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000, peak // 1024
+
+
+def print_result(label: str, elapsed_ms: float, peak_kb: int):
+    print(f"{label:<45} {elapsed_ms:>10.1f} ms {peak_kb:>10} KB peak")
+
+
+def _scaled_keeper_file(scale: int) -> str:
+    """
+    Returns the path of a keeper payload with the sample's teams repeated `scale` times
+    (e.g. 2 -> a 20-team league). Scale 1 is the recorded sample itself.
+    """
+    if scale <= 1:
+        return KEEPER_SAMPLE
+    with open(KEEPER_SAMPLE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["teams"] = [dict(team, id=team["id"] + copy * 100) for copy in range(scale) for team in data["teams"]]
+    path = os.path.join(tempfile.gettempdir(), f"keeper_response_x{scale}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+def bench_keeper_parse(scale: int = 1):
+    """Compares the streaming keeper extraction with a full json.load of the mKeeperRosters payload."""
+    path = _scaled_keeper_file(scale)
+    print(f"\nmKeeperRosters parse ({os.path.getsize(path) // 1024} KB payload, scale x{scale}):")
+
+    def full_parse() -> Dict:
+        with open(path, "rb") as f:
+            data = json.load(f)
+        return {team["id"]: team.get("draftStrategy", {}).get("keeperPlayerIds", []) for team in data["teams"]}
+
+    def streaming_parse() -> Dict:
+        with open(path, "rb") as f:
+            return extract_keeper_teams(f)
+
+    print_result("json.load (full object tree)", *measure(full_parse))
+    print_result("extract_keeper_teams (streaming)", *measure(streaming_parse))
+
+
+def synthetic_store(leagues: int, seasons: int, teams: int = 12, rounds: int = 16, keepers: int = 3,
+                    keep_rate: float = 0.6, seed: int = 0) -> DraftStore:
+    """
+    Builds a DraftStore of random drafts for many leagues at once. Team IDs are
+    numbered league * 100 + team so leagues never collide, and each team re-keeps
+    each of its previous picks in the first `keepers` rounds with probability `keep_rate`.
+    """
+    rng = random.Random(seed)
+    store = DraftStore()
+    next_player = 1
+    kept = defaultdict(list)
+    for season in range(2025 - seasons + 1, 2026):
+        next_kept = defaultdict(list)
+        # Seasons are added in order so each season's picks stay contiguous in the store
+        for league in range(leagues):
+            overall = 0
+            for round_num in range(1, rounds + 1):
+                for team in range(league * 100, league * 100 + teams):
+                    overall += 1
+                    if round_num <= len(kept[team]):
+                        player_id, keeper = kept[team][round_num - 1], True
+                    else:
+                        player_id, keeper = next_player, False
+                        next_player += 1
+                    store.add_pick(season, overall, round_num, team, player_id, keeper)
+                    if round_num <= keepers and rng.random() < keep_rate:
+                        next_kept[team].append(player_id)
+        kept = next_kept
+    return store
+
+
+def _legacy_current_streaks(store: DraftStore, latest_season: int) -> Dict[int, int]:
+    """The per-player sort-and-walk streak loop that get_keeper_analysis used before keeper_streaks."""
+    history = defaultdict(list)
+    for pick in store.keeper_picks():
+        history[pick.player_id].append(pick)
+    streaks = {}
+    for player_id, picks in history.items():
+        picks.sort(key=lambda pick: pick.season, reverse=True)
+        if picks[0].season != latest_season:
+            continue
+        streak = 1
+        for i in range(1, len(picks)):
+            if picks[i].season == picks[i - 1].season - 1 and picks[i].team_id == picks[0].team_id:
+                streak += 1
+            else:
+                break
+        streaks[player_id] = streak
+    return streaks
+
+
+def bench_keeper_streaks(scale: int = 1):
+    """Times the batched keeper-streak engine on synthetic multi-league, multi-decade keeper data."""
+    leagues, seasons = 50 * scale, 30
+    store = synthetic_store(leagues, seasons)
+    keeper_total = sum(store.pick_keeper)
+    print(f"\nKeeper streaks ({leagues} leagues x {seasons} seasons, {keeper_total} keeper picks):")
+    latest = 2025
+
+    print_result("legacy per-player sort and walk (current only)", *measure(lambda: _legacy_current_streaks(store, latest)))
+    print_result("store_streaks (current, longest, broken)", *measure(lambda: store_streaks(store, latest)))
+    print_result("keeper_counts (per team and season)", *measure(lambda: keeper_counts(store)))
+
+
+def bench_keeper_optimizer(scale: int = 1):
+    """Times the keeper-set optimizer on random rosters of 20+ candidates per team."""
+    rng = random.Random(0)
+    rounds = 16
+    replacement = {round_num: 200.0 - 10 * round_num for round_num in range(1, rounds + 1)}
+    for candidates_per_team in (20, 30 * scale):
+        teams = [
+            [KeeperCandidate(player, f"Player {player}", "RB", rng.randint(1, rounds), rng.uniform(0, 300))
+             for player in range(candidates_per_team)]
+            for _ in range(12)
+        ]
+        print(f"\nKeeper optimizer (12 teams x {candidates_per_team} candidates, {rounds} rounds):")
+        for max_keepers in (3, 5):
+            for allow_earlier in (False, True):
+                label = f"{max_keepers} keepers, {'earlier rounds allowed' if allow_earlier else 'own round only'}"
+                elapsed, peak = measure(lambda: [optimize_keepers(team, replacement, max_keepers, allow_earlier)
+                                                 for team in teams])
+                print_result(f"{label} (per league)", elapsed, peak)
+
+
+def synthetic_weekly_stats(players: int, weeks: int = 17, season: int = 2024, seed: int = 0) -> WeeklyStats:
+    """Builds a WeeklyStats store of random scoring, with about one week in eight missed."""
+    rng = random.Random(seed)
+    positions = ("QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "D/ST")
+    store = WeeklyStats(season, weeks)
+    for player_id in range(1, players + 1):
+        position = positions[player_id % len(positions)]
+        mean = rng.uniform(2, 22)
+        for week in range(1, weeks + 1):
+            store.set(player_id, week, PROJECTED, round(mean, 2), position)
+            if rng.random() > 0.125:
+                store.set(player_id, week, POINTS, round(max(0.0, rng.gauss(mean, mean / 2)), 2), position)
+    return store
+
+
+def bench_weekly_stats(scale: int = 1):
+    """Times weekly-stat ingestion from the recorded sample and the per-player aggregates on synthetic seasons."""
+    with open(KEEPER_SAMPLE, "r", encoding="utf-8") as f:
+        sample = json.load(f)
+    entries = sum(len(team["roster"]["entries"]) for team in sample["teams"])
+    print(f"\nWeekly stats ({entries} rostered players in the recorded sample):")
+
+    def ingest() -> WeeklyStats:
+        store = WeeklyStats(sample["seasonId"])
+        store.add_payload(sample)
+        return store
+
+    print_result("add_payload (mKeeperRosters sample)", *measure(ingest))
+
+    players = 2000 * scale
+    store = synthetic_weekly_stats(players)
+    print(f"\nWeekly stat aggregates ({players} players x {store.weeks} weeks):")
+    print_result("aggregates (PPG, std dev, PAR)", *measure(lambda: store.aggregates(teams=12)))
+    print_result("rolling_average (every player)",
+                 *measure(lambda: [store.rolling_average(player_id) for player_id in store.player_ids]))
+
+
+def bench_draft_analytics(scale: int = 1):
+    """Times the draft-history analytics on random season points over synthetic drafts."""
+    rng = random.Random(0)
+    positions = ("QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "D/ST")
+    for leagues, seasons in ((1, 10), (10 * scale, 10)):
+        store = synthetic_store(leagues, seasons)
+        points = {(season, player_id): rng.uniform(0, 350)
+                  for season, player_id in zip(store.pick_season, store.pick_player)}
+        player_positions = {player_id: positions[player_id % len(positions)] for player_id in store.pick_player}
+        print(f"\nDraft analytics ({leagues} x 12-team league x {seasons} seasons, {len(store.pick_player)} picks):")
+        print_result("build (points, finish and value per pick)",
+                     *measure(lambda: DraftAnalytics(store, points, player_positions)))
+        analytics = DraftAnalytics(store, points, player_positions)
+        print_result("adp", *measure(analytics.adp))
+        print_result("hit_rates (round x position)", *measure(analytics.hit_rates))
+        print_result("team_profiles", *measure(analytics.team_profiles))
+
+
+def bench_draft_simulator(scale: int = 1):
+    """
+    Times keeper-scenario simulations on the sample league's draft board, with a
+    random player pool whose ADP follows its points.
+    """
+    rng = random.Random(0)
+    with open(KEEPER_SAMPLE, "r", encoding="utf-8") as f:
+        board = board_from_draft_detail(json.load(f).get("draftDetail", {}))
+    positions = ("QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "D/ST")
+    players = 2 * len(board) + 100
+    points = sorted((rng.uniform(20, 350) for _ in range(players)), reverse=True)
+    model = PickModel(range(players), (positions[i % len(positions)] for i in range(players)),
+                      (i + 1 + rng.gauss(0, 3) for i in range(players)),
+                      (max(2.0, 0.15 * (i + 1)) for i in range(players)), points)
+    # The best players fill the slots the sample reserves for keepers
+    keepers = defaultdict(dict)
+    for player_id, slot in enumerate(slot for slot in board if slot.reserved_for_keeper):
+        keepers[slot.team_id][player_id] = slot.round
+    team_id = board[0].team_id
+    scenarios = {"no keepers": {}, "reserved keepers": keepers[team_id]}
+    simulations = 10000 * scale
+    teams = len({slot.team_id for slot in board})
+    print(f"\nDraft simulator ({teams} teams, {len(board)} picks, {simulations} drafts x {len(scenarios)} scenarios):")
+    for workers in (1, None):
+        label = "one process" if workers == 1 else f"process pool ({os.cpu_count()} CPUs)"
+        print_result(label, *measure(lambda: simulate_scenarios(board, model, team_id, scenarios, keepers,
+                                                                simulations=simulations, workers=workers),
+                                     repeat=1))
+
+
+def _retained_kb(func: Callable[[], object]) -> int:
+    """Returns the memory, in KB, still held by what func returns once it is done."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained // 1024
+
+
+def bench_roster_model(scale: int = 1):
+    """
+    Compares loading many seasons as full espn_api Leagues and as lightweight
+    RosterLeagues, from a warm response cache over replayed fixtures.
+    """
+    last_season = max(LEAGUE_YEAR, datetime.date.today().year - 1)
+    teams, rounds, seasons = 12, 16, 10 * scale
+    saved_cache_dir = os.environ.get("ESPN_CACHE_DIR")
+    with tempfile.TemporaryDirectory() as fixtures, tempfile.TemporaryDirectory() as cache:
+        synthesize_fixtures(fixtures, teams=teams, rounds=rounds, seasons=seasons, last_season=last_season)
+        os.environ["ESPN_CACHE_DIR"] = cache
+        years = range(last_season - seasons + 1, last_season + 1)
+        print(f"\nRoster model ({teams} teams x {rounds} rounds x {seasons} seasons, warm cache):")
+        with replaying(fixtures), contextlib.redirect_stdout(io.StringIO()):
+            for year in years:
+                create_league(1, year)
+        for label, roster_only in (("League", False), ("RosterLeague", True)):
+            def load():
+                return [create_league(1, year, roster_only=roster_only) for year in years]
+            with replaying(fixtures):
+                elapsed_ms, peak_kb = measure(load, repeat=3)
+                print_result(f"load {seasons} seasons as {label}", elapsed_ms, peak_kb)
+                print(f"{'  retained after loading':<45} {_retained_kb(load):>10} KB")
+    if saved_cache_dir is None:
+        os.environ.pop("ESPN_CACHE_DIR", None)
+    else:
+        os.environ["ESPN_CACHE_DIR"] = saved_cache_dir
+
+
+def _cold_run(func: Callable[[], object]) -> Callable[[], None]:
+    """Wraps func to run quietly against an empty response cache and player index, as a first run would."""
+    def run():
+        with tempfile.TemporaryDirectory() as cache, contextlib.redirect_stdout(io.StringIO()):
+            os.environ["ESPN_CACHE_DIR"] = cache
+            reset_player_index()
+            func()
+    return run
+
+
+def bench_end_to_end(scale: int = 1):
+    """
+    Times the report scripts end to end against replayed ESPN fixtures: league
+    loading and JSON parsing, player lookups, analysis and CSV export.
+
+    Each run starts with an empty cache, so every view goes through the replay
+    adapter instead of the network. Fixtures are synthesized from the recorded
+    keeper sample at its own size and at a large-league scale-up.
+    """
+    last_season = max(LEAGUE_YEAR, datetime.date.today().year - 1)
+    profiles = [
+        ("sample size", 10, 16, 3),
+        ("scale-up", 20 * scale, 30, 15),
+    ]
+    saved_cache_dir = os.environ.get("ESPN_CACHE_DIR")
+    for label, teams, rounds, seasons in profiles:
+        with tempfile.TemporaryDirectory() as fixtures, tempfile.TemporaryDirectory() as output:
+            synthesize_fixtures(fixtures, teams=teams, rounds=rounds, seasons=seasons, last_season=last_season)
+            print(f"\nEnd to end, {label} ({teams} teams x {rounds} rounds x {seasons} seasons, replayed):")
+            runs = [
+                ("display_rosters (CSV)", lambda: display_rosters(
+                    create_league(1, last_season, roster_only=True), os.path.join(output, "rosters.csv"))),
+                ("display_draft_recap (CSV)", lambda: display_draft_recap(
+                    create_league(1, last_season, roster_only=True), os.path.join(output, "draft.csv"))),
+                (f"analyze_keepers ({seasons} seasons)", lambda: analyze_keepers(
+                    num_years=seasons, league_id=1)),
+                ("get_keepers flow", lambda: display_keepers("1", "", "")),
+            ]
+            with replaying(fixtures):
+                for name, func in runs:
+                    print_result(name, *measure(_cold_run(func), repeat=3))
+    if saved_cache_dir is None:
+        os.environ.pop("ESPN_CACHE_DIR", None)
+    else:
+        os.environ["ESPN_CACHE_DIR"] = saved_cache_dir
+
+
+BENCHMARKS = {
+    "keeper-parse": bench_keeper_parse,
+    "keeper-streaks": bench_keeper_streaks,
+    "keeper-optimizer": bench_keeper_optimizer,
+    "weekly-stats": bench_weekly_stats,
+    "draft-analytics": bench_draft_analytics,
+    "draft-simulator": bench_draft_simulator,
+    "roster-model": bench_roster_model,
+    "end-to-end": bench_end_to_end,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline performance benchmarks.")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all).")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Multiply the size of the benchmark inputs (default: 1).")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](scale=args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import argparse
+
+# Kept free of heavy imports (espn_api, requests) so parsers can be built and
+# --help answered before any of them are loaded.
+
+# Completed seasons analyzed by default: keeper streaks and draft history.
+KEEPER_ANALYSIS_YEARS = 3
+DRAFT_ANALYTICS_YEARS = 10
+
+
+def add_shared_arguments(parser: argparse.ArgumentParser):
+    """Adds the options every command accepts: --offline and --profile."""
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve all ESPN data from the local cache without touching the network.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run with cProfile and write the stats to <script>.pstats.")
+    parser.add_argument("--profile-path", metavar="PATH", default=None,
+                        help="Profile the run like --profile, but write the stats to PATH.")
+
+
+def add_export_arguments(parser: argparse.ArgumentParser):
+    """Adds --append and --upsert, which choose how an existing output file is updated (args.export_mode)."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--append", dest="export_mode", action="store_const", const="append", default="write",
+                       help="Add the rows to the end of an existing output file instead of replacing it.")
+    group.add_argument("--upsert", dest="export_mode", action="store_const", const="upsert",
+                       help="Update matching rows of an existing output file in place and add the rest.")
@@ -1,43 +1,270 @@
+import argparse
 import os
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
 from espn_api.football import League
+from cli_options import add_export_arguments, add_shared_arguments
+from league_cache import CachedEspnRequests, record_fetches, set_offline
+import instrumentation
+from roster_model import RosterLeague, load_roster_league
+from transport import FetchError
+import warehouse
 
 
-def get_league(year: int = None) -> League:
+class LeagueLoadError(Exception):
+    """Raised when a league season cannot be loaded from ESPN or the warehouse."""
+
+
+def run_script(main: Callable[[], None]):
     """
-    Connects to the ESPN Fantasy Football league using configuration
-    from environment variables.
+    Runs a script's main function. A league that cannot be loaded or a request
+    that fails after every retry ends the script with its message and exit status 1;
+    library callers such as batch_reports get the exception instead.
+    """
+    try:
+        main()
+    except (LeagueLoadError, FetchError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-    :param year: Optional. The season year to connect to. If None, uses
-                 the SEASON_ID from environment variables.
+
+def build_arg_parser(description: str, output_file: bool = True, use_warehouse: bool = False) -> argparse.ArgumentParser:
+    """
+    Creates the command-line parser shared by all scripts.
+
+    :param description: The help text describing the script.
+    :param output_file: Whether the script accepts an optional output file argument.
+    :param use_warehouse: Whether the script can read from the local warehouse instead of ESPN.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    if output_file:
+        parser.add_argument("output_file", nargs="?", default=None,
+                            help="Optional file to write the output to (.csv, .jsonl or .parquet to export).")
+        add_export_arguments(parser)
+    add_shared_arguments(parser)
+    if use_warehouse:
+        parser.add_argument("--warehouse", action="store_true",
+                            help="Read league history from the local warehouse (see sync_warehouse.py).")
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser, argv=None) -> argparse.Namespace:
+    """
+    Parses the command line and applies the options shared by all scripts.
+
+    This also starts instrumentation: a JSON timing summary is written to stderr
+    when the script exits, and --profile adds a cProfile dump.
+    """
+    args = parser.parse_args(argv)
+    apply_shared_arguments(args, os.path.splitext(os.path.basename(parser.prog))[0])
+    return args
+
+
+def apply_shared_arguments(args: argparse.Namespace, script: str):
+    """Applies --offline and starts instrumentation (with --profile) for an already parsed command line."""
+    if args.offline:
+        set_offline()
+    profile_path = getattr(args, "profile_path", None)
+    if profile_path is None and getattr(args, "profile", False):
+        profile_path = f"{script}.pstats"
+    instrumentation.start(script, profile_path)
+
+
+# Leagues loaded so far, keyed by (league_id, year, espn_s2, swid, roster_only), once share_leagues() is called.
+_shared_leagues: Optional[Dict[Tuple[int, int, Optional[str], Optional[str], bool], Union[League, RosterLeague]]] = None
+_shared_lock = threading.Lock()
+
+
+def share_leagues(enabled: bool = True):
+    """
+    Keeps every league create_league loads in memory for the rest of the process,
+    so running several reports in one process loads each season only once.
+    """
+    global _shared_leagues
+    with _shared_lock:
+        _shared_leagues = {} if enabled else None
+
+
+def create_league(league_id: int, year: int, espn_s2: str = None, swid: str = None,
+                  roster_only: bool = False) -> Union[League, RosterLeague]:
+    """
+    Builds a League whose ESPN requests are served through the local cache.
+
+    Raises the underlying exception if the league cannot be loaded. With
+    share_leagues() on, a season already loaded in this process is reused,
+    and a full League already loaded also answers roster_only requests.
+    The league's `fetched_final` attribute says whether every view it was built
+    from was fetched after the season ended.
+
+    :param roster_only: Return a lightweight RosterLeague (see roster_model.py), which is
+                        enough for the rosters and draft reports.
+    """
+    key = (league_id, year, espn_s2, swid, roster_only)
+    full_key = key[:-1] + (False,)
+    with _shared_lock:
+        if _shared_leagues is not None:
+            if key in _shared_leagues:
+                return _shared_leagues[key]
+            if full_key in _shared_leagues:
+                return _shared_leagues[full_key]
+    if roster_only:
+        league = load_roster_league(league_id, year, espn_s2=espn_s2, swid=swid)
+    else:
+        league = _load_league(league_id, year, espn_s2, swid)
+    with _shared_lock:
+        if _shared_leagues is not None:
+            _shared_leagues[key] = league
+    return league
+
+
+def _load_league(league_id: int, year: int, espn_s2: Optional[str], swid: Optional[str]) -> League:
+    with instrumentation.stage("league_load"), record_fetches(year) as fetches:
+        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid, fetch_league=False)
+        league.espn_request = CachedEspnRequests(
+            sport="nfl",
+            year=year,
+            league_id=league_id,
+            cookies=league.espn_request.cookies,
+            logger=league.logger,
+        )
+        league.fetch_league()
+    league.fetched_final = fetches.final
+    return league
+
+
+# --- Multi-season loading ---
+# How many seasons get_leagues downloads at the same time.
+DEFAULT_MAX_WORKERS = 4
+# How long (in seconds) a single season may take to load before it is skipped.
+DEFAULT_SEASON_TIMEOUT = 120
+
+
+def get_league_config(year: int = None) -> Tuple[int, int, Optional[str], Optional[str]]:
+    """
+    Reads (league_id, season_id, espn_s2, swid) from environment variables.
+
+    :param year: Optional. Overrides the SEASON_ID environment variable.
+    :raises LeagueLoadError: If LEAGUE_ID or SEASON_ID is missing or not an integer.
     """
-    # Load configuration from environment variables
     try:
         league_id = int(os.environ["LEAGUE_ID"])
         if year is None:
             season_id = int(os.environ["SEASON_ID"])
         else:
             season_id = year
-    except (KeyError, ValueError):
-        print("Error: LEAGUE_ID and SEASON_ID environment variables must be set as integers.")
+    except (KeyError, ValueError) as e:
         print("This is typically handled by the run_fantasy_data.bat file.")
-        sys.exit(1)
+        raise LeagueLoadError("LEAGUE_ID and SEASON_ID environment variables must be set as integers.") from e
 
     # For private leagues, ESPN_S2 and SWID cookies are required.
     espn_s2 = os.environ.get("ESPN_S2")
     swid = os.environ.get("SWID")
+    return league_id, season_id, espn_s2, swid
+
+
+def get_leagues(years: Iterable[int], max_workers: int = DEFAULT_MAX_WORKERS,
+                timeout: float = DEFAULT_SEASON_TIMEOUT, league_id: int = None,
+                espn_s2: str = None, swid: str = None) -> Dict[int, League]:
+    """
+    Loads several seasons of the league concurrently.
+
+    Seasons that fail or take longer than `timeout` seconds (measured from when
+    their download starts) are reported and left out of the result.
+
+    :param years: The season years to load.
+    :param max_workers: The maximum number of seasons downloaded at once.
+    :param timeout: The per-season time limit in seconds.
+    :param league_id: Optional. The league to load, with its espn_s2 and swid
+                      cookies; defaults to the environment configuration.
+    """
+    years = list(years)
+    if not years:
+        return {}
+    if league_id is None:
+        league_id, _, espn_s2, swid = get_league_config(year=years[0])
+    started = {}
+
+    def load(year: int) -> League:
+        started[year] = time.monotonic()
+        return create_league(league_id, year, espn_s2=espn_s2, swid=swid)
+
+    print(f"Loading {len(years)} seasons of league {league_id} ({max_workers} at a time)...")
+    leagues = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = {executor.submit(load, year): year for year in years}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                year = futures[future]
+                try:
+                    leagues[year] = future.result()
+                    print(f"Loaded the {year} season.")
+                except Exception as e:
+                    print(f"Warning: Could not load the {year} season. Skipping. Error: {e}")
+            now = time.monotonic()
+            for future in list(pending):
+                year = futures[future]
+                if year in started and now - started[year] > timeout:
+                    print(f"Warning: Loading the {year} season took longer than {timeout} seconds. Skipping.")
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {year: leagues[year] for year in years if year in leagues}
+
+
+def get_league(year: int = None, roster_only: bool = False) -> Union[League, RosterLeague]:
+    """
+    Connects to the ESPN Fantasy Football league using configuration
+    from environment variables.
+
+    :param year: Optional. The season year to connect to. If None, uses
+                 the SEASON_ID from environment variables.
+    :param roster_only: Load only teams, rosters and the draft, as a RosterLeague.
+    :raises LeagueLoadError: If the league cannot be loaded.
+    """
+    league_id, season_id, espn_s2, swid = get_league_config(year)
 
     try:
         if espn_s2 and swid:
             print(f"Attempting to connect to private league {league_id} for the {season_id} season...")
-            league = League(league_id=league_id, year=season_id, espn_s2=espn_s2, swid=swid)
+            league = create_league(league_id, season_id, espn_s2=espn_s2, swid=swid, roster_only=roster_only)
         else:
             print(f"Attempting to connect to public league {league_id} for the {season_id} season...")
-            league = League(league_id=league_id, year=season_id)
-        
+            league = create_league(league_id, season_id, roster_only=roster_only)
+
         print("Successfully connected to the league.")
         return league
     except Exception as e:
-        print(f"Error connecting to the league: {e}")
         print("Please ensure your league credentials and IDs are correct and up-to-date in the .bat file.")
-        sys.exit(1)
\ No newline at end of file
+        raise LeagueLoadError(f"Could not connect to league {league_id} for the {season_id} season: {e}") from e
+
+
+def get_warehouse_leagues(years: Iterable[int]) -> Dict[int, League]:
+    """
+    Loads seasons from the local warehouse instead of ESPN. Seasons that have
+    not been synced are reported and left out of the result.
+    """
+    years = list(years)
+    league_id, _, _, _ = get_league_config(year=years[0] if years else 0)
+    leagues = warehouse.load_leagues(league_id, years)
+    for year in years:
+        if year not in leagues:
+            print(f"Warning: The {year} season is not in the warehouse. Run sync_warehouse.py to add it.")
+    return leagues
+
+
+def get_warehouse_league(year: int = None) -> League:
+    """Like get_league, but reads the season from the local warehouse."""
+    league_id, season_id, _, _ = get_league_config(year)
+    league = warehouse.load_league(league_id, season_id)
+    if league is None:
+        print("Run sync_warehouse.py first to download it.")
+        raise LeagueLoadError(f"The {season_id} season of league {league_id} is not in the warehouse.")
+    print(f"Loaded the {season_id} season of league {league_id} from the warehouse.")
+    return league
@@ -0,0 +1,182 @@
+import math
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from espn_api.football import League
+from draft_store import DraftStore
+import instrumentation
+from weekly_stats import load_weekly_stats
+
+# --- Configuration ---
+# Rounds counted as "early" in each manager's drafting profile.
+EARLY_ROUNDS = 3
+
+
+class PlayerADP(NamedTuple):
+    """Where a player has been drafted across seasons, and how they paid off."""
+    player_id: int
+    position: str
+    times_drafted: int
+    adp: float
+    average_round: float
+    average_value: float
+    adp_std_dev: float
+
+
+class HitRate(NamedTuple):
+    """How often picks of one position in one round finished at or above their draft slot."""
+    round: int
+    position: str
+    picks: int
+    hits: int
+
+    @property
+    def rate(self) -> float:
+        return self.hits / self.picks if self.picks else 0.0
+
+
+class TeamProfile(NamedTuple):
+    """A manager's drafting tendencies across every loaded season."""
+    team_id: int
+    seasons: int
+    picks: int
+    keepers: int
+    average_value: float
+    hit_rate: float
+    position_share: Dict[str, float]
+    early_position_share: Dict[str, float]
+
+
+class DraftAnalytics:
+    """
+    Draft-history analytics over the picks of a DraftStore and each pick's season points.
+
+    The per-pick columns (points, position, season finish and value over pick)
+    are computed once, in arrays aligned with the store's pick rows. Every metric
+    is then a single grouped pass over those columns.
+
+    A pick's value is its overall pick number minus the rank its player finished
+    among that season's drafted players by points: a 50th pick who finished 10th
+    is worth +40. A pick is a hit when its value is zero or more.
+    """
+
+    def __init__(self, store: DraftStore, points: Dict[Tuple[int, int], float], positions: Dict[int, str]):
+        """
+        :param store: The draft picks of every season to analyze.
+        :param points: Season points by (season, player_id); missing players count as 0.
+        :param positions: Each player's position; missing players are "N/A".
+        """
+        self.store = store
+        self.points = array("d", (points.get((season, player_id), 0.0)
+                                  for season, player_id in zip(store.pick_season, store.pick_player)))
+        self.positions = [positions.get(player_id, "N/A") for player_id in store.pick_player]
+        self.finish = array("h", bytes(2 * len(self.points)))
+        self.value = array("h", bytes(2 * len(self.points)))
+        for season in store.seasons:
+            rows = store.season_rows(season)
+            ranked = sorted(rows, key=lambda row: (-self.points[row], store.pick_overall[row]))
+            for rank, row in enumerate(ranked, start=1):
+                self.finish[row] = rank
+                self.value[row] = store.pick_overall[row] - rank
+
+    def adp(self, include_keepers: bool = False) -> Dict[int, PlayerADP]:
+        """
+        Returns each player's average draft position across seasons, with their
+        average round, value over pick and the standard deviation of their draft
+        position. Keeper picks are slotted by the keeper
+        rules rather than chosen, so they are left out unless `include_keepers`.
+        """
+        store = self.store
+        totals: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0])
+        for row, player_id in enumerate(store.pick_player):
+            if store.pick_keeper[row] and not include_keepers:
+                continue
+            total = totals[player_id]
+            total[0] += 1
+            total[1] += store.pick_overall[row]
+            total[2] += store.pick_round[row]
+            total[3] += self.value[row]
+            total[4] += store.pick_overall[row] ** 2
+        position = dict(zip(store.pick_player, self.positions))
+        return {
+            player_id: PlayerADP(player_id, position[player_id], count, overall / count, rounds / count, value / count,
+                                 math.sqrt(max(0.0, squares / count - (overall / count) ** 2)))
+            for player_id, (count, overall, rounds, value, squares) in totals.items()
+        }
+
+    def hit_rates(self) -> Dict[Tuple[int, str], HitRate]:
+        """Returns the hit rate of every (round, position) pair across all seasons."""
+        picks, hits = Counter(), Counter()
+        for round_num, position, value in zip(self.store.pick_round, self.positions, self.value):
+            picks[(round_num, position)] += 1
+            if value >= 0:
+                hits[(round_num, position)] += 1
+        return {key: HitRate(key[0], key[1], count, hits[key]) for key, count in sorted(picks.items())}
+
+    def team_profiles(self) -> Dict[int, TeamProfile]:
+        """Returns every manager's drafting profile, keyed by team ID."""
+        store = self.store
+        seasons, positions, early = defaultdict(set), defaultdict(Counter), defaultdict(Counter)
+        picks, keepers, hits, values = Counter(), Counter(), Counter(), Counter()
+        for row, team_id in enumerate(store.pick_team):
+            seasons[team_id].add(store.pick_season[row])
+            picks[team_id] += 1
+            keepers[team_id] += store.pick_keeper[row]
+            values[team_id] += self.value[row]
+            hits[team_id] += self.value[row] >= 0
+            positions[team_id][self.positions[row]] += 1
+            if store.pick_round[row] <= EARLY_ROUNDS:
+                early[team_id][self.positions[row]] += 1
+
+        def shares(counts: Counter) -> Dict[str, float]:
+            total = sum(counts.values())
+            return {position: count / total for position, count in counts.most_common()}
+
+        return {
+            team_id: TeamProfile(team_id, len(seasons[team_id]), count, keepers[team_id], values[team_id] / count,
+                                 hits[team_id] / count, shares(positions[team_id]), shares(early[team_id]))
+            for team_id, count in sorted(picks.items())
+        }
+
+
+def season_points(league: League, player_ids: Iterable[int]) -> Tuple[Dict[int, float], Dict[int, str]]:
+    """
+    Returns the season points and position of every given player.
+
+    Rostered players are read from the league itself; the rest (drafted and
+    later dropped) are looked up through the batched weekly stats fetch.
+    """
+    points, positions = {}, {}
+    for team in league.teams:
+        for player in team.roster:
+            points[player.playerId] = getattr(player, "total_points", 0) or 0.0
+            positions[player.playerId] = getattr(player, "position", "N/A")
+
+    missing = [player_id for player_id in player_ids if player_id not in points]
+    if missing and getattr(league, "espn_request", None) is not None:
+        weekly = load_weekly_stats(league, missing)
+        for player_id in missing:
+            total = weekly.season_total(player_id)
+            if total is not None:
+                points[player_id] = total
+        positions.update((player_id, position) for player_id, position in zip(weekly.player_ids, weekly.positions)
+                         if player_id not in positions)
+    return points, positions
+
+
+def load_draft_analytics(leagues: Iterable[League], store: Optional[DraftStore] = None) -> DraftAnalytics:
+    """Builds DraftAnalytics over the drafts of every given season, with each pick's season points."""
+    leagues = list(leagues)
+    if store is None:
+        store = DraftStore.from_leagues(leagues)
+    points: Dict[Tuple[int, int], float] = {}
+    positions: Dict[int, str] = {}
+    with instrumentation.stage("season_points"):
+        for league in leagues:
+            drafted = [pick.player_id for pick in store.picks_for_season(league.year)]
+            season, season_positions = season_points(league, drafted)
+            points.update(((league.year, player_id), total) for player_id, total in season.items())
+            for player_id, position in season_positions.items():
+                positions.setdefault(player_id, position)
+    return DraftAnalytics(store, points, positions)
@@ -0,0 +1,302 @@
+import math
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from espn_api.football import League
+from draft_analytics import PlayerADP
+import instrumentation
+from weekly_stats import REPLACEMENT_STARTERS
+
+# --- Configuration ---
+DEFAULT_SIMULATIONS = 10000
+
+# The smallest spread (in picks) of a player's draft position around their ADP,
+# and the spread as a share of their ADP for players with little history.
+MIN_ADP_SPREAD = 2.0
+ADP_SPREAD_RATIO = 0.15
+
+# Players without draft history are queued behind every player with an ADP, in
+# order of points, this many picks apart.
+UNDRAFTED_ADP_STEP = 1.0
+
+# Only the players ranked in the first (open picks x this factor) by ADP are
+# sampled; players further down the board are never reached.
+POOL_SIZE_FACTOR = 1.5
+
+# The simulated team chooses among this many of the next available players on
+# the board, taking the one that adds the most to its starting lineup.
+REACH_WINDOW = 5
+
+# Draft positions are sampled from this many evenly spaced quantiles of the
+# normal distribution, so a whole board is drawn with one random.choices call.
+NORMAL_TABLE_SIZE = 4096
+
+# Simulations run in chunks of this size, each with its own random stream seeded
+# by its index, so results depend on the seed and simulation count alone, never
+# on how many worker processes share the chunks. Runs smaller than
+# PARALLEL_THRESHOLD stay in this process, where starting workers would cost
+# more than it saves.
+SIMULATIONS_PER_CHUNK = 250
+PARALLEL_THRESHOLD = 2000
+
+
+class DraftSlot(NamedTuple):
+    """One pick on the draft board."""
+    overall: int
+    round: int
+    team_id: int
+    reserved_for_keeper: bool
+
+
+class ScenarioResult(NamedTuple):
+    """The simulated starting-lineup points of one keeper scenario."""
+    name: str
+    keepers: Dict[int, int]
+    simulations: int
+    mean: float
+    std_dev: float
+    p10: float
+    p90: float
+
+
+class PickModel:
+    """
+    The player pool of a mock draft, as parallel arrays: each player's ADP, the
+    spread of their draft position around it, their points and their position.
+
+    In every simulated draft each player's draft position is drawn from a normal
+    distribution around their ADP, and opponents take the best available player
+    on the resulting board.
+    """
+
+    def __init__(self, player_ids: Iterable[int], positions: Iterable[str], adp: Iterable[float],
+                 spread: Iterable[float], points: Iterable[float]):
+        self.player_ids = array("l", player_ids)
+        self.positions = list(positions)
+        self.adp = array("d", adp)
+        self.spread = array("d", spread)
+        self.points = array("d", points)
+        self._index = {player_id: i for i, player_id in enumerate(self.player_ids)}
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def index(self, player_id: int) -> Optional[int]:
+        return self._index.get(player_id)
+
+    @classmethod
+    def from_adp(cls, adp: Dict[int, PlayerADP], points: Dict[int, float],
+                 positions: Dict[int, str]) -> "PickModel":
+        """
+        Builds the pool from DraftAnalytics.adp() and each player's season points.
+
+        Every player with points but no draft history (late-season pickups, for
+        instance) joins the pool behind the drafted players, ordered by points.
+        """
+        player_ids, player_positions, player_adp, spread, player_points = [], [], [], [], []
+        for entry in sorted(adp.values(), key=lambda entry: entry.adp):
+            player_ids.append(entry.player_id)
+            player_positions.append(positions.get(entry.player_id, entry.position))
+            player_adp.append(entry.adp)
+            spread.append(max(MIN_ADP_SPREAD, entry.adp_std_dev, ADP_SPREAD_RATIO * entry.adp))
+            player_points.append(points.get(entry.player_id, 0.0))
+
+        last_adp = player_adp[-1] if player_adp else 0.0
+        undrafted = sorted((player_id for player_id in points if player_id not in adp), key=lambda pid: -points[pid])
+        for rank, player_id in enumerate(undrafted, start=1):
+            player_ids.append(player_id)
+            player_positions.append(positions.get(player_id, "N/A"))
+            player_adp.append(last_adp + rank * UNDRAFTED_ADP_STEP)
+            spread.append(max(MIN_ADP_SPREAD, ADP_SPREAD_RATIO * player_adp[-1]))
+            player_points.append(points[player_id])
+        return cls(player_ids, player_positions, player_adp, spread, player_points)
+
+
+_NORMAL_QUANTILES = [NormalDist().inv_cdf((i + 0.5) / NORMAL_TABLE_SIZE) for i in range(NORMAL_TABLE_SIZE)]
+
+
+def board_from_draft_detail(draft_detail: Dict[str, Any]) -> List[DraftSlot]:
+    """Reads the draft board from a draftDetail object (mDraftDetail view or keeper payload)."""
+    picks = sorted(draft_detail.get("picks") or [], key=lambda pick: pick.get("overallPickNumber", 0))
+    return [DraftSlot(pick.get("overallPickNumber", overall), pick.get("roundId", 0), pick.get("teamId", 0),
+                      bool(pick.get("reservedForKeeper")))
+            for overall, pick in enumerate(picks, start=1)]
+
+
+def board_from_league(league: League) -> List[DraftSlot]:
+    """Reads the draft board of a completed draft; its keeper picks are the reserved slots."""
+    return [DraftSlot(overall, pick.round_num or 0, pick.team.team_id if pick.team else 0, bool(pick.keeper_status))
+            for overall, pick in enumerate(league.draft or [], start=1)]
+
+
+def open_slots(board: List[DraftSlot], keepers: Dict[int, Dict[int, int]]) -> List[int]:
+    """
+    Returns the team of every pick left to draft once keepers take their slots.
+
+    Each keeper uses their team's pick in their keeper round, preferring a slot
+    reserved for a keeper. A keeper whose team has no pick in that round uses
+    no slot.
+    """
+    used = set()
+    for team_id, team_keepers in keepers.items():
+        for round_num in team_keepers.values():
+            slots = [slot for slot in board
+                     if slot.team_id == team_id and slot.round == round_num and slot.overall not in used]
+            if slots:
+                slots.sort(key=lambda slot: not slot.reserved_for_keeper)
+                used.add(slots[0].overall)
+    return [slot.team_id for slot in board if slot.overall not in used]
+
+
+def _lineup_value(top: Dict[str, List[float]]) -> float:
+    return math.fsum(value for values in top.values() for value in values)
+
+
+def _add_to_lineup(top: Dict[str, List[float]], position: str, points: float) -> float:
+    """Adds a player to the team's best starters per position; returns the points the lineup gained."""
+    starters = top.get(position)
+    if starters is None:
+        return 0.0
+    if len(starters) < REPLACEMENT_STARTERS[position]:
+        starters.append(points)
+        return points
+    weakest = min(starters)
+    if points <= weakest:
+        return 0.0
+    starters[starters.index(weakest)] = points
+    return points - weakest
+
+
+def _marginal_value(top: Dict[str, List[float]], position: str, points: float) -> float:
+    starters = top.get(position)
+    if starters is None:
+        return 0.0
+    if len(starters) < REPLACEMENT_STARTERS[position]:
+        return points
+    return max(0.0, points - min(starters))
+
+
+def _simulate_chunk(task: Tuple) -> array:
+    """
+    Runs `count` mock drafts of one scenario and returns the simulated team's
+    starting-lineup points in each. Runs in a worker process, so it only takes
+    plain arrays and lists.
+
+    Each draft draws `noise_size` normal deviates indexed by model position,
+    not pool position, so with the same seed a player gets the same draw in
+    every scenario, whichever players the scenario's keepers remove from the pool.
+    """
+    adp, spread, points, positions, pool, slots, team_id, kept, count, noise_size, seed = task
+    choices = random.Random(seed).choices
+    pool_adp = [adp[i] for i in pool]
+    pool_spread = [spread[i] for i in pool]
+    size = len(pool)
+    results = array("d")
+    for _ in range(count):
+        # Draw the whole board at once: every player's draft position for this draft
+        noise = choices(_NORMAL_QUANTILES, k=noise_size)
+        keys = [mean + deviation * noise[i] for i, mean, deviation in zip(pool, pool_adp, pool_spread)]
+        board = sorted(range(size), key=keys.__getitem__)
+        taken = bytearray(size)
+        cursor = 0
+        top = {position: [] for position in REPLACEMENT_STARTERS}
+        for i in kept:
+            _add_to_lineup(top, positions[i], points[i])
+
+        for team in slots:
+            while cursor < size and taken[board[cursor]]:
+                cursor += 1
+            if cursor >= size:
+                break
+            if team != team_id:
+                taken[board[cursor]] = 1
+                continue
+            best, best_gain, seen, position = None, -1.0, 0, cursor
+            while position < size and seen < REACH_WINDOW:
+                candidate = board[position]
+                if not taken[candidate]:
+                    player = pool[candidate]
+                    gain = _marginal_value(top, positions[player], points[player])
+                    if gain > best_gain:
+                        best, best_gain = candidate, gain
+                    seen += 1
+                position += 1
+            taken[best] = 1
+            player = pool[best]
+            _add_to_lineup(top, positions[player], points[player])
+        results.append(_lineup_value(top))
+    return results
+
+
+def _summarize(name: str, keepers: Dict[int, int], values: List[float]) -> ScenarioResult:
+    values = sorted(values)
+    count = len(values)
+    if not count:
+        return ScenarioResult(name, keepers, 0, 0.0, 0.0, 0.0, 0.0)
+    mean = math.fsum(values) / count
+    variance = math.fsum((value - mean) ** 2 for value in values) / count
+    return ScenarioResult(name, keepers, count, mean, math.sqrt(variance),
+                          values[int(0.1 * (count - 1))], values[int(0.9 * (count - 1))])
+
+
+def simulate_scenarios(board: List[DraftSlot], model: PickModel, team_id: int, scenarios: Dict[str, Dict[int, int]],
+                       other_keepers: Dict[int, Dict[int, int]] = None, simulations: int = DEFAULT_SIMULATIONS,
+                       workers: int = None, seed: int = 0) -> List[ScenarioResult]:
+    """
+    Simulates the draft under each keeper scenario of one team and returns the
+    distribution of that team's starting-lineup points (keepers included).
+
+    :param board: The draft board, one slot per pick.
+    :param model: The player pool and each player's pick model.
+    :param team_id: The team whose keeper scenarios are compared.
+    :param scenarios: Scenario name -> {player_id: keeper round} for `team_id`.
+    :param other_keepers: Every other team's keepers, {team_id: {player_id: round}}; they are
+        the same in every scenario.
+    :param simulations: Mock drafts per scenario.
+    :param workers: Optional. Worker processes (default: one per CPU; 1 runs in this process).
+        The results are the same for any number of workers.
+    :param seed: Every scenario replays the same random boards (common random numbers),
+        so differences between scenarios come from the keepers rather than the draws.
+    """
+    other_keepers = {team: dict(players) for team, players in (other_keepers or {}).items() if team != team_id}
+    chunk_sizes = [min(SIMULATIONS_PER_CHUNK, simulations - start)
+                   for start in range(0, simulations, SIMULATIONS_PER_CHUNK)]
+    workers = workers or os.cpu_count() or 1
+    if simulations < PARALLEL_THRESHOLD:
+        workers = 1
+    workers = min(workers, len(chunk_sizes) * len(scenarios))
+
+    plans = []
+    for name, keepers in scenarios.items():
+        all_keepers = dict(other_keepers)
+        all_keepers[team_id] = dict(keepers)
+        kept_ids = {player_id for players in all_keepers.values() for player_id in players}
+        slots = open_slots(board, all_keepers)
+        pool_size = int(len(slots) * POOL_SIZE_FACTOR) + REACH_WINDOW
+        pool = array("l", [i for i, player_id in enumerate(model.player_ids) if player_id not in kept_ids][:pool_size])
+        kept = [model.index(player_id) for player_id in keepers if model.index(player_id) is not None]
+        plans.append((name, pool, slots, kept))
+
+    # Noise is drawn up to the last model position any scenario samples, so every scenario sees the same draws
+    noise_size = max((pool[-1] + 1 for _, pool, _, _ in plans if pool), default=0)
+    tasks, names = [], []
+    for name, pool, slots, kept in plans:
+        for chunk, size in enumerate(chunk_sizes):
+            tasks.append((model.adp, model.spread, model.points, model.positions, pool, slots, team_id, kept,
+                          size, noise_size, f"{seed}:{chunk}"))
+            names.append(name)
+
+    values: Dict[str, List[float]] = {name: [] for name in scenarios}
+    with instrumentation.stage("draft_simulation"):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for name, result in zip(names, executor.map(_simulate_chunk, tasks)):
+                    values[name].extend(result)
+        else:
+            for name, task in zip(names, tasks):
+                values[name].extend(_simulate_chunk(task))
+    return [_summarize(name, scenarios[name], values[name]) for name in scenarios]
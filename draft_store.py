@@ -0,0 +1,184 @@
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from espn_api.football import League
+
+
+class Pick(NamedTuple):
+    """A single draft pick, as stored in one row of the DraftStore."""
+    season: int
+    overall: int
+    round: int
+    team_id: int
+    player_id: int
+    keeper: bool
+
+
+class RosterSlot(NamedTuple):
+    """A player on a team's end-of-season roster, as stored in one row of the DraftStore."""
+    season: int
+    team_id: int
+    player_id: int
+    lineup_slot: str
+
+
+class DraftStore:
+    """
+    A compact, column-oriented store of draft picks and roster slots across seasons.
+
+    Each field lives in its own typed array instead of one dict per pick, and the
+    lookup indexes are built once as rows are added:
+
+    - picks by (player_id, team_id), by (season, player_id), by team and by season
+    - roster slots by team and by season
+
+    Team names are kept per (season, team_id) so reports can label rows without
+    holding on to the League objects.
+    """
+
+    def __init__(self):
+        # Pick columns
+        self.pick_season = array("h")
+        self.pick_overall = array("h")
+        self.pick_round = array("h")
+        self.pick_team = array("l")
+        self.pick_player = array("l")
+        self.pick_keeper = array("b")
+
+        # Roster columns
+        self.roster_season = array("h")
+        self.roster_team = array("l")
+        self.roster_player = array("l")
+        self.roster_slot: List[str] = []
+
+        self.team_names: Dict[Tuple[int, int], str] = {}
+
+        # Pick indexes, mapping keys to row numbers
+        self._picks_by_player_team: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._pick_by_season_player: Dict[Tuple[int, int], int] = {}
+        self._picks_by_team: Dict[int, List[int]] = defaultdict(list)
+        self._picks_by_season: Dict[int, range] = {}
+
+        # Roster indexes
+        self._roster_by_team: Dict[int, List[int]] = defaultdict(list)
+        self._roster_by_season: Dict[int, range] = {}
+
+    @classmethod
+    def from_leagues(cls, leagues: Iterable[League]) -> "DraftStore":
+        """Builds a store holding the drafts and rosters of every given season."""
+        store = cls()
+        for league in leagues:
+            store.add_league(league)
+        return store
+
+    def add_league(self, league: League):
+        """Adds one season's draft picks, rosters and team names to the store."""
+        season = league.year
+        if season in self._picks_by_season:
+            return  # Already loaded
+
+        for team in league.teams:
+            self.team_names[(season, team.team_id)] = getattr(team, "team_name", "Unknown Team")
+
+        start = len(self.pick_player)
+        for overall, pick in enumerate(league.draft or [], start=1):
+            team_id = pick.team.team_id if pick.team else 0
+            self.add_pick(season, overall, pick.round_num or 0, team_id, pick.playerId, pick.keeper_status)
+        # Marks the season as loaded even when it has no draft
+        self._picks_by_season[season] = range(start, len(self.pick_player))
+
+        start = len(self.roster_player)
+        for team in league.teams:
+            for player in team.roster:
+                row = len(self.roster_player)
+                self.roster_season.append(season)
+                self.roster_team.append(team.team_id)
+                self.roster_player.append(player.playerId)
+                self.roster_slot.append(getattr(player, "lineupSlot", ""))
+                self._roster_by_team[team.team_id].append(row)
+        self._roster_by_season[season] = range(start, len(self.roster_player))
+
+    def add_pick(self, season: int, overall: int, round_num: int, team_id: int, player_id: int, keeper: bool):
+        """
+        Appends a single pick and indexes it. Picks must be added one season at a
+        time in overall order; add_league takes care of this for League objects.
+        """
+        row = len(self.pick_player)
+        self.pick_season.append(season)
+        self.pick_overall.append(overall)
+        self.pick_round.append(round_num)
+        self.pick_team.append(team_id)
+        self.pick_player.append(player_id)
+        self.pick_keeper.append(1 if keeper else 0)
+
+        self._picks_by_player_team[(player_id, team_id)].append(row)
+        self._pick_by_season_player.setdefault((season, player_id), row)
+        self._picks_by_team[team_id].append(row)
+        first = self._picks_by_season.get(season, range(row, row)).start
+        self._picks_by_season[season] = range(first, row + 1)
+
+    # --- Row access ---
+
+    def pick(self, row: int) -> Pick:
+        return Pick(
+            self.pick_season[row],
+            self.pick_overall[row],
+            self.pick_round[row],
+            self.pick_team[row],
+            self.pick_player[row],
+            bool(self.pick_keeper[row]),
+        )
+
+    def roster_slot_at(self, row: int) -> RosterSlot:
+        return RosterSlot(self.roster_season[row], self.roster_team[row], self.roster_player[row], self.roster_slot[row])
+
+    def team_name(self, season: int, team_id: int) -> str:
+        return self.team_names.get((season, team_id), "Unknown Team")
+
+    @property
+    def seasons(self) -> List[int]:
+        """The seasons loaded into the store, most recent first."""
+        return sorted(self._picks_by_season, reverse=True)
+
+    # --- Pick queries ---
+
+    def season_rows(self, season: int) -> range:
+        """The row numbers of a season's picks, which are contiguous and in overall order."""
+        return self._picks_by_season.get(season, range(0))
+
+    def picks_for_season(self, season: int) -> Iterator[Pick]:
+        """Yields a season's picks in overall pick order."""
+        return (self.pick(row) for row in self._picks_by_season.get(season, ()))
+
+    def picks_for_team(self, team_id: int) -> Iterator[Pick]:
+        """Yields every pick made by a team, across all loaded seasons."""
+        return (self.pick(row) for row in self._picks_by_team.get(team_id, ()))
+
+    def picks_for_player_team(self, player_id: int, team_id: int) -> Iterator[Pick]:
+        """Yields every pick of a player by a specific team, across all loaded seasons."""
+        return (self.pick(row) for row in self._picks_by_player_team.get((player_id, team_id), ()))
+
+    def keeper_picks(self) -> Iterator[Pick]:
+        """Yields every keeper pick across all loaded seasons."""
+        return (self.pick(row) for row, keeper in enumerate(self.pick_keeper) if keeper)
+
+    def find_pick(self, season: int, player_id: int) -> Optional[Pick]:
+        """Returns the pick that selected a player in a season's draft, if any."""
+        row = self._pick_by_season_player.get((season, player_id))
+        return None if row is None else self.pick(row)
+
+    def draft_round(self, season: int, player_id: int, team_id: int, default: int = None) -> Optional[int]:
+        """Returns the round in which a team drafted a player in a season, or `default` if it did not."""
+        for row in self._picks_by_player_team.get((player_id, team_id), ()):
+            if self.pick_season[row] == season:
+                return self.pick_round[row]
+        return default
+
+    # --- Roster queries ---
+
+    def roster_for_season(self, season: int) -> Iterator[RosterSlot]:
+        return (self.roster_slot_at(row) for row in self._roster_by_season.get(season, ()))
+
+    def roster_for_team(self, team_id: int) -> Iterator[RosterSlot]:
+        return (self.roster_slot_at(row) for row in self._roster_by_team.get(team_id, ()))
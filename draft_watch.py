@@ -0,0 +1,139 @@
+import csv
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from espn_api.football import League
+
+import instrumentation
+from player_index import is_player_id, resolve_players
+from transport import http_get
+
+# --- Configuration ---
+# Seconds between polls of the draft. Polls are conditional, so an unchanged draft costs
+# ESPN a 304 response, but intervals below MIN_POLL_INTERVAL are raised to it.
+DEFAULT_POLL_INTERVAL = 5
+MIN_POLL_INTERVAL = 2
+
+# After a failed poll the interval doubles, up to this many seconds, until a poll succeeds.
+MAX_BACKOFF_INTERVAL = 60
+
+CSV_FIELDS = ["Round", "Pick", "Player Name", "Position", "Team"]
+
+
+class DraftWatcher:
+    """
+    Follows a live draft by polling the mDraftDetail view and handling only the new picks.
+
+    Each poll sends the ETag and Last-Modified of the previous response, so an
+    unchanged draft comes back as an empty 304. Picks are consumed in draft
+    order from a cursor, so a poll only looks up, prints and writes the picks
+    made since the last one.
+    """
+
+    def __init__(self, league: League, output_file: str = None):
+        self.league = league
+        self.output_file = output_file
+        self.team_names = {team.team_id: team.team_name for team in league.teams}
+        self.next_index = 0
+        self.complete = False
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._csv_file = None
+        self._writer = None
+
+    def _fetch_draft_detail(self) -> Optional[Dict[str, Any]]:
+        """Returns the draftDetail object, or None if it has not changed since the last poll."""
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        request = self.league.espn_request
+        response = http_get(request.LEAGUE_ENDPOINT, params={"view": "mDraftDetail"}, headers=headers,
+                            cookies=request.cookies)
+        instrumentation.count("draft_polls")
+        if response.status_code == 304:
+            instrumentation.count("draft_polls_unchanged")
+            return None
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+
+        data = response.json()
+        data = data[0] if isinstance(data, list) else data
+        return data.get("draftDetail", {})
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Fetches the draft once and returns the rows for any picks made since the previous poll."""
+        detail = self._fetch_draft_detail()
+        if detail is None:
+            return []
+        picks = detail.get("picks", [])
+
+        new_picks = []
+        while self.next_index < len(picks) and is_player_id(picks[self.next_index].get("playerId")):
+            new_picks.append(picks[self.next_index])
+            self.next_index += 1
+        self.complete = bool(detail.get("drafted")) and not detail.get("inProgress")
+
+        if not new_picks:
+            return []
+        # Only the new picks are looked up, in one batch
+        players = resolve_players(self.league, [pick["playerId"] for pick in new_picks])
+        rows = []
+        for pick in new_picks:
+            player = players.get(pick["playerId"])
+            rows.append({
+                "Round": pick.get("roundId"),
+                "Pick": pick.get("overallPickNumber") or pick.get("id"),
+                "Player Name": player.name if player else f"Unknown (ID: {pick['playerId']})",
+                "Position": player.position if player else "N/A",
+                "Team": self.team_names.get(pick.get("teamId"), f"Team {pick.get('teamId')}"),
+            })
+        return rows
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            print(f"{row['Round']:>5} {row['Pick']:>5} {row['Player Name']:<25} {row['Position']:<10} {row['Team']:<25}")
+        if self._writer:
+            with instrumentation.stage("csv_write"):
+                self._writer.writerows(rows)
+                self._csv_file.flush()
+
+    def watch(self, interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Polls every `interval` seconds until the draft is complete or Ctrl+C is pressed,
+        printing each new pick and appending it to the CSV output file, if any.
+        """
+        interval = max(interval, MIN_POLL_INTERVAL)
+        if self.output_file:
+            self._csv_file = open(self.output_file, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._csv_file, fieldnames=CSV_FIELDS)
+            self._writer.writeheader()
+
+        print(f"Watching the {self.league.year} draft (polling every {interval:g}s, Ctrl+C to stop)...")
+        print("-" * 80)
+        print(f"{'ROUND':>5} {'PICK':>5} {'PLAYER NAME':<25} {'POSITION':<10} {'TEAM':<25}")
+        print("-" * 80)
+        delay = interval
+        try:
+            while True:
+                try:
+                    with instrumentation.stage("draft_poll"):
+                        self._write(self.poll())
+                    delay = interval
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    delay = min(delay * 2, MAX_BACKOFF_INTERVAL)
+                    print(f"Warning: Could not poll the draft, retrying in {delay:g}s. Error: {e}")
+                if self.complete:
+                    print("-" * 80)
+                    print(f"The draft is complete ({self.next_index} picks).")
+                    break
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            print(f"\nStopped watching after {self.next_index} picks.")
+        finally:
+            if self._csv_file:
+                self._csv_file.close()
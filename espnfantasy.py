@@ -0,0 +1,244 @@
+import argparse
+import datetime
+import os
+from typing import Callable, Dict, List, Optional
+
+from cli_options import DRAFT_ANALYTICS_YEARS, KEEPER_ANALYSIS_YEARS, add_export_arguments, add_shared_arguments
+
+# Report modules are imported inside the commands that need them: espn_api and
+# requests alone take a noticeable fraction of a second to import, which --help
+# and bad-argument runs should not pay for.
+
+# The file each report is written to in `report --output-dir` mode. Reports not
+# listed here only print to the console.
+REPORT_FILES = {
+    "rosters": "rosters.csv",
+    "draft": "draft.csv",
+    "keeper-analysis": "keeper_analysis.csv",
+    "draft-analytics": "draft_analytics.csv",
+}
+
+# Reports that load full espn_api Leagues. When one of them runs in the same
+# invocation, the rosters and draft reports load a full League too, so each
+# season is downloaded once and shared.
+FULL_LEAGUE_REPORTS = {"keepers", "keeper-analysis", "draft-analytics", "original-rounds"}
+
+# Seasons and draft stores already loaded by this invocation
+_leagues: Dict[tuple, object] = {}
+_stores: Dict[int, object] = {}
+
+
+def _season(args: argparse.Namespace) -> int:
+    """The season to report on: --year, then SEASON_ID, then the most recently completed season."""
+    if args.year:
+        return args.year
+    try:
+        return int(os.environ["SEASON_ID"])
+    except (KeyError, ValueError):
+        return datetime.date.today().year - 1
+
+
+def _league(args: argparse.Namespace):
+    """Loads the requested season's teams, rosters and draft once, from ESPN or the warehouse, for every report."""
+    key = (_season(args), args.warehouse)
+    if key not in _leagues:
+        from common import get_league, get_warehouse_league
+
+        if args.warehouse:
+            _leagues[key] = get_warehouse_league(key[0])
+        else:
+            _leagues[key] = get_league(key[0], roster_only=not FULL_LEAGUE_REPORTS & set(_report_names(args)))
+    return _leagues[key]
+
+
+def _draft_store(league):
+    """The DraftStore for a loaded league, built once and shared by the rosters and draft reports."""
+    from draft_store import DraftStore
+
+    if id(league) not in _stores:
+        _stores[id(league)] = DraftStore.from_leagues([league])
+    return _stores[id(league)]
+
+
+def _export_mode(args: argparse.Namespace) -> str:
+    return getattr(args, "export_mode", "write")
+
+
+def run_rosters(args: argparse.Namespace, output_file: Optional[str]):
+    import instrumentation
+    from get_rosters import display_rosters
+
+    league = _league(args)
+    with instrumentation.stage("report"):
+        display_rosters(league, output_file, store=_draft_store(league), mode=_export_mode(args),
+                        weekly_stats=getattr(args, "weekly_stats", False))
+
+
+def run_draft(args: argparse.Namespace, output_file: Optional[str]):
+    import instrumentation
+    from get_draft_data import display_draft_recap, watch_draft
+
+    league = _league(args)
+    if getattr(args, "watch", False):
+        from draft_watch import DEFAULT_POLL_INTERVAL
+
+        watch_draft(league, output_file, args.interval or DEFAULT_POLL_INTERVAL)
+        return
+    with instrumentation.stage("report"):
+        display_draft_recap(league, output_file, store=_draft_store(league), mode=_export_mode(args))
+
+
+def run_keepers(args: argparse.Namespace, output_file: Optional[str]):
+    from get_keepers import display_keepers, get_credentials
+
+    creds = get_credentials()
+    if creds:
+        # --year is the completed season keeper costs come from; keepers are chosen for the next one
+        seasons = {"league_year": args.year + 1, "history_year": args.year} if args.year else {}
+        display_keepers(*creds, weekly_stats=getattr(args, "weekly_stats", False),
+                        max_keeper_years=getattr(args, "max_keeper_years", None), **seasons)
+
+
+def run_keeper_analysis(args: argparse.Namespace, output_file: Optional[str]):
+    from common import DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT
+    from get_keeper_analysis import analyze_keepers
+
+    analyze_keepers(output_file, num_years=args.years or KEEPER_ANALYSIS_YEARS,
+                    max_workers=args.workers or DEFAULT_MAX_WORKERS,
+                    timeout=args.timeout or DEFAULT_SEASON_TIMEOUT,
+                    use_warehouse=args.warehouse, mode=_export_mode(args))
+
+
+def run_draft_analytics(args: argparse.Namespace, output_file: Optional[str]):
+    from common import DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT
+    from get_draft_analytics import display_draft_analytics
+
+    display_draft_analytics(output_file, num_years=args.years or DRAFT_ANALYTICS_YEARS,
+                            max_workers=args.workers or DEFAULT_MAX_WORKERS,
+                            timeout=args.timeout or DEFAULT_SEASON_TIMEOUT,
+                            use_warehouse=args.warehouse, mode=_export_mode(args))
+
+
+def run_original_rounds(args: argparse.Namespace, output_file: Optional[str]):
+    from get_original_draft_round import get_keeper_draft_details
+
+    get_keeper_draft_details(**({"year": args.year} if args.year else {}))
+
+
+REPORTS: Dict[str, Callable[[argparse.Namespace, Optional[str]], None]] = {
+    "rosters": run_rosters,
+    "draft": run_draft,
+    "keepers": run_keepers,
+    "keeper-analysis": run_keeper_analysis,
+    "draft-analytics": run_draft_analytics,
+    "original-rounds": run_original_rounds,
+}
+
+
+def _report_names(args: argparse.Namespace) -> List[str]:
+    """The reports this invocation runs, in order."""
+    if args.command != "report":
+        return [args.command]
+    return list(REPORTS) if "all" in args.reports else list(dict.fromkeys(args.reports))
+
+
+def run_report(args: argparse.Namespace, output_file: Optional[str]):
+    """Runs several reports in turn, loading each season they need only once."""
+    names = _report_names(args)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for name in names:
+        print(f"\n===== {name} =====")
+        report_file = None
+        if args.output_dir and name in REPORT_FILES:
+            report_file = os.path.join(args.output_dir, REPORT_FILES[name])
+        REPORTS[name](args, report_file)
+
+
+def _add_analysis_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--years", type=int, default=None,
+                        help=f"Number of completed seasons to analyze (default: {KEEPER_ANALYSIS_YEARS} for keeper "
+                             f"streaks, {DRAFT_ANALYTICS_YEARS} for draft history).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of seasons to download at once.")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds allowed to load each season.")
+
+
+def _add_weekly_stats_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("--weekly-stats", action="store_true",
+                        help="Add points per game, consistency and points above replacement to the rosters "
+                             "and keepers reports.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="espnfantasy",
+        description="ESPN fantasy football reports. Every report run in one invocation shares the loaded seasons.",
+    )
+    add_shared_arguments(parser)
+    parser.add_argument("--year", type=int, default=None,
+                        help="Season for the rosters, draft and original-rounds reports, and the season keeper "
+                             "costs come from (default: SEASON_ID, else the most recently completed season).")
+    parser.add_argument("--warehouse", action="store_true",
+                        help="Read league history from the local warehouse (see sync_warehouse.py).")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    for name, help_text in (("rosters", "Display all team rosters for a season."),
+                            ("draft", "Display the draft recap for a season."),
+                            ("keeper-analysis", "Analyze consecutive keeper streaks."),
+                            ("draft-analytics", "Analyze draft history: ADP, value over pick and manager tendencies.")):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("output_file", nargs="?", default=None,
+                             help="Optional file to write the output to (.csv, .jsonl or .parquet to export).")
+        add_export_arguments(command)
+        if name in ("keeper-analysis", "draft-analytics"):
+            _add_analysis_arguments(command)
+        if name == "rosters":
+            _add_weekly_stats_argument(command)
+        if name == "draft":
+            command.add_argument("--watch", action="store_true",
+                                 help="Follow a live draft, showing (and appending to the CSV file) each pick "
+                                      "as it is made.")
+            command.add_argument("--interval", type=float, default=None,
+                                 help="Seconds between polls in --watch mode.")
+    keepers = commands.add_parser("keepers", help="Display each team's keepers and their draft round cost.")
+    _add_weekly_stats_argument(keepers)
+    keepers.add_argument("--max-keeper-years", type=int, default=None,
+                         help="Flag keepers already kept this many seasons in a row (default: no limit).")
+    commands.add_parser("original-rounds", help="List each rostered player's original draft round.")
+
+    report = commands.add_parser("report", help="Run several reports at once, e.g. `report all`.",
+                                 description="Run several reports in one process, loading each season once.")
+    report.add_argument("reports", nargs="+", metavar="report",
+                        help=f"Reports to run: all, {', '.join(REPORTS)}.")
+    report.add_argument("--output-dir", default=None,
+                        help=f"Write {', '.join(REPORT_FILES)} as CSV files into this directory.")
+    add_export_arguments(report)
+    _add_analysis_arguments(report)
+    _add_weekly_stats_argument(report)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "draft" and args.watch and args.warehouse:
+        parser.error("--watch follows the live draft and cannot be used with --warehouse")
+    if args.command == "report":
+        unknown = [name for name in args.reports if name != "all" and name not in REPORTS]
+        if unknown:
+            parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    from common import apply_shared_arguments, run_script, share_leagues
+    from league_cache import print_cache_stats
+
+    apply_shared_arguments(args, parser.prog)
+    share_leagues()
+    command = run_report if args.command == "report" else REPORTS[args.command]
+    run_script(lambda: command(args, getattr(args, "output_file", None)))
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
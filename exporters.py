@@ -0,0 +1,269 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is only available when pyarrow is installed
+    pyarrow = None
+
+# --- Configuration ---
+# Export modes: replace the file, add rows to the end of it, or replace rows with the same key.
+WRITE = "write"
+APPEND = "append"
+UPSERT = "upsert"
+EXPORT_MODES = (WRITE, APPEND, UPSERT)
+
+# The output format is chosen by file extension.
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+# Rows buffered per Parquet row group. Parquet files are written a row group at a time.
+PARQUET_BATCH_ROWS = 5000
+
+
+def export_format(path: Optional[str]) -> Optional[str]:
+    """Returns "csv", "jsonl" or "parquet" for a supported output file, otherwise None."""
+    if not path:
+        return None
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+class _CsvSink:
+    def __init__(self, path: str, fieldnames: Sequence[str], append: bool):
+        self.file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames)
+        if not append:
+            self.writer.writeheader()
+
+    def write(self, row: Dict[str, Any]):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class _JsonLinesSink:
+    def __init__(self, path: str, fieldnames: Sequence[str], append: bool):
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, row: Dict[str, Any]):
+        self.file.write(json.dumps(row, default=str))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+
+def _arrow_type(values: List[Any]):
+    """Picks a column type from sample values: bool, int64, float64, or string for anything else."""
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return pyarrow.bool_()
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return pyarrow.int64()
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def _arrow_value(value: Any, arrow_type) -> Any:
+    """Fits a value to its column: numbers that are not numbers (e.g. "N/A") become nulls."""
+    if value is None:
+        return None
+    if arrow_type == pyarrow.string():
+        return str(value)
+    if arrow_type == pyarrow.bool_():
+        return value if isinstance(value, bool) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if arrow_type == pyarrow.int64():
+        return int(value) if float(value).is_integer() else None
+    return float(value)
+
+
+class _ParquetSink:
+    """Writes rows a row group at a time. Column types come from the first row group (or `schema`)."""
+
+    def __init__(self, path: str, fieldnames: Sequence[str], schema=None):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.schema = schema
+        self.writer = None
+        self.buffer: List[Dict[str, Any]] = []
+
+    def write(self, row: Dict[str, Any]):
+        self.buffer.append(row)
+        if len(self.buffer) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self.schema is None:
+            self.schema = pyarrow.schema([
+                (name, _arrow_type([row.get(name) for row in self.buffer])) for name in self.fieldnames
+            ])
+        if self.writer is None:
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        if self.buffer:
+            columns = [
+                pyarrow.array([_arrow_value(row.get(field.name), field.type) for row in self.buffer], type=field.type)
+                for field in self.schema
+            ]
+            self.writer.write_table(pyarrow.Table.from_arrays(columns, schema=self.schema))
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def _read_rows(fmt: str, path: str) -> Iterator[Dict[str, Any]]:
+    """Streams the rows of an existing export file."""
+    if fmt == "csv":
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif fmt == "jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+            yield from batch.to_pylist()
+
+
+def _normalize(fmt: str, row: Dict[str, Any], schema=None) -> Dict[str, Any]:
+    """
+    Returns the row as it would read back from the file, so unchanged rows compare equal.
+    Parquet rows are fitted to the file's `schema`, so e.g. a mixed column reads back as strings.
+    """
+    if fmt == "csv":
+        return {name: "" if value is None else str(value) for name, value in row.items()}
+    if fmt == "jsonl":
+        return json.loads(json.dumps(row, default=str))
+    return {field.name: _arrow_value(row.get(field.name), field.type) for field in schema}
+
+
+class RowExporter:
+    """
+    Streams report rows to a CSV, JSON Lines or Parquet file, chosen by extension.
+
+    In WRITE mode rows go straight to a temporary file that replaces the output
+    when the exporter closes, so a failed export never leaves a partial file.
+    APPEND adds rows to the end of an existing file (CSV and JSON Lines are
+    appended in place; Parquet is copied a row group at a time). UPSERT holds
+    only the new rows in memory, then streams the existing file once, replacing
+    rows whose `key` columns match and appending the rest. If every new row is
+    already in the file unchanged, the file is left untouched.
+
+    Use it as a context manager:
+
+        with RowExporter("rosters.csv", fieldnames, mode=UPSERT, key=["Team", "Player Name"]) as out:
+            for row in rows:
+                out.write(row)
+    """
+
+    def __init__(self, path: str, fieldnames: Sequence[str], mode: str = WRITE, key: Sequence[str] = None):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.format = export_format(path)
+        self.mode = mode
+        self.key = list(key or [])
+        self.rows_written = 0
+        if self.format is None:
+            raise ValueError(f"Unsupported export file '{path}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode '{mode}'. Use one of: {', '.join(EXPORT_MODES)}.")
+        if mode == UPSERT and not self.key:
+            raise ValueError("Upserting rows needs the key columns that identify a row.")
+        if self.format == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow. Install it with: pip install pyarrow")
+
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._pending: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._sink = None
+        if mode == WRITE or not self._exists:
+            self._sink = self._open_sink(self._tmp_path)
+        elif mode == APPEND:
+            self._check_columns()
+            if self.format == "parquet":
+                self._sink = self._open_sink(self._tmp_path, schema=pyarrow.parquet.read_schema(path))
+                for row in _read_rows(self.format, path):
+                    self._sink.write(row)
+            else:
+                self._sink = self._open_sink(path, append=True)
+
+    def _open_sink(self, path: str, append: bool = False, schema=None):
+        self._sink_path = path
+        if self.format == "csv":
+            return _CsvSink(path, self.fieldnames, append)
+        if self.format == "jsonl":
+            return _JsonLinesSink(path, self.fieldnames, append)
+        return _ParquetSink(path, self.fieldnames, schema)
+
+    def _check_columns(self):
+        """Refuses to append rows with different columns than the existing file."""
+        if self.format == "csv":
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                columns = next(csv.reader(f), [])
+        elif self.format == "parquet":
+            columns = pyarrow.parquet.read_schema(self.path).names
+        else:
+            return  # JSON Lines rows carry their own field names
+        if columns != self.fieldnames:
+            raise ValueError(f"'{self.path}' has columns {columns}, not {self.fieldnames}; "
+                             f"cannot add rows to it.")
+
+    def _row_key(self, row: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(row.get(name)) for name in self.key)
+
+    def write(self, row: Dict[str, Any]):
+        if self._sink is None:  # Upserting into an existing file: merged when the exporter closes
+            self._pending[self._row_key(row)] = row
+        else:
+            self._sink.write(row)
+        self.rows_written += 1
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            self.write(row)
+
+    def _merge(self) -> bool:
+        """Streams the existing file into the temporary one, replacing and then appending the upserted rows."""
+        self._check_columns()
+        schema = pyarrow.parquet.read_schema(self.path) if self.format == "parquet" else None
+        self._sink = self._open_sink(self._tmp_path, schema=schema)
+        changed = False
+        for row in _read_rows(self.format, self.path):
+            new_row = self._pending.pop(self._row_key(row), None)
+            if new_row is not None and _normalize(self.format, new_row, schema) != row:
+                changed = True
+                row = new_row
+            self._sink.write(row)
+        for row in self._pending.values():
+            changed = True
+            self._sink.write(row)
+        return changed  # Nothing new: the existing file is kept as it is
+
+    def close(self, success: bool = True):
+        """Finishes the export. With success=False the output file is left as it was."""
+        replace = True
+        if self._sink is None:
+            if not success:
+                return
+            replace = self._merge()
+        self._sink.close()
+        if self._sink_path == self._tmp_path:
+            if success and replace:
+                os.replace(self._tmp_path, self.path)
+            else:
+                os.remove(self._tmp_path)
+
+    def __enter__(self) -> "RowExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(success=exc_type is None)
+        return False
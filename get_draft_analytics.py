@@ -0,0 +1,129 @@
+import datetime
+from typing import Any, Dict, Iterator
+from cli_options import DRAFT_ANALYTICS_YEARS
+from common import (DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT, build_arg_parser, get_leagues,
+                    get_warehouse_leagues, parse_args, run_script)
+from draft_analytics import EARLY_ROUNDS, DraftAnalytics, load_draft_analytics
+from exporters import WRITE, RowExporter, export_format
+from league_cache import print_cache_stats
+import instrumentation
+from player_index import resolve_players
+
+ADP_FIELDS = ['Player ID', 'Player Name', 'Position', 'Times Drafted', 'ADP', 'Average Round',
+              'Average Value Over Pick']
+# The columns that identify a player when upserting into an existing export. Names
+# are not unique (and unknown players have none), so rows are matched by ID.
+ADP_KEY = ['Player ID']
+
+# Players shown in the console ADP table.
+TOP_PLAYERS = 25
+
+
+def adp_rows(analytics: DraftAnalytics, names: Dict[int, str]) -> Iterator[Dict[str, Any]]:
+    """Yields one row per drafted player, earliest average draft position first."""
+    for entry in sorted(analytics.adp().values(), key=lambda entry: entry.adp):
+        yield {
+            'Player ID': entry.player_id,
+            'Player Name': names.get(entry.player_id, f"Unknown (ID: {entry.player_id})"),
+            'Position': entry.position,
+            'Times Drafted': entry.times_drafted,
+            'ADP': round(entry.adp, 1),
+            'Average Round': round(entry.average_round, 1),
+            'Average Value Over Pick': round(entry.average_value, 1),
+        }
+
+
+def display_draft_analytics(output_file: str = None, num_years: int = DRAFT_ANALYTICS_YEARS, max_workers: int = DEFAULT_MAX_WORKERS,
+                            timeout: float = DEFAULT_SEASON_TIMEOUT, use_warehouse: bool = False, mode: str = WRITE):
+    """
+    Analyzes the drafts of the last `num_years` completed seasons: average draft
+    position and value over pick per player, hit rates by round and position,
+    and each manager's drafting tendencies.
+
+    The ADP table can be exported to a CSV, JSON Lines or Parquet file; `mode`
+    (WRITE, APPEND or UPSERT) says how to treat an existing output file.
+    """
+    current_year = datetime.datetime.now().year
+    years = range(current_year - 1, current_year - 1 - num_years, -1)
+    print(f"Analyzing drafts for seasons: {list(years)}...")
+
+    if use_warehouse:
+        leagues = get_warehouse_leagues(years)
+    else:
+        leagues = get_leagues(years, max_workers=max_workers, timeout=timeout)
+    if not leagues:
+        print("No seasons could be loaded.")
+        return
+
+    analytics = load_draft_analytics(leagues.values())
+    with instrumentation.stage("draft_analytics"):
+        adp = analytics.adp()
+        hit_rates = analytics.hit_rates()
+        profiles = analytics.team_profiles()
+
+    latest = max(leagues)
+    players = resolve_players(leagues[latest], list(adp))
+    names = {player_id: record.name for player_id, record in players.items()}
+
+    if export_format(output_file):
+        print(f"Exporting draft analytics to {output_file}...")
+        try:
+            with instrumentation.stage("csv_write"), \
+                    RowExporter(output_file, ADP_FIELDS, mode=mode, key=ADP_KEY) as exporter:
+                exporter.write_rows(adp_rows(analytics, names))
+        except ValueError as e:
+            print(f"Error: {e}")
+        return
+
+    table_width = 80
+    print(f"\n--- Average Draft Position (top {TOP_PLAYERS}, keepers excluded) ---")
+    print("=" * table_width)
+    print(f"{'PLAYER NAME':<25} {'POS':<5} {'DRAFTED':>8} {'ADP':>8} {'AVG RND':>8} {'VALUE':>8}")
+    print("-" * table_width)
+    for row in list(adp_rows(analytics, names))[:TOP_PLAYERS]:
+        print(f"{row['Player Name']:<25} {row['Position']:<5} {row['Times Drafted']:>8} {row['ADP']:>8.1f} "
+              f"{row['Average Round']:>8.1f} {row['Average Value Over Pick']:>+8.1f}")
+    print("=" * table_width)
+
+    print("\n--- Hit Rate by Round and Position (finished at or above draft slot) ---")
+    positions = sorted({position for _, position in hit_rates})
+    print("=" * table_width)
+    print(f"{'ROUND':>5} " + " ".join(f"{position:>8}" for position in positions))
+    print("-" * table_width)
+    for round_num in sorted({round_num for round_num, _ in hit_rates}):
+        cells = []
+        for position in positions:
+            hit_rate = hit_rates.get((round_num, position))
+            cells.append(f"{hit_rate.rate:>7.0%} " if hit_rate else f"{'-':>8}")
+        print(f"{round_num:>5} " + " ".join(cells))
+    print("=" * table_width)
+
+    print("\n--- Manager Drafting Profiles ---")
+    for team_id, profile in profiles.items():
+        team_name = analytics.store.team_name(latest, team_id)
+        early = ", ".join(f"{position} {share:.0%}" for position, share in profile.early_position_share.items())
+        overall = ", ".join(f"{position} {share:.0%}" for position, share in profile.position_share.items())
+        print(f"\nTeam: {team_name} ({profile.seasons} seasons, {profile.picks} picks, {profile.keepers} keepers)")
+        print(f"  Average value over pick: {profile.average_value:+.1f}, hit rate: {profile.hit_rate:.0%}")
+        print(f"  Rounds 1-{EARLY_ROUNDS}: {early}")
+        print(f"  All rounds: {overall}")
+
+
+def main():
+    """Main function to run the draft-history analytics."""
+    parser = build_arg_parser("Analyze draft history: ADP, value over pick and manager tendencies.",
+                              use_warehouse=True)
+    parser.add_argument("--years", type=int, default=DRAFT_ANALYTICS_YEARS,
+                        help=f"Number of completed seasons to analyze (default: {DRAFT_ANALYTICS_YEARS}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Number of seasons to download at once (default: {DEFAULT_MAX_WORKERS}).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_SEASON_TIMEOUT,
+                        help=f"Seconds allowed to load each season (default: {DEFAULT_SEASON_TIMEOUT}).")
+    args = parse_args(parser)
+    display_draft_analytics(args.output_file, num_years=args.years, max_workers=args.workers, timeout=args.timeout,
+                            use_warehouse=args.warehouse, mode=args.export_mode)
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    run_script(main)
@@ -1,70 +1,107 @@
-import sys
-import csv
 from espn_api.football import League
-from common import get_league
+from common import build_arg_parser, get_league, get_warehouse_league, parse_args, run_script
+from draft_store import DraftStore
+from draft_watch import DEFAULT_POLL_INTERVAL, DraftWatcher
+from exporters import WRITE, RowExporter, export_format
+from league_cache import print_cache_stats
+import instrumentation
+from player_index import resolve_players
 
 
-def display_draft_recap(league: League, output_file: str = None):
+DRAFT_FIELDS = ['Round', 'Pick', 'Player Name', 'Position', 'Team', 'Season']
+# The columns that identify a pick when upserting into an existing export.
+DRAFT_KEY = ['Season', 'Pick']
+
+
+def display_draft_recap(league: League, output_file: str = None, store: DraftStore = None, mode: str = WRITE):
     """
     Fetches and displays the draft recap for a completed draft.
-    Can export the data to a CSV file.
+    Can export the data to a CSV, JSON Lines or Parquet file.
+
+    :param store: Optional. A DraftStore already holding this season; one is built if omitted.
+    :param mode: How to treat an existing output file: WRITE, APPEND or UPSERT (by DRAFT_KEY).
     """
-    try:
-        print(f"\nFetching draft data for the {league.year} season...")
-        draft_picks = league.draft
+    print(f"\nFetching draft data for the {league.year} season...")
+    if store is None:
+        store = DraftStore()
+    store.add_league(league)
+    draft_picks = list(store.picks_for_season(league.year))
 
-        if not draft_picks:
-            print(f"Could not find any draft data for the {league.year} season.")
-            return
+    if not draft_picks:
+        print(f"Could not find any draft data for the {league.year} season.")
+        return
 
-        draft_data = []
-        for i, pick in enumerate(draft_picks):
-            team = pick.team.team_name
-            round_num = pick.round_num
-            pick_num = i + 1
+    # Resolve every drafted player in a few batched requests up front
+    players = resolve_players(league, [pick.player_id for pick in draft_picks])
 
+    def draft_rows():
+        for pick in draft_picks:
             # Robustly get player info to avoid errors with older seasons
-            player_info = league.player_info(playerId=pick.playerId)
+            player_info = players.get(pick.player_id)
             if player_info:
                 player_name, position = player_info.name, player_info.position
             else:
-                player_name, position = f"Unknown (ID: {pick.playerId})", "N/A"
+                player_name, position = f"Unknown (ID: {pick.player_id})", "N/A"
 
-            draft_data.append({
-                'Round': round_num,
-                'Pick': pick_num,
+            yield {
+                'Round': pick.round,
+                'Pick': pick.overall,
                 'Player Name': player_name,
                 'Position': position,
-                'Team': team
-            })
-
-        if output_file and output_file.lower().endswith('.csv'):
-            print(f"Exporting draft data to {output_file}...")
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=draft_data[0].keys())
-                writer.writeheader()
-                writer.writerows(draft_data)
-        else:
-            print(f"Draft Recap for {league.year}:")
-            print("-" * 80)
-            print(f"{'ROUND':>5} {'PICK':>5} {'PLAYER NAME':<25} {'POSITION':<10} {'TEAM':<25}")
-            print("-" * 80)
-            for pick_data in draft_data:
-                print(f"{pick_data['Round']:>5} {pick_data['Pick']:>5} {pick_data['Player Name']:<25} {pick_data['Position']:<10} {pick_data['Team']:<25}")
-            print("-" * 80)
-    except Exception as e:
-        print(f"An unexpected error occurred while fetching draft data: {e}")
-        sys.exit(1)
+                'Team': store.team_name(pick.season, pick.team_id),
+                'Season': pick.season,
+            }
+
+    if export_format(output_file):
+        print(f"Exporting draft data to {output_file}...")
+        try:
+            with instrumentation.stage("csv_write"), \
+                    RowExporter(output_file, DRAFT_FIELDS, mode=mode, key=DRAFT_KEY) as exporter:
+                exporter.write_rows(draft_rows())
+        except ValueError as e:
+            print(f"Error: {e}")
+    else:
+        print(f"Draft Recap for {league.year}:")
+        print("-" * 80)
+        print(f"{'ROUND':>5} {'PICK':>5} {'PLAYER NAME':<25} {'POSITION':<10} {'TEAM':<25}")
+        print("-" * 80)
+        for pick_data in draft_rows():
+            print(f"{pick_data['Round']:>5} {pick_data['Pick']:>5} {pick_data['Player Name']:<25} {pick_data['Position']:<10} {pick_data['Team']:<25}")
+        print("-" * 80)
+
+
+def watch_draft(league: League, output_file: str = None, interval: float = DEFAULT_POLL_INTERVAL):
+    """
+    Follows the league's live draft until it completes, handling only the new picks on each poll.
+
+    :param output_file: Optional. A .csv file that every pick is appended to as it is made.
+    :param interval: Seconds between polls.
+    """
+    csv_file = output_file if output_file and output_file.lower().endswith('.csv') else None
+    DraftWatcher(league, csv_file).watch(interval)
 
 
 def main():
     """
     Main function to get league data and display the draft recap.
     """
-    output_file = sys.argv[1] if len(sys.argv) > 1 else None
-    league = get_league()
-    display_draft_recap(league, output_file)
+    parser = build_arg_parser("Display the draft recap for a season.", use_warehouse=True)
+    parser.add_argument("--watch", action="store_true",
+                        help="Follow a live draft, showing (and appending to the CSV file) each pick as it is made.")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f"Seconds between polls in --watch mode (default: {DEFAULT_POLL_INTERVAL}).")
+    args = parse_args(parser)
+    if args.watch and args.warehouse:
+        parser.error("--watch follows the live draft and cannot be used with --warehouse")
+
+    league = get_warehouse_league() if args.warehouse else get_league(roster_only=True)
+    if args.watch:
+        watch_draft(league, args.output_file, args.interval)
+    else:
+        with instrumentation.stage("report"):
+            display_draft_recap(league, args.output_file, mode=args.export_mode)
+    print_cache_stats()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_script(main)
\ No newline at end of file
@@ -1,124 +1,123 @@
-import sys
-import csv
 import datetime
-from collections import defaultdict
-from common import get_league
-
-
-def analyze_keepers(output_file: str = None):
+from cli_options import KEEPER_ANALYSIS_YEARS
+from common import (DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT, build_arg_parser, get_leagues,
+                    get_warehouse_leagues, parse_args, run_script)
+from draft_store import DraftStore
+from exporters import WRITE, RowExporter, export_format
+from keeper_streaks import keeper_counts, store_streaks
+from league_cache import print_cache_stats
+import instrumentation
+from player_index import resolve_players
+
+KEEPER_ANALYSIS_FIELDS = ['Player Name', 'Team', 'Consecutive Years Kept']
+# The columns that identify a streak when upserting into an existing export.
+KEEPER_ANALYSIS_KEY = ['Player Name', 'Team']
+
+
+def analyze_keepers(output_file: str = None, num_years: int = KEEPER_ANALYSIS_YEARS, max_workers: int = DEFAULT_MAX_WORKERS,
+                    timeout: float = DEFAULT_SEASON_TIMEOUT, use_warehouse: bool = False, league_id: int = None,
+                    espn_s2: str = None, swid: str = None, mode: str = WRITE, latest_season: int = None):
     """
-    Fetches draft data for the last 3 years and analyzes consecutive
-    keeper streaks for players kept by the same team.
+    Fetches draft data for the last `num_years` completed seasons and analyzes
+    consecutive keeper streaks for players kept by the same team.
+
+    All seasons are downloaded concurrently (up to `max_workers` at a time, each
+    limited to `timeout` seconds) before the streaks are computed. With
+    `use_warehouse`, the seasons are read from the local warehouse instead.
+    `league_id`, `espn_s2` and `swid` override the environment configuration.
+    `mode` (WRITE, APPEND or UPSERT) says how to treat an existing output file.
+    `latest_season` is the most recent season analyzed (default: last year).
     """
-    try:
-        current_year = datetime.datetime.now().year
-        # Analyze the last 3 completed seasons
-        years_to_check = range(current_year - 1, current_year - 4, -1)
-        
-        print(f"Analyzing keeper data for seasons: {list(years_to_check)}...")
-
-        player_keeper_history = defaultdict(list)
-
-        for year in years_to_check:
-            print(f"\nFetching data for {year} season...")
-            # The get_league function is now flexible enough to be called with a specific year
-            league = get_league(year=year)
-            
-            if not league.draft:
-                print(f"Warning: No draft data found for {year}. Skipping.")
-                continue
-
-            keeper_count = 0
-            for pick in league.draft:
-                if pick.keeper_status:
-                    keeper_count += 1
-
-                    # --- ROBUST PLAYER NAME FETCH ---
-                    # Instead of pick.player_name, which can fail on older data,
-                    # we look up the player by their ID for reliability.
-                    player_info = league.player_info(playerId=pick.playerId)
-                    player_name = player_info.name if player_info else f"Unknown (ID: {pick.playerId})"
-
-                    player_keeper_history[pick.playerId].append({
-                        "year": year,
-                        "team_id": pick.team.team_id,
-                        "team_name": pick.team.team_name,
-                        "player_name": player_name
+    if latest_season is None:
+        latest_season = datetime.datetime.now().year - 1
+    # Analyze the last `num_years` seasons through `latest_season`
+    years_to_check = range(latest_season, latest_season - num_years, -1)
+
+    print(f"Analyzing keeper data for seasons: {list(years_to_check)}...")
+
+    if use_warehouse:
+        leagues = get_warehouse_leagues(years_to_check)
+    else:
+        leagues = get_leagues(years_to_check, max_workers=max_workers, timeout=timeout,
+                              league_id=league_id, espn_s2=espn_s2, swid=swid)
+
+    store = DraftStore.from_leagues(leagues.values())
+    counts = keeper_counts(store)
+
+    for year, league in leagues.items():
+        if not league.draft:
+            print(f"Warning: No draft data found for {year}. Skipping.")
+            continue
+        print(f"Found {sum(n for (_, season), n in counts.items() if season == year)} keepers in {year}.")
+
+    print("\n--- Keeper Streak Analysis ---")
+    # A keeper streak is only relevant if it includes the most recent season,
+    # which is the first in the list.
+    most_recent_analyzed_year = years_to_check[0]
+    streaks = [
+        summary for summary in store_streaks(store, latest_season=most_recent_analyzed_year).values()
+        if summary.current > 1
+    ]
+
+    # --- ROBUST PLAYER NAME FETCH ---
+    # Instead of pick.player_name, which can fail on older data, we look up
+    # only the streak players by their IDs, batched through the shared player index.
+    players = {}
+    if streaks:
+        players = resolve_players(leagues[most_recent_analyzed_year], [summary.player_id for summary in streaks])
+
+    consecutive_keepers = []
+    for summary in streaks:
+        player_info = players.get(summary.player_id)
+        consecutive_keepers.append({
+            "name": player_info.name if player_info else f"Unknown (ID: {summary.player_id})",
+            "team": store.team_name(most_recent_analyzed_year, summary.team_id),
+            "streak": summary.current
+        })
+
+    if not consecutive_keepers:
+        print("No players found with a keeper streak of 2 or more consecutive years.")
+        return
+
+    consecutive_keepers.sort(key=lambda x: (-x['streak'], x['name']))
+
+    if export_format(output_file):
+        print(f"Exporting keeper analysis to {output_file}...")
+        try:
+            with instrumentation.stage("csv_write"), \
+                    RowExporter(output_file, KEEPER_ANALYSIS_FIELDS, mode=mode, key=KEEPER_ANALYSIS_KEY) as exporter:
+                for k in consecutive_keepers:
+                    exporter.write({
+                        'Player Name': k['name'],
+                        'Team': k['team'],
+                        'Consecutive Years Kept': k['streak']
                     })
-            print(f"Found {keeper_count} keepers in {year}.")
-
-        print("\n--- Keeper Streak Analysis ---")
-        consecutive_keepers = []
-
-        # The most recent season we are analyzing is the first in the list
-        most_recent_analyzed_year = years_to_check[0]
-
-        for player_id, history in player_keeper_history.items():
-            if len(history) < 2:
-                continue
-
-            # Sort by year descending to find the most recent streak
-            history.sort(key=lambda x: x['year'], reverse=True)
-
-            # A keeper streak is only relevant if it includes the most recent season.
-            if history[0]['year'] != most_recent_analyzed_year:
-                continue
-
-            streak = 1
-            last_team_id = history[0]['team_id']
-            
-            for i in range(1, len(history)):
-                # Check if the current pick is from the previous year and by the same team
-                if history[i]['year'] == history[i-1]['year'] - 1 and history[i]['team_id'] == last_team_id:
-                    streak += 1
-                else:
-                    break  # The streak is broken
-            
-            if streak > 1:
-                consecutive_keepers.append({
-                    "name": history[0]['player_name'],
-                    "team": history[0]['team_name'],
-                    "streak": streak
-                })
-
-        if not consecutive_keepers:
-            print("No players found with a keeper streak of 2 or more consecutive years.")
-            return
-
-        consecutive_keepers.sort(key=lambda x: (-x['streak'], x['name']))
-
-        if output_file and output_file.lower().endswith('.csv'):
-            print(f"Exporting keeper analysis to {output_file}...")
-            csv_data = [{
-                'Player Name': k['name'],
-                'Team': k['team'],
-                'Consecutive Years Kept': k['streak']
-            } for k in consecutive_keepers]
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=csv_data[0].keys())
-                writer.writeheader()
-                writer.writerows(csv_data)
-        else:
-            table_width = 70
-            print("=" * table_width)
-            print(f"{'PLAYER NAME':<25} {'TEAM':<25} {'CONSECUTIVE YEARS KEPT':>20}")
-            print("-" * table_width)
-            for keeper in consecutive_keepers:
-                print(f"{keeper['name']:<25} {keeper['team']:<25} {str(keeper['streak']) + ' years':>20}")
-            print("=" * table_width)
-
-
-    except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
-        print("Please ensure your credentials in 'run_fantasy_data.bat' are correct.")
-        sys.exit(1)
+        except ValueError as e:
+            print(f"Error: {e}")
+    else:
+        table_width = 70
+        print("=" * table_width)
+        print(f"{'PLAYER NAME':<25} {'TEAM':<25} {'CONSECUTIVE YEARS KEPT':>20}")
+        print("-" * table_width)
+        for keeper in consecutive_keepers:
+            print(f"{keeper['name']:<25} {keeper['team']:<25} {str(keeper['streak']) + ' years':>20}")
+        print("=" * table_width)
 
 
 def main():
     """Main function to run the keeper analysis."""
-    output_file = sys.argv[1] if len(sys.argv) > 1 else None
-    analyze_keepers(output_file)
+    parser = build_arg_parser("Analyze consecutive keeper streaks.", use_warehouse=True)
+    parser.add_argument("--years", type=int, default=KEEPER_ANALYSIS_YEARS,
+                        help=f"Number of completed seasons to analyze (default: {KEEPER_ANALYSIS_YEARS}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Number of seasons to download at once (default: {DEFAULT_MAX_WORKERS}).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_SEASON_TIMEOUT,
+                        help=f"Seconds allowed to load each season (default: {DEFAULT_SEASON_TIMEOUT}).")
+    args = parse_args(parser)
+    analyze_keepers(args.output_file, num_years=args.years, max_workers=args.workers, timeout=args.timeout,
+                    use_warehouse=args.warehouse, mode=args.export_mode)
+    print_cache_stats()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_script(main)
\ No newline at end of file
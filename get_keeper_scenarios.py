@@ -0,0 +1,161 @@
+import argparse
+from typing import Dict, List, Optional
+
+from common import (DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT, build_arg_parser, create_league, get_league_config,
+                    get_leagues, parse_args, run_script)
+from draft_analytics import load_draft_analytics, season_points
+from draft_simulator import (DEFAULT_SIMULATIONS, PickModel, board_from_draft_detail, board_from_league,
+                             simulate_scenarios)
+from draft_store import DraftStore
+from get_keepers import HISTORY_YEAR, LEAGUE_YEAR, MAX_KEEPER_YEARS, UNDRAFTED_ROUND_COST
+from keeper_eligibility import load_keeper_index
+from keeper_optimizer import KeeperCandidate, optimize_keepers, replacement_values
+from league_cache import print_cache_stats
+from player_index import resolve_players
+
+
+def parse_scenario(spec: str) -> List[tuple]:
+    """Parses a --keep value such as "4426515:3,4241463" into [(player_id, round or None), ...]."""
+    keepers = []
+    for part in spec.split(","):
+        player_id, _, round_num = part.strip().partition(":")
+        try:
+            keepers.append((int(player_id), int(round_num) if round_num else None))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected PLAYER_ID[:ROUND][,...], got {spec!r}")
+    return keepers
+
+
+def fetch_draft_board(league_id: int, espn_s2: Optional[str], swid: Optional[str], history_league):
+    """
+    Returns the LEAGUE_YEAR draft board (pick order and keeper slots) from its
+    mDraftDetail view, or the HISTORY_YEAR board if the new draft is not set up yet.
+    """
+    try:
+        # Only the draft settings are needed, so skip the pro player map and schedules
+        league = create_league(league_id, LEAGUE_YEAR, espn_s2=espn_s2, swid=swid, roster_only=True)
+        board = board_from_draft_detail(
+            league.espn_request.league_get(params={"view": "mDraftDetail"}).get("draftDetail", {}))
+        if board:
+            return board
+    except Exception as e:
+        print(f"Warning: Could not load the {LEAGUE_YEAR} draft board. Error: {e}")
+    print(f"Using the {HISTORY_YEAR} draft order as the draft board.")
+    return board_from_league(history_league)
+
+
+def display_keeper_scenarios(team_id: int, scenario_specs: List[List[tuple]] = None,
+                             simulations: int = DEFAULT_SIMULATIONS, workers: int = None, num_years: int = 3,
+                             max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = DEFAULT_SEASON_TIMEOUT,
+                             seed: int = 0):
+    """
+    Compares a team's expected draft under several keeper scenarios.
+
+    Each scenario is simulated `simulations` times: opponents keep their
+    recommended keepers (see get_optimal_keepers.py) and draft by the league's
+    ADP over the last `num_years` seasons, and the team's starting lineup
+    (keepers plus drafted players, valued at HISTORY_YEAR points) is scored.
+
+    :param team_id: The team whose keeper scenarios are compared.
+    :param scenario_specs: Optional. Extra scenarios, each a list of (player_id, round); a round
+                           of None uses the player's keeper cost.
+    """
+    league_id, _, espn_s2, swid = get_league_config(HISTORY_YEAR)
+    years = range(HISTORY_YEAR, HISTORY_YEAR - num_years, -1)
+    leagues = get_leagues(years, max_workers=max_workers, timeout=timeout)
+    if HISTORY_YEAR not in leagues:
+        print(f"The {HISTORY_YEAR} season could not be loaded.")
+        return
+    league = leagues[HISTORY_YEAR]
+    teams = {team.team_id: team for team in league.teams}
+    if team_id not in teams:
+        print(f"Unknown team ID {team_id}. Teams: "
+              + ", ".join(f"{team.team_id} ({team.team_name})" for team in league.teams))
+        return
+
+    keeper_index = load_keeper_index(league_id, HISTORY_YEAR, espn_s2, swid, loaded=leagues)
+    store = DraftStore.from_leagues(leagues.values())
+    rounds = max([pick.round for pick in store.picks_for_season(HISTORY_YEAR)] + [UNDRAFTED_ROUND_COST])
+    replacement = replacement_values(league, rounds)
+    max_keepers = getattr(league.settings, "keeper_count", 0) or 3
+
+    # Every team's recommended keepers: the opponents' in all scenarios, and one of this team's scenarios
+    recommended: Dict[int, Dict[int, int]] = {}
+    for team in league.teams:
+        candidates = [
+            KeeperCandidate(player.playerId, player.name, getattr(player, "position", "N/A"),
+                            keeper_index.keeper_round(player.playerId, team.team_id, UNDRAFTED_ROUND_COST),
+                            getattr(player, "total_points", 0) or 0)
+            for player in team.roster
+            if keeper_index.is_eligible(player.playerId, team.team_id, MAX_KEEPER_YEARS)
+        ]
+        recommended[team.team_id] = {choice.candidate.player_id: choice.round
+                                     for choice in optimize_keepers(candidates, replacement, max_keepers)}
+
+    scenarios: Dict[str, Dict[int, int]] = {"No keepers": {}, "Recommended keepers": recommended[team_id]}
+    if scenario_specs:
+        for spec in scenario_specs:
+            keepers = {player_id: round_num or keeper_index.keeper_round(player_id, team_id, UNDRAFTED_ROUND_COST)
+                       for player_id, round_num in spec}
+            scenarios[", ".join(f"{player_id}:R{round_num}" for player_id, round_num in keepers.items())] = keepers
+    else:
+        for player_id, round_num in recommended[team_id].items():
+            scenarios[f"{player_id}:R{round_num}"] = {player_id: round_num}
+
+    analytics = load_draft_analytics(leagues.values(), store=store)
+    adp = analytics.adp()
+    keeper_ids = {player_id for keepers in scenarios.values() for player_id in keepers}
+    points, positions = season_points(league, set(adp) | keeper_ids)
+    model = PickModel.from_adp(adp, points, positions)
+    board = fetch_draft_board(league_id, espn_s2, swid, league)
+
+    print(f"\nSimulating {simulations} drafts per scenario for {teams[team_id].team_name}...")
+    results = simulate_scenarios(board, model, team_id, scenarios, other_keepers=recommended,
+                                 simulations=simulations, workers=workers, seed=seed)
+
+    players = resolve_players(league, list(keeper_ids))
+    baseline = results[0].mean
+    table_width = 90
+    print("\n--- Expected Starting Lineup Points by Keeper Scenario ---")
+    print("=" * table_width)
+    print(f"{'SCENARIO':<40} {'MEAN':>9} {'STD DEV':>9} {'P10':>9} {'P90':>9} {'VS NONE':>9}")
+    print("-" * table_width)
+    for result in results:
+        name = ", ".join(f"{players[player_id].name if player_id in players else player_id} (R{round_num})"
+                         for player_id, round_num in result.keepers.items()) or "No keepers"
+        if result.name == "Recommended keepers":
+            name = f"Recommended: {name}"
+        print(f"{name[:40]:<40} {result.mean:>9.1f} {result.std_dev:>9.1f} {result.p10:>9.1f} {result.p90:>9.1f} "
+              f"{result.mean - baseline:>+9.1f}")
+    print("=" * table_width)
+
+
+def main():
+    """Main function to compare keeper scenarios with simulated drafts."""
+    parser = build_arg_parser("Compare keeper scenarios by simulating the draft thousands of times.",
+                              output_file=False)
+    parser.add_argument("--team", type=int, required=True,
+                        help="ID of the team whose keeper scenarios to compare.")
+    parser.add_argument("--keep", type=parse_scenario, action="append", default=None, metavar="PLAYER_ID[:ROUND],...",
+                        help="A keeper scenario to simulate; repeat for several. A player without a round uses "
+                             "their keeper cost. Default: each recommended keeper alone.")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS,
+                        help=f"Mock drafts per scenario (default: {DEFAULT_SIMULATIONS}).")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes running the simulations (default: one per CPU).")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed, for repeatable results (default: 0).")
+    parser.add_argument("--years", type=int, default=3,
+                        help="Number of completed seasons to build ADP from (default: 3).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Number of seasons to download at once (default: {DEFAULT_MAX_WORKERS}).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_SEASON_TIMEOUT,
+                        help=f"Seconds allowed to load each season (default: {DEFAULT_SEASON_TIMEOUT}).")
+    args = parse_args(parser)
+    display_keeper_scenarios(args.team, args.keep, simulations=args.simulations, workers=args.processes,
+                             num_years=args.years, max_workers=args.workers, timeout=args.timeout, seed=args.seed)
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    run_script(main)
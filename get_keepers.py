@@ -1,9 +1,16 @@
 
-import json
 import os
 from typing import Dict, Tuple, Optional, Any
 import requests
 from espn_api.football import League
+from common import LeagueLoadError, build_arg_parser, create_league, parse_args, run_script
+from keeper_eligibility import load_keeper_index
+from league_cache import CacheMissError, cached_json, print_cache_stats
+from keeper_parser import extract_keeper_teams
+from player_index import resolve_players
+import instrumentation
+from transport import FetchError, http_get
+from weekly_stats import league_aggregates
 
 # --- Configuration ---
 # The year of the fantasy league you want to query.
@@ -13,6 +20,9 @@ HISTORY_YEAR = 2024 # The most recently completed season to get draft data from
 # The draft round cost for a player who was not drafted by the team (e.g., waiver pickup).
 UNDRAFTED_ROUND_COST = 16
 
+# How many seasons in a row a player may be kept (None for no limit).
+MAX_KEEPER_YEARS = None
+
 def get_credentials() -> Optional[Tuple[str, str, str]]:
     """Loads and validates required credentials from environment variables."""
     league_id = os.getenv('LEAGUE_ID')
@@ -25,63 +35,84 @@ def get_credentials() -> Optional[Tuple[str, str, str]]:
         return None
     return league_id, espn_s2, swid
 
-def initialize_league(league_id: int, year: int, espn_s2: str, swid: str) -> Optional[League]:
-    """Initializes and returns a League object for a given year."""
+def initialize_league(league_id: int, year: int, espn_s2: str, swid: str) -> League:
+    """
+    Initializes and returns a League object for a given year.
+
+    :raises LeagueLoadError: If the league cannot be loaded.
+    """
     try:
         print(f"Connecting to league for {year}...")
-        return League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
+        return create_league(league_id, year, espn_s2=espn_s2, swid=swid)
     except Exception as e:
-        print(f"Error initializing ESPN API for {year}. Check credentials and league ID. Details: {e}")
-        return None
-
-def build_draft_history(league_history: League) -> Dict[Tuple[int, int], int]:
-    """Creates a lookup map of (player_id, team_id) to draft round number."""
-    print("Building historical draft map...")
-    return {
-        (pick.playerId, pick.team.team_id): pick.round_num
-        for pick in league_history.draft
-    }
+        print("Check your credentials and league ID.")
+        raise LeagueLoadError(f"Could not connect to league {league_id} for the {year} season: {e}") from e
 
 def fetch_keeper_json(league_id: str, year: int, cookies: Dict[str, str]) -> Optional[Dict[str, Any]]:
-    """Fetches the raw keeper data from the private ESPN API endpoint."""
+    """
+    Fetches the keeper data from the private ESPN API endpoint.
+
+    The response is parsed as it streams in, keeping only each team's id, name
+    and keeperPlayerIds rather than the full roster payload.
+    """
     keeper_url = (
         f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{year}"
         f"/segments/0/leagues/{league_id}?view=mKeeperRosters"
     )
-    try:
+
+    def fetch() -> Dict[str, Any]:
         print("Fetching live keeper data from ESPN API...")
-        response = requests.get(keeper_url, cookies=cookies)
-        response.raise_for_status()
-        return response.json()
+        with http_get(keeper_url, cookies=cookies, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            keeper_data = extract_keeper_teams(response.raw)
+            instrumentation.count("bytes_downloaded", response.raw.tell())
+            return keeper_data
+
+    try:
+        with instrumentation.stage("keeper_fetch"):
+            return cached_json(int(league_id), year, "mKeeperRosters", {"url": keeper_url, "fields": "keepers"},
+                               fetch)
+    except CacheMissError as e:
+        print(f"Error: {e}")
+        return None
+    except FetchError:
+        raise  # Failed after every retry; run_script or the batch runner reports it
     except requests.exceptions.RequestException as e:
         print(f"Error: Failed to fetch keeper data from the API. Details: {e}")
         return None
-    except json.JSONDecodeError:
+    except ValueError:
         print("Error: Could not decode the JSON response from the API. The data might be malformed.")
         return None
 
-def main():
-    """Main function to orchestrate fetching and processing keeper data."""
-    creds = get_credentials()
-    if not creds:
-        return
-    league_id_str, espn_s2, swid = creds
+def display_keepers(league_id_str: str, espn_s2: str, swid: str, weekly_stats: bool = False,
+                    max_keeper_years: int = MAX_KEEPER_YEARS, league_year: int = LEAGUE_YEAR,
+                    history_year: int = HISTORY_YEAR):
+    """
+    Fetches this season's keepers and prints each one with the round it costs.
+
+    Costs come from the keeper index (see keeper_eligibility.py), so players who
+    were traded keep the round they were originally acquired in. Keepers already
+    kept `max_keeper_years` seasons in a row are flagged as not eligible.
+
+    With `weekly_stats`, each keeper also shows their `history_year` points per game
+    and points above replacement, joined from the season's weekly scoring.
+
+    :param league_year: The season keepers are being selected for.
+    :param history_year: The most recently completed season, which keeper costs come from.
+    """
     league_id_int = int(league_id_str)
 
     # 1. Initialize league connections
-    league = initialize_league(league_id_int, LEAGUE_YEAR, espn_s2, swid)
-    league_history = initialize_league(league_id_int, HISTORY_YEAR, espn_s2, swid)
+    league = initialize_league(league_id_int, league_year, espn_s2, swid)
+    league_history = initialize_league(league_id_int, history_year, espn_s2, swid)
 
-    if not league or not league_history:
-        print("Failed to initialize one or more league sessions. Aborting.")
-        return
-
-    # 2. Build the historical draft map
-    draft_history = build_draft_history(league_history)
+    # 2. Load the keeper index through the most recent completed season
+    keeper_index = load_keeper_index(league_id_int, history_year, espn_s2, swid, loaded={history_year: league_history})
 
     # 3. Fetch the live keeper data
     cookies = {"espn_s2": espn_s2, "SWID": swid}
-    keeper_data = fetch_keeper_json(league_id_str, LEAGUE_YEAR, cookies)
+    keeper_data = fetch_keeper_json(league_id_str, league_year, cookies)
 
     if not keeper_data:
         print("Failed to fetch keeper data. Aborting.")
@@ -89,6 +120,15 @@ def main():
 
     # 4. Process and display the results
     teams = keeper_data.get('teams', [])
+    all_keeper_ids = [
+        player_id
+        for team in teams
+        for player_id in team.get('draftStrategy', {}).get('keeperPlayerIds', [])
+    ]
+    # Resolve every keeper in a few batched requests instead of one call per player
+    players = resolve_players(league, all_keeper_ids)
+    weekly = league_aggregates(league_history, all_keeper_ids) if weekly_stats else {}
+
     print("\n--- Keepers for each team ---")
     for team in teams:
         team_id = team.get('id')
@@ -99,17 +139,38 @@ def main():
             print(f"\nTeam: {team_name}")
             for player_id in keeper_ids:
                 # Get player's name and position from the current league object
-                player = league.player_info(playerId=player_id)
+                player = players.get(player_id)
 
-                # Look up the player's original draft round from the historical map
-                draft_key = (player_id, team_id)
-                draft_round = draft_history.get(draft_key, UNDRAFTED_ROUND_COST)
+                # Look up the round the team acquired the player in, following trades
+                draft_round = keeper_index.keeper_round(player_id, team_id, UNDRAFTED_ROUND_COST)
+
+                stats = weekly.get(player_id)
+                scoring = f" ({stats.per_game:.1f} PPG, {stats.above_replacement:+.1f} PAR)" if stats and stats.games else ""
+                years = keeper_index.keeper_years(player_id, team_id)
+                if years:
+                    scoring += f" - kept {years} year{'s' if years > 1 else ''} in a row"
+                if max_keeper_years is not None and years >= max_keeper_years:
+                    scoring += " - NOT ELIGIBLE"
 
                 if player:
-                    print(f"  - {player.name} ({player.position}, {player.proTeam}) - Keeper Cost: Round {draft_round}")
+                    print(f"  - {player.name} ({player.position}, {player.proTeam}) - Keeper Cost: Round {draft_round}{scoring}")
                 else:
                     # Still provide draft cost even if player name is unknown
-                    print(f"  - Unknown Player (ID: {player_id}) - Keeper Cost: Round {draft_round}")
+                    print(f"  - Unknown Player (ID: {player_id}) - Keeper Cost: Round {draft_round}{scoring}")
+
+def main():
+    """Main function to orchestrate fetching and processing keeper data."""
+    parser = build_arg_parser("Display each team's keepers and their draft round cost.", output_file=False)
+    parser.add_argument("--weekly-stats", action="store_true",
+                        help=f"Show each keeper's {HISTORY_YEAR} points per game and points above replacement.")
+    parser.add_argument("--max-keeper-years", type=int, default=MAX_KEEPER_YEARS,
+                        help="Flag keepers already kept this many seasons in a row (default: no limit).")
+    args = parse_args(parser)
+    creds = get_credentials()
+    if not creds:
+        return
+    display_keepers(*creds, weekly_stats=args.weekly_stats, max_keeper_years=args.max_keeper_years)
+    print_cache_stats()
 
 if __name__ == "__main__":
-    main()
+    run_script(main)
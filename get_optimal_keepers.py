@@ -0,0 +1,84 @@
+from common import build_arg_parser, get_league, get_league_config, parse_args, run_script
+from draft_store import DraftStore
+from get_keepers import HISTORY_YEAR, MAX_KEEPER_YEARS, UNDRAFTED_ROUND_COST
+from keeper_eligibility import load_keeper_index
+from keeper_optimizer import KeeperCandidate, optimize_keepers, replacement_values
+from league_cache import print_cache_stats
+
+
+def recommend_keepers(max_keepers: int = None, points_field: str = "total_points", allow_earlier_round: bool = False,
+                      max_keeper_years: int = MAX_KEEPER_YEARS):
+    """
+    Recommends the best keeper set for every team from its end-of-season roster.
+
+    Each player costs the round their team acquired them in, following trades
+    (UNDRAFTED_ROUND_COST if the team added them outside the draft). A keeper is
+    worth their points minus the replacement value of the round they use up.
+    Players already kept `max_keeper_years` seasons in a row are not considered.
+
+    :param max_keepers: Optional. Keepers allowed per team; defaults to the league's keeper setting.
+    :param points_field: The player attribute to value players by, e.g. "total_points"
+                         (last season) or "projected_total_points".
+    :param allow_earlier_round: Let a keeper move to an earlier open round when its own round is taken.
+    :param max_keeper_years: Optional. How many seasons in a row a player may be kept (None for no limit).
+    """
+    league = get_league(year=HISTORY_YEAR)
+    store = DraftStore.from_leagues([league])
+    league_id, _, espn_s2, swid = get_league_config(HISTORY_YEAR)
+    keeper_index = load_keeper_index(league_id, HISTORY_YEAR, espn_s2, swid, loaded={HISTORY_YEAR: league})
+    if max_keepers is None:
+        max_keepers = getattr(league.settings, "keeper_count", 0) or 3
+
+    rounds = max([pick.round for pick in store.picks_for_season(HISTORY_YEAR)] + [UNDRAFTED_ROUND_COST])
+    replacement = replacement_values(league, rounds)
+
+    print(f"\nRecommended keepers (up to {max_keepers} per team, based on {HISTORY_YEAR} {points_field}):")
+    for team in league.teams:
+        candidates = [
+            KeeperCandidate(
+                player.playerId,
+                player.name,
+                getattr(player, "position", "N/A"),
+                keeper_index.keeper_round(player.playerId, team.team_id, UNDRAFTED_ROUND_COST),
+                getattr(player, points_field, 0) or 0,
+            )
+            for player in team.roster
+            if keeper_index.is_eligible(player.playerId, team.team_id, max_keeper_years)
+        ]
+        choices = optimize_keepers(candidates, replacement, max_keepers, allow_earlier_round)
+
+        print(f"\nTeam: {team.team_name}")
+        if not choices:
+            print("  No keeper is worth more than the pick it would cost.")
+            continue
+        for choice in choices:
+            candidate = choice.candidate
+            moved = f" (moved up from Round {candidate.round})" if choice.round != candidate.round else ""
+            print(f"  - {candidate.name} ({candidate.position}) - Round {choice.round}{moved}: "
+                  f"{candidate.points:.1f} pts, +{choice.value:.1f} over replacement")
+        print(f"  Total value over replacement: {sum(choice.value for choice in choices):.1f}")
+
+
+def main():
+    """Main function to recommend keepers for every team."""
+    parser = build_arg_parser("Recommend the optimal keeper set for every team.", output_file=False)
+    parser.add_argument("--max-keepers", type=int, default=None,
+                        help="Keepers allowed per team (default: the league's keeper setting).")
+    parser.add_argument("--projected", action="store_true",
+                        help="Value players by ESPN's projected season total instead of actual points.")
+    parser.add_argument("--allow-earlier-round", action="store_true",
+                        help="Let a keeper move to an earlier open round when its own round is taken.")
+    parser.add_argument("--max-keeper-years", type=int, default=MAX_KEEPER_YEARS,
+                        help="Leave out players already kept this many seasons in a row (default: no limit).")
+    args = parse_args(parser)
+    recommend_keepers(
+        max_keepers=args.max_keepers,
+        points_field="projected_total_points" if args.projected else "total_points",
+        allow_earlier_round=args.allow_earlier_round,
+        max_keeper_years=args.max_keeper_years,
+    )
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    run_script(main)
@@ -1,10 +1,13 @@
 import os
-from espn_api.football import League # Or .basketball, .baseball, etc.
+from common import LeagueLoadError, build_arg_parser, create_league, parse_args, run_script
+from keeper_eligibility import load_keeper_index
+from league_cache import print_cache_stats
 
-def get_keeper_draft_details():
+def get_keeper_draft_details(year: int = 2024):
     """
-    Pulls each team's full roster from the 2024 season and lists the
-    original draft round for each player by their current team.
+    Pulls each team's full roster from the `year` season (2024 by default) and
+    lists the original draft round for each player by their current team. Traded
+    players keep the round they were acquired in (see keeper_eligibility.py).
     """
     # --- Configuration ---
     # This script reads credentials from environment variables.
@@ -16,7 +19,7 @@ def get_keeper_draft_details():
     #
     # Try the standard 'ESPN_LEAGUE_ID' first, then fall back to 'LEAGUE_ID' for compatibility with your .bat file.
     LEAGUE_ID = os.environ.get('ESPN_LEAGUE_ID') or os.environ.get('LEAGUE_ID')
-    YEAR = 2024  # The most recently completed season to get data from
+    YEAR = year  # The most recently completed season to get data from
     ESPN_S2 = os.environ.get('ESPN_S2') # Set environment variable, or replace None
     SWID = os.environ.get('SWID') # Set environment variable, or replace None
 
@@ -31,20 +34,16 @@ def get_keeper_draft_details():
     # --- Connect to the historical season for draft data ---
     print(f"Attempting to connect to ESPN Fantasy League for {YEAR} season...")
     try:
-        league_history = League(league_id=int(LEAGUE_ID), year=YEAR, espn_s2=ESPN_S2, swid=SWID)
+        league_history = create_league(int(LEAGUE_ID), YEAR, espn_s2=ESPN_S2, swid=SWID)
         print(f"Successfully connected to league: {league_history.settings.name}")
         print("-" * 40)
     except Exception as e:
-        print(f"Error connecting to the league for {YEAR}. Please check your credentials and league ID.")
-        print(f"Details: {e}")
-        return
+        print("Please check your credentials and league ID.")
+        raise LeagueLoadError(f"Could not connect to league {LEAGUE_ID} for the {YEAR} season: {e}") from e
 
-    # Create a quick lookup for the draft results of the specified YEAR.
-    # We map (player_id, team_id) to the round they were drafted in.
-    draft_history = {
-        (pick.playerId, pick.team.team_id): pick.round_num
-        for pick in league_history.draft
-    }
+    # Load the keeper index through YEAR, which follows every player through
+    # drafts, trades, drops and pickups.
+    keeper_index = load_keeper_index(int(LEAGUE_ID), YEAR, ESPN_S2, SWID, loaded={YEAR: league_history})
 
     print(f"Full Roster Details from {YEAR} Season:\n")
 
@@ -64,14 +63,20 @@ def get_keeper_draft_details():
             continue
 
         for player in roster_players:
-            # Check if the player was drafted by this team in the initial draft
-            draft_key = (player.playerId, team.team_id)
-            draft_round = draft_history.get(draft_key, UNDRAFTED_ROUND_COST)
+            # The round the team acquired the player in, following trades
+            draft_round = keeper_index.keeper_round(player.playerId, team.team_id, UNDRAFTED_ROUND_COST)
 
             print(f"  - {player.name}: Round {draft_round}")
 
         print("-" * 40)
 
 
+def main():
+    """Main function to list each rostered player's original draft round."""
+    parse_args(build_arg_parser("List each rostered player's original draft round.", output_file=False))
+    get_keeper_draft_details()
+    print_cache_stats()
+
+
 if __name__ == '__main__':
-    get_keeper_draft_details()
\ No newline at end of file
+    run_script(main)
@@ -1,83 +1,115 @@
-import sys
-import csv
+from typing import Any, Dict, Iterator, Optional
 from espn_api.football import League
-from common import get_league
+from common import build_arg_parser, get_league, get_warehouse_league, parse_args, run_script
+from draft_store import DraftStore
+from exporters import WRITE, RowExporter, export_format
+from league_cache import print_cache_stats
+import instrumentation
+from weekly_stats import PlayerAggregates, league_aggregates
 
 
-def display_rosters(league: League, output_file: str = None):
-    """
-    Fetches a consolidated list of all players on all rosters.
-    Can export the data to a CSV file.
-    """
-    print(f"\nFetching rosters and draft data for the {league.year} season...")
+ROSTER_FIELDS = ['Team', 'Position', 'Player Name', 'Pro Team', 'Total Points', 'Draft Year', 'Draft Round',
+                 'Draft Pick', 'Keeper']
+# The columns that identify a roster row when upserting into an existing export.
+ROSTER_KEY = ['Draft Year', 'Team', 'Player Name']
+# Columns added with weekly stats (see weekly_stats.py).
+WEEKLY_FIELDS = ['Games', 'Points Per Game', 'Std Dev', 'Points Above Replacement']
 
-    # Fetch draft data and create a mapping from player ID to draft info
-    draft_map = {}
-    try:
-        # The .draft property fetches draft data, ordered by overall pick
-        draft_picks = league.draft
-        if draft_picks:
-            draft_map = {
-                pick.playerId: {
-                    "round": pick.round_num,
-                    "overall": i + 1,
-                    "is_keeper": pick.keeper_status,
-                }
-                for i, pick in enumerate(draft_picks)
-            }
-    except Exception as e:
-        # This might fail if the draft hasn't happened yet for the season
-        print(f"Warning: Could not fetch draft data. Draft rounds may not be displayed. Error: {e}")
 
-    all_players_data = []
-    # Iterate through each team and player to populate the table
+def roster_rows(league: League, store: DraftStore,
+                weekly: Optional[Dict[int, PlayerAggregates]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one row per rostered player, team by team, with their draft details for the season.
+
+    :param weekly: Optional. Weekly scoring aggregates by player ID, added as the WEEKLY_FIELDS columns.
+    """
     for team in league.teams:
         team_name = getattr(team, 'team_name', 'Unknown Team')
         for player in team.roster:
-            # Using getattr for safety, though these attributes should exist for rostered players
-            pos = getattr(player, 'position', 'N/A')
-            name = getattr(player, 'name', 'Unknown Player')
-            pro_team = getattr(player, 'proTeam', 'N/A')
-            points = getattr(player, 'total_points', 0)
-            draft_info = draft_map.get(player.playerId)
+            draft_info = store.find_pick(league.year, player.playerId)
             if draft_info:
-                draft_round = draft_info['round']
-                draft_pick = draft_info['overall']
-                keeper_status = "Yes" if draft_info.get("is_keeper") else "No"
+                draft_round = draft_info.round
+                draft_pick = draft_info.overall
+                keeper_status = "Yes" if draft_info.keeper else "No"
             else:
                 draft_round, draft_pick, keeper_status = "N/A", "N/A", "N/A"
 
-            all_players_data.append({
+            # Using getattr for safety, though these attributes should exist for rostered players
+            row = {
                 'Team': team_name,
-                'Position': pos,
-                'Player Name': name,
-                'Pro Team': pro_team,
-                'Total Points': points,
+                'Position': getattr(player, 'position', 'N/A'),
+                'Player Name': getattr(player, 'name', 'Unknown Player'),
+                'Pro Team': getattr(player, 'proTeam', 'N/A'),
+                'Total Points': getattr(player, 'total_points', 0),
                 'Draft Year': league.year,
                 'Draft Round': draft_round,
                 'Draft Pick': draft_pick,
                 'Keeper': keeper_status
-            })
+            }
+            if weekly is not None:
+                stats = weekly.get(player.playerId)
+                row['Games'] = stats.games if stats else 0
+                row['Points Per Game'] = round(stats.per_game, 2) if stats else 0.0
+                row['Std Dev'] = round(stats.std_dev, 2) if stats else 0.0
+                row['Points Above Replacement'] = round(stats.above_replacement, 2) if stats else 0.0
+            yield row
 
-    if output_file and output_file.lower().endswith('.csv'):
+
+def display_rosters(league: League, output_file: str = None, store: DraftStore = None, mode: str = WRITE,
+                    weekly_stats: bool = False):
+    """
+    Fetches a consolidated list of all players on all rosters.
+    Can export the data to a CSV, JSON Lines or Parquet file.
+
+    :param store: Optional. A DraftStore already holding this season; one is built if omitted.
+    :param mode: How to treat an existing output file: WRITE, APPEND or UPSERT (by ROSTER_KEY).
+    :param weekly_stats: Also show games played, points per game, their standard deviation
+                         and points above replacement, from the season's weekly scoring.
+    """
+    print(f"\nFetching rosters and draft data for the {league.year} season...")
+
+    # Load the draft into the shared store, which indexes picks by (season, player ID)
+    if store is None:
+        store = DraftStore()
+    try:
+        store.add_league(league)
+    except Exception as e:
+        # This might fail if the draft hasn't happened yet for the season
+        print(f"Warning: Could not fetch draft data. Draft rounds may not be displayed. Error: {e}")
+
+    # Weekly stats come from batched player card requests, never one call per player
+    weekly = league_aggregates(league) if weekly_stats else None
+    fields = ROSTER_FIELDS + WEEKLY_FIELDS if weekly_stats else ROSTER_FIELDS
+
+    file_format = export_format(output_file)
+    if file_format:
         print(f"Exporting roster data to {output_file}...")
-        if not all_players_data:
-            print("No roster data to export.")
+        try:
+            with instrumentation.stage("csv_write"), \
+                    RowExporter(output_file, fields, mode=mode, key=ROSTER_KEY) as exporter:
+                for row in roster_rows(league, store, weekly):
+                    # Points are written with 2 decimal places in CSV files
+                    points = row['Total Points']
+                    row['Total Points'] = f"{points:.2f}" if file_format == "csv" else round(points, 2)
+                    exporter.write(row)
+        except ValueError as e:
+            print(f"Error: {e}")
             return
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            # Format points to 2 decimal places for CSV
-            for player in all_players_data:
-                player['Total Points'] = f"{player['Total Points']:.2f}"
-            writer = csv.DictWriter(f, fieldnames=all_players_data[0].keys())
-            writer.writeheader()
-            writer.writerows(all_players_data)
+        if not exporter.rows_written:
+            print("No roster data to export.")
     else:
-        table_width = 104
+        table_width = 131 if weekly is not None else 104
+        header = f"{'TEAM':<20} {'POS':<5} {'PLAYER NAME':<25} {'PRO TEAM':<10} {'TOTAL PTS':>12} {'RND':>8} {'PICK':>8} {'KEEPER':>8}"
+        if weekly is not None:
+            header += f" {'PPG':>8} {'STD DEV':>8} {'PAR':>8}"
         print("\n" + "=" * table_width)
-        print(f"{'TEAM':<20} {'POS':<5} {'PLAYER NAME':<25} {'PRO TEAM':<10} {'TOTAL PTS':>12} {'RND':>8} {'PICK':>8} {'KEEPER':>8}")
+        print(header)
         print("-" * table_width)
-        for player_data in all_players_data:
-            print(f"{player_data['Team']:<20} {player_data['Position']:<5} {player_data['Player Name']:<25} {player_data['Pro Team']:<10} {player_data['Total Points']:>12.2f} {str(player_data['Draft Round']):>8} {str(player_data['Draft Pick']):>8} {player_data['Keeper']:>8}")
+        for player_data in roster_rows(league, store, weekly):
+            line = f"{player_data['Team']:<20} {player_data['Position']:<5} {player_data['Player Name']:<25} {player_data['Pro Team']:<10} {player_data['Total Points']:>12.2f} {str(player_data['Draft Round']):>8} {str(player_data['Draft Pick']):>8} {player_data['Keeper']:>8}"
+            if weekly is not None:
+                line += f" {player_data['Points Per Game']:>8.2f} {player_data['Std Dev']:>8.2f} {player_data['Points Above Replacement']:>8.1f}"
+            print(line)
         print("=" * table_width)
 
 
@@ -85,10 +117,15 @@ def main():
     """
     Main function to get league data and display team rosters.
     """
-    output_file = sys.argv[1] if len(sys.argv) > 1 else None
-    league = get_league()
-    display_rosters(league, output_file)
+    parser = build_arg_parser("Display all team rosters for a season.", use_warehouse=True)
+    parser.add_argument("--weekly-stats", action="store_true",
+                        help="Add points per game, consistency and points above replacement from weekly scoring.")
+    args = parse_args(parser)
+    league = get_warehouse_league() if args.warehouse else get_league(roster_only=True)
+    with instrumentation.stage("report"):
+        display_rosters(league, args.output_file, mode=args.export_mode, weekly_stats=args.weekly_stats)
+    print_cache_stats()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_script(main)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import atexit
+import cProfile
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+_lock = threading.Lock()
+_stage_seconds: Dict[str, float] = defaultdict(float)
+_stage_calls: Dict[str, int] = defaultdict(int)
+_counters: Dict[str, int] = defaultdict(int)
+_started_at = time.perf_counter()
+_script: Optional[str] = None
+_profiler: Optional[cProfile.Profile] = None
+_profile_path: Optional[str] = None
+
+
+@contextmanager
+def stage(name: str):
+    """Adds the wall time spent inside the block to the named stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _stage_seconds[name] += elapsed
+            _stage_calls[name] += 1
+
+
+def count(name: str, amount: int = 1):
+    """Increments a named counter, e.g. http_requests or bytes_downloaded."""
+    with _lock:
+        _counters[name] += amount
+
+
+def record_request(view: str, seconds: float, nbytes: int):
+    """Records one HTTP request: its view, wall time and the number of bytes downloaded."""
+    with _lock:
+        _counters["http_requests"] += 1
+        _counters["bytes_downloaded"] += nbytes
+        _stage_seconds[f"http:{view}"] += seconds
+        _stage_calls[f"http:{view}"] += 1
+
+
+def summary() -> Dict[str, Any]:
+    """Returns everything recorded so far as a JSON-serializable dict."""
+    from league_cache import cache_stats
+
+    with _lock:
+        stages = {
+            name: {"ms": round(seconds * 1000, 1), "calls": _stage_calls[name]}
+            for name, seconds in sorted(_stage_seconds.items())
+        }
+        counters = dict(_counters)
+    cache = cache_stats()
+    return {
+        "script": _script,
+        "total_ms": round((time.perf_counter() - _started_at) * 1000, 1),
+        "stages": stages,
+        "http_requests": counters.pop("http_requests", 0),
+        "bytes_downloaded": counters.pop("bytes_downloaded", 0),
+        "retries": counters.pop("retries", 0),
+        "cache_hits": cache["hits"],
+        "cache_misses": cache["misses"],
+        **counters,
+    }
+
+
+def emit_summary(stream=None):
+    """Writes the summary as a single JSON line (to stderr by default, keeping stdout for reports)."""
+    print(json.dumps(summary(), sort_keys=True), file=stream or sys.stderr)
+
+
+def start(script: str, profile_path: str = None):
+    """
+    Starts instrumenting the current run. The JSON summary is emitted when the
+    process exits, and with `profile_path` the whole run is profiled with
+    cProfile and dumped there in pstats format.
+    """
+    global _script, _profiler, _profile_path, _started_at
+    if _script is not None:
+        return  # Already started
+    _script = script
+    _started_at = time.perf_counter()
+    if profile_path:
+        _profile_path = profile_path
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(_finish)
+
+
+def _finish():
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        print(f"Profile written to {_profile_path} (view it with: python -m pstats {_profile_path})", file=sys.stderr)
+    emit_summary()
@@ -0,0 +1,345 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from espn_api.football import League
+from common import get_leagues
+from league_cache import cache_dir, is_season_complete, record_fetches
+import instrumentation
+
+# --- Configuration ---
+# Seasons of history the keeper index is built from when it does not exist yet.
+DEFAULT_INDEX_SEASONS = 5
+
+# ESPN only serves the transaction feed from this season on. Earlier seasons are
+# indexed from their drafts and end-of-season rosters alone.
+FIRST_TRANSACTION_SEASON = 2019
+
+# Transaction feed message types (see espn_api's ACTIVITY_MAP).
+ADD_MESSAGES = {178, 180}
+DROP_MESSAGES = {179, 181, 239}
+TRADE_MESSAGE = 244
+
+# Transaction topics requested per page of the feed.
+TRANSACTIONS_PAGE_SIZE = 25
+
+INDEX_DIRNAME = "keeper_index"
+INDEX_VERSION = 1
+
+
+class Transaction(NamedTuple):
+    """One player movement from the league's transaction feed."""
+    date: int
+    kind: str  # "ADD", "DROP" or "TRADE"
+    player_id: int
+    from_team: Optional[int]
+    to_team: Optional[int]
+
+
+class TransactionFeed(NamedTuple):
+    """What fetch_transactions read of a season's transaction feed."""
+    transactions: List[Transaction]  # Oldest first
+    complete: bool  # Whether the feed was read in full
+    final: bool  # Whether the season is over and every page was fetched after it ended
+
+
+class KeeperStatus(NamedTuple):
+    """How a player came to be on their current team, as far as keeper rules are concerned."""
+    player_id: int
+    team_id: int
+    round: Optional[int]  # None when the team added the player outside the draft
+    keeper_years: int
+    acquired_season: int
+
+
+class KeeperIndex:
+    """
+    A persisted player_id -> KeeperStatus index over a league's history, through one season.
+
+    Seasons are applied in order. Each season's draft starts a new state: kept
+    players carry their keeper years forward, and every other pick is acquired
+    in its round. The season's transactions are then replayed in date order.
+    A trade moves a player with their acquiring round and keeper years. A player
+    who is dropped and picked up again is acquired outside the draft. Finally the
+    state is reconciled with the end-of-season rosters, which are always right
+    about who owns whom.
+
+    The index remembers which seasons are final and the date of the last
+    transaction applied, so later runs only replay what is new.
+    """
+
+    def __init__(self, league_id: int, through_season: int, path: str = None):
+        self.league_id = league_id
+        self.through_season = through_season
+        self.path = path or index_path(league_id, through_season)
+        self._players: Dict[int, KeeperStatus] = {}
+        # Per season: whether its draft was applied, the last transaction date seen, and whether it is final
+        self._seasons: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # --- Persistence ---
+
+    @classmethod
+    def load(cls, league_id: int, through_season: int, path: str = None) -> "KeeperIndex":
+        """Reads the index from disk, or returns an empty one if there is none (or it is unreadable)."""
+        index = cls(league_id, through_season, path)
+        try:
+            with open(index.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return index
+        if raw.get("version") != INDEX_VERSION:
+            return index
+        index._seasons = {int(season): state for season, state in raw.get("seasons", {}).items()}
+        index._players = {int(pid): KeeperStatus(*fields) for pid, fields in raw.get("players", {}).items()}
+        return index
+
+    def save(self):
+        with self._lock:
+            raw = {
+                "version": INDEX_VERSION,
+                "league_id": self.league_id,
+                "through_season": self.through_season,
+                "seasons": {str(season): state for season, state in self._seasons.items()},
+                "players": {str(pid): list(status) for pid, status in self._players.items()},
+            }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(raw, f)
+        os.replace(tmp_path, self.path)
+
+    def copy_from(self, other: "KeeperIndex"):
+        """Starts this index from another one's state, e.g. the previous season's index."""
+        self._players = dict(other._players)
+        self._seasons = {season: dict(state) for season, state in other._seasons.items()}
+
+    # --- Lookups ---
+
+    @property
+    def seasons(self) -> List[int]:
+        """The seasons applied to the index, oldest first."""
+        return sorted(self._seasons)
+
+    def status(self, player_id: int) -> Optional[KeeperStatus]:
+        return self._players.get(player_id)
+
+    def keeper_round(self, player_id: int, team_id: int, default: int) -> int:
+        """The round a team's player costs to keep: their acquiring round, or `default` if acquired outside the draft."""
+        status = self._players.get(player_id)
+        if status is None or status.team_id != team_id or status.round is None:
+            return default
+        return status.round
+
+    def keeper_years(self, player_id: int, team_id: int) -> int:
+        """The number of seasons in a row the player has already been kept, by this team or the ones it traded with."""
+        status = self._players.get(player_id)
+        return status.keeper_years if status is not None and status.team_id == team_id else 0
+
+    def is_eligible(self, player_id: int, team_id: int, max_keeper_years: int = None) -> bool:
+        """Whether the team owns the player and has kept them fewer than `max_keeper_years` seasons (no limit if None)."""
+        status = self._players.get(player_id)
+        if status is None or status.team_id != team_id:
+            return False
+        return max_keeper_years is None or status.keeper_years < max_keeper_years
+
+    def needs_update(self, season: int) -> bool:
+        """Every season not yet final in the index is refreshed on each run."""
+        return not self._seasons.get(season, {}).get("final", False)
+
+    # --- Updates ---
+
+    def update(self, league: League):
+        """
+        Applies one season: its draft (once), the transactions since the last
+        update, and the rosters. Seasons must be applied in order.
+
+        If the transaction feed cannot be read in full, none of it is applied and
+        the season is neither advanced nor marked final, so the next update
+        fetches the same transactions again. A season is only marked final once
+        its feed was fetched after the season ended; a copy cached while it was
+        in progress (served offline, say) leaves it pending.
+        """
+        season = league.year
+        state = self._seasons.setdefault(season, {"drafted": False, "last_transaction": 0, "final": False})
+        if not state["drafted"] and league.draft:
+            self._apply_draft(league)
+            state["drafted"] = True
+
+        feed = fetch_transactions(league, since=state["last_transaction"])
+        if feed.complete:
+            for transaction in feed.transactions:
+                self._apply_transaction(season, transaction)
+            if feed.transactions:
+                state["last_transaction"] = feed.transactions[-1].date
+
+        self._reconcile(league)
+        state["final"] = feed.complete and feed.final
+
+    def _apply_draft(self, league: League):
+        season = league.year
+        previous = self._players
+        players = {}
+        for pick in league.draft:
+            team_id = pick.team.team_id if pick.team else 0
+            if pick.keeper_status:
+                kept = previous.get(pick.playerId)
+                years = kept.keeper_years + 1 if kept is not None and kept.team_id == team_id else 1
+                acquired = kept.acquired_season if kept is not None and kept.team_id == team_id else season
+                players[pick.playerId] = KeeperStatus(pick.playerId, team_id, pick.round_num, years, acquired)
+            else:
+                players[pick.playerId] = KeeperStatus(pick.playerId, team_id, pick.round_num, 0, season)
+        self._players = players
+
+    def _apply_transaction(self, season: int, transaction: Transaction):
+        player_id = transaction.player_id
+        current = self._players.get(player_id)
+        if transaction.kind == "TRADE":
+            if current is not None:
+                self._players[player_id] = current._replace(team_id=transaction.to_team)
+            else:
+                self._players[player_id] = KeeperStatus(player_id, transaction.to_team, None, 0, season)
+        elif transaction.kind == "ADD":
+            self._players[player_id] = KeeperStatus(player_id, transaction.to_team, None, 0, season)
+        elif transaction.kind == "DROP":
+            self._players.pop(player_id, None)
+
+    def _reconcile(self, league: League):
+        """Makes ownership match the league's rosters; players on no roster are dropped from the index."""
+        season = league.year
+        rostered = {}
+        for team in league.teams:
+            for player in team.roster:
+                current = self._players.get(player.playerId)
+                if current is not None and current.team_id == team.team_id:
+                    rostered[player.playerId] = current
+                elif current is not None and getattr(player, "acquisitionType", None) == "TRADE":
+                    rostered[player.playerId] = current._replace(team_id=team.team_id)
+                else:
+                    rostered[player.playerId] = KeeperStatus(player.playerId, team.team_id, None, 0, season)
+        if rostered:
+            self._players = rostered
+
+
+def index_path(league_id: int, through_season: int) -> str:
+    return os.path.join(cache_dir(), INDEX_DIRNAME, f"{league_id}-{through_season}.json")
+
+
+def fetch_transactions(league: League, since: int = 0) -> TransactionFeed:
+    """
+    Returns the season's adds, drops and trades made after `since` (epoch ms),
+    oldest first, whether the feed was read in full, and whether it is final.
+
+    The feed is read newest first, TRANSACTIONS_PAGE_SIZE topics per request,
+    and stops at the first topic already seen, so an update fetches only what
+    is new. If a page cannot be fetched (including a cache miss in offline
+    mode), the transactions read so far are returned as incomplete: older ones
+    are missing. The feed is final only if every page was fetched after the
+    season ended. Leagues without an ESPN connection or seasons before
+    FIRST_TRANSACTION_SEASON have no feed and return no transactions.
+    """
+    request = getattr(league, "espn_request", None)
+    if request is None or league.year < FIRST_TRANSACTION_SEASON:
+        return TransactionFeed([], True, is_season_complete(league.year))
+
+    topics_seen: List[List[Transaction]] = []
+    complete = True
+    offset = 0
+    with instrumentation.stage("transaction_fetch"), record_fetches(league.year) as fetches:
+        while True:
+            filters = {"topics": {
+                "filterType": {"value": ["ACTIVITY_TRANSACTIONS"]},
+                "limit": TRANSACTIONS_PAGE_SIZE,
+                "limitPerMessageSet": {"value": TRANSACTIONS_PAGE_SIZE},
+                "offset": offset,
+                "sortMessageDate": {"sortPriority": 1, "sortAsc": False},
+                "sortFor": {"sortPriority": 2, "sortAsc": False},
+                "filterIncludeMessageTypeIds": {"value": sorted(ADD_MESSAGES | DROP_MESSAGES | {TRADE_MESSAGE})},
+            }}
+            try:
+                data = request.league_get(extend="/communication/", params={"view": "kona_league_communication"},
+                                          headers={"x-fantasy-filter": json.dumps(filters)})
+            except Exception as e:
+                print(f"Warning: Could not fetch the {league.year} transactions; they are retried next run. "
+                      f"Error: {e}")
+                complete = False
+                break
+            topics = (data or {}).get("topics", [])
+            reached_seen = False
+            for topic in topics:
+                date = topic.get("date", 0)
+                if date <= since:
+                    reached_seen = True
+                    break
+                parsed = (_parse_message(date, message) for message in topic.get("messages", []))
+                topics_seen.append([transaction for transaction in parsed if transaction is not None])
+            if reached_seen or len(topics) < TRANSACTIONS_PAGE_SIZE:
+                break
+            offset += TRANSACTIONS_PAGE_SIZE
+    # Topics arrive newest first; messages within a topic stay in their own order
+    return TransactionFeed([transaction for topic in reversed(topics_seen) for transaction in topic],
+                           complete, fetches.final)
+
+
+def _parse_message(date: int, message: Dict[str, Any]) -> Optional[Transaction]:
+    message_type = message.get("messageTypeId")
+    player_id = message.get("targetId")
+    if player_id is None:
+        return None
+    if message_type == TRADE_MESSAGE:
+        return Transaction(date, "TRADE", player_id, message.get("from"), message.get("to"))
+    if message_type in ADD_MESSAGES:
+        return Transaction(date, "ADD", player_id, None, message.get("to"))
+    if message_type in DROP_MESSAGES:
+        return Transaction(date, "DROP", player_id, message.get("for") or message.get("to"), None)
+    return None
+
+
+def load_keeper_index(league_id: int, through_season: int, espn_s2: str = None, swid: str = None,
+                      seasons: int = DEFAULT_INDEX_SEASONS, loaded: Dict[int, League] = None) -> KeeperIndex:
+    """
+    Returns the keeper index of a league through `through_season`, updating it as needed.
+
+    A saved index is reused as is for its final seasons; only seasons still in
+    progress (and their new transactions) are fetched again. A missing index
+    starts from the previous season's saved index if there is one, otherwise it
+    is built from the last `seasons` seasons.
+
+    :param loaded: Optional. Seasons already loaded by the caller, reused instead of fetched again.
+    """
+    index = KeeperIndex.load(league_id, through_season)
+    if not index.seasons:
+        previous = KeeperIndex.load(league_id, through_season - 1)
+        if previous.seasons and not previous.needs_update(through_season - 1):
+            index.copy_from(previous)
+
+    first = index.seasons[0] if index.seasons else through_season - seasons + 1
+    pending = [season for season in range(first, through_season + 1) if index.needs_update(season)]
+    if not pending:
+        return index
+
+    leagues = dict(loaded or {})
+    missing = [season for season in pending if season not in leagues]
+    if missing:
+        leagues.update(get_leagues(missing, league_id=league_id, espn_s2=espn_s2, swid=swid))
+
+    with instrumentation.stage("keeper_index"):
+        for season in pending:
+            if season not in leagues:
+                if not index.seasons:
+                    # The league did not exist yet (or the season is gone); start from the next one
+                    continue
+                # Later seasons cannot be applied without this one; they are retried next run
+                print(f"Warning: The keeper index stops before the {season} season, which could not be loaded.")
+                break
+            index.update(leagues[season])
+            if season < through_season and index.needs_update(season):
+                # Its transactions could not be read in full; later seasons are applied after it next run
+                print(f"Warning: The keeper index stops after the {season} season, whose transactions are incomplete.")
+                break
+    try:
+        index.save()
+    except OSError as e:
+        print(f"Warning: Could not save the keeper index. Error: {e}")
+    return index
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple
+
+from espn_api.football import League
+
+# A negligible cost per round a keeper is moved up, so ties favour keeping players in their own round.
+_MOVE_TIEBREAK = 1e-6
+
+
+class KeeperCandidate(NamedTuple):
+    """A rostered player who could be kept, with the round it would cost."""
+    player_id: int
+    name: str
+    position: str
+    round: int
+    points: float
+
+
+class KeeperChoice(NamedTuple):
+    """A selected keeper, the round it uses and its value over the replaced pick."""
+    candidate: KeeperCandidate
+    round: int
+    value: float
+
+
+def replacement_values(league: League, rounds: int) -> Dict[int, float]:
+    """
+    Estimates what a pick in each round is worth: the average season points of
+    the players drafted in that round who finished the season on a roster.
+
+    Rounds with no data take the value of the next later round with data, so a
+    round is never valued below the rounds after it.
+    """
+    points = {player.playerId: getattr(player, "total_points", 0) for team in league.teams for player in team.roster}
+    totals, counts = defaultdict(float), defaultdict(int)
+    for pick in league.draft or []:
+        if pick.playerId in points and pick.round_num:
+            totals[pick.round_num] += points[pick.playerId]
+            counts[pick.round_num] += 1
+
+    values = {}
+    floor = 0.0
+    for round_num in range(rounds, 0, -1):
+        if counts[round_num]:
+            floor = max(floor, totals[round_num] / counts[round_num])
+        values[round_num] = floor
+    return values
+
+
+def optimize_keepers(candidates: Iterable[KeeperCandidate], replacement: Dict[int, float], max_keepers: int,
+                     allow_earlier_round: bool = False) -> List[KeeperChoice]:
+    """
+    Picks the keeper set with the highest total value over replacement.
+
+    A keeper assigned to round r is worth its points minus replacement[r]; no two
+    keepers may use the same round and at most `max_keepers` are kept. With
+    `allow_earlier_round`, a keeper whose round is already taken may instead use
+    any earlier (more expensive) open round, as many leagues allow.
+
+    This is a maximum-weight bipartite matching between candidates and rounds,
+    solved exactly as a min-cost flow with successive shortest paths. Each of
+    the at most `max_keepers` augmentations is a Bellman-Ford search over
+    O(candidates x rounds) edges, and the search stops as soon as another
+    keeper would lower the total.
+    """
+    candidates = list(candidates)
+    rounds = sorted(replacement)
+    n = len(candidates)
+    source, sink = n + len(rounds), n + len(rounds) + 1
+    round_node = {round_num: n + i for i, round_num in enumerate(rounds)}
+
+    # Residual graph as edge lists: to, capacity, cost, index of the reverse edge, is forward edge
+    graph: List[List[list]] = [[] for _ in range(n + len(rounds) + 2)]
+
+    def add_edge(u: int, v: int, cost: float):
+        graph[u].append([v, 1, cost, len(graph[v]), True])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1, False])
+
+    for i, candidate in enumerate(candidates):
+        add_edge(source, i, 0.0)
+        allowed = [r for r in rounds if r <= candidate.round] if allow_earlier_round else [candidate.round]
+        for round_num in allowed:
+            value = candidate.points - replacement.get(round_num, 0.0)
+            if round_num in round_node and value > 0:
+                add_edge(i, round_node[round_num], -(value - _MOVE_TIEBREAK * (candidate.round - round_num)))
+    for node in round_node.values():
+        add_edge(node, sink, 0.0)
+
+    for _ in range(max_keepers):
+        dist = [float("inf")] * len(graph)
+        parent = [None] * len(graph)
+        dist[source] = 0.0
+        for _ in range(len(graph) - 1):
+            changed = False
+            for u, edges in enumerate(graph):
+                if dist[u] == float("inf"):
+                    continue
+                for index, (v, capacity, cost, _, _) in enumerate(edges):
+                    if capacity and dist[u] + cost < dist[v] - 1e-9:
+                        dist[v] = dist[u] + cost
+                        parent[v] = (u, index)
+                        changed = True
+            if not changed:
+                break
+        if dist[sink] >= 0:
+            break  # No augmenting path adds value
+        node = sink
+        while node != source:
+            u, index = parent[node]
+            edge = graph[u][index]
+            edge[1] -= 1
+            graph[node][edge[3]][1] += 1
+            node = u
+
+    choices = []
+    round_by_node = {node: round_num for round_num, node in round_node.items()}
+    for i, candidate in enumerate(candidates):
+        for v, capacity, _, _, forward in graph[i]:
+            if forward and capacity == 0 and v in round_by_node:
+                round_num = round_by_node[v]
+                choices.append(KeeperChoice(candidate, round_num, candidate.points - replacement.get(round_num, 0.0)))
+    return sorted(choices, key=lambda choice: choice.round)
@@ -0,0 +1,61 @@
+import json
+from typing import Any, BinaryIO, Dict, List
+
+try:
+    import ijson
+except ImportError:  # Fall back to a full parse when ijson is not installed
+    ijson = None
+
+# The only parts of the mKeeperRosters payload the keeper report reads.
+_TEAM_PREFIX = "teams.item"
+_TEAM_ID_PREFIX = "teams.item.id"
+_TEAM_NAME_PREFIX = "teams.item.name"
+_KEEPER_ID_PREFIX = "teams.item.draftStrategy.keeperPlayerIds.item"
+
+# Bytes read from the stream per parser step.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def _slim_team(team_id: Any, name: Any, keeper_ids: List[int]) -> Dict[str, Any]:
+    """Builds a team entry shaped like the raw payload, keeping only the keeper fields."""
+    return {"id": team_id, "name": name, "draftStrategy": {"keeperPlayerIds": keeper_ids}}
+
+
+def extract_keeper_teams(stream: BinaryIO) -> Dict[str, Any]:
+    """
+    Extracts each team's id, name and keeperPlayerIds from an mKeeperRosters payload.
+
+    The payload is parsed as a stream of JSON events, so the per-player roster and
+    stat blobs that make up most of the response are never built in memory.
+    Returns a dict shaped like the original response: {"teams": [{"id", "name",
+    "draftStrategy": {"keeperPlayerIds"}}, ...]}.
+
+    :param stream: A binary file-like object with the JSON response body.
+    :raises ValueError: If the payload is not valid JSON.
+    """
+    if ijson is None:
+        data = json.load(stream)
+        return {"teams": [
+            _slim_team(team.get("id"), team.get("name"), team.get("draftStrategy", {}).get("keeperPlayerIds", []))
+            for team in data.get("teams", [])
+        ]}
+
+    teams = []
+    team_id, name, keeper_ids = None, None, []
+    try:
+        for prefix, event, value in ijson.parse(stream, buf_size=STREAM_BUFFER_SIZE):
+            # Most frequent matches first; every other event is skipped
+            if prefix == _KEEPER_ID_PREFIX:
+                keeper_ids.append(value)
+            elif prefix == _TEAM_ID_PREFIX:
+                team_id = value
+            elif prefix == _TEAM_NAME_PREFIX:
+                name = value
+            elif prefix == _TEAM_PREFIX:
+                if event == "start_map":
+                    team_id, name, keeper_ids = None, None, []
+                elif event == "end_map":
+                    teams.append(_slim_team(team_id, name, keeper_ids))
+    except ijson.JSONError as e:
+        raise ValueError(f"Malformed keeper payload: {e}") from e
+    return {"teams": teams}
@@ -0,0 +1,106 @@
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from draft_store import DraftStore
+
+# Bit widths of the season and team fields of a packed keeper pick. Team IDs get a
+# full 32 bits so multi-league stores can number teams however they like.
+_SEASON_BITS = 16
+_TEAM_BITS = 32
+_SEASON_MASK = (1 << _SEASON_BITS) - 1
+_TEAM_MASK = (1 << _TEAM_BITS) - 1
+_PLAYER_SHIFT = _SEASON_BITS + _TEAM_BITS
+
+
+class Streak(NamedTuple):
+    """A run of consecutive seasons in which a team kept the same player."""
+    player_id: int
+    team_id: int
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+
+class StreakSummary(NamedTuple):
+    """Every keeper streak of one player with one team."""
+    player_id: int
+    team_id: int
+    current: int
+    longest: int
+    streaks: Tuple[Streak, ...]
+
+    @property
+    def broken(self) -> Tuple[Streak, ...]:
+        """Streaks that ended before the most recent season analyzed."""
+        return self.streaks[:-1] if self.current else self.streaks
+
+
+def find_streaks(player_ids: Iterable[int], team_ids: Iterable[int], seasons: Iterable[int],
+                 latest_season: Optional[int] = None) -> Dict[Tuple[int, int], StreakSummary]:
+    """
+    Computes every keeper streak for every (player, team) pair in one pass.
+
+    The three sequences are parallel columns of keeper picks. Each pick is packed
+    into a single integer (player, team, season from most to least significant
+    bits), so one integer sort groups the picks by pair and orders them by season,
+    and consecutive seasons of the same pair become consecutive integers. The
+    cost is O(n log n) in the number of keeper picks, however many seasons or
+    leagues the columns span.
+
+    :param latest_season: The season a streak must reach to count as current.
+                          Defaults to the most recent season in the data.
+    :return: A StreakSummary for each (player_id, team_id) pair that was ever kept.
+    """
+    keys = sorted({(player_id << _PLAYER_SHIFT) | (team_id << _SEASON_BITS) | season
+                   for player_id, team_id, season in zip(player_ids, team_ids, seasons)})
+    if not keys:
+        return {}
+    if latest_season is None:
+        latest_season = max(key & _SEASON_MASK for key in keys)
+
+    summaries = {}
+    runs: List[Streak] = []
+    run_start = previous = keys[0]
+    for key in keys[1:]:
+        if key == previous + 1:
+            previous = key  # Same pair, next season: the run continues
+            continue
+        runs.append(_streak(run_start, previous))
+        if key >> _SEASON_BITS != previous >> _SEASON_BITS:
+            _summarize(summaries, runs, latest_season)
+            runs = []
+        run_start = previous = key
+    runs.append(_streak(run_start, previous))
+    _summarize(summaries, runs, latest_season)
+    return summaries
+
+
+def _streak(first_key: int, last_key: int) -> Streak:
+    return Streak(first_key >> _PLAYER_SHIFT, (first_key >> _SEASON_BITS) & _TEAM_MASK, first_key & _SEASON_MASK,
+                  last_key & _SEASON_MASK)
+
+
+def _summarize(summaries: dict, runs: List[Streak], latest_season: int):
+    last = runs[-1]
+    current = last.end - last.start + 1 if last.end == latest_season else 0
+    longest = max(run.end - run.start for run in runs) + 1
+    summaries[(last.player_id, last.team_id)] = StreakSummary(last.player_id, last.team_id, current, longest, tuple(runs))
+
+
+def store_streaks(store: DraftStore, latest_season: Optional[int] = None) -> Dict[Tuple[int, int], StreakSummary]:
+    """Runs find_streaks over the keeper picks of a DraftStore, reading its columns directly."""
+    return find_streaks(
+        compress(store.pick_player, store.pick_keeper),
+        compress(store.pick_team, store.pick_keeper),
+        compress(store.pick_season, store.pick_keeper),
+        latest_season,
+    )
+
+
+def keeper_counts(store: DraftStore) -> Dict[Tuple[int, int], int]:
+    """Returns the number of keepers each team used per season, keyed by (team_id, season)."""
+    return Counter(zip(compress(store.pick_team, store.pick_keeper), compress(store.pick_season, store.pick_keeper)))
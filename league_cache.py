@@ -0,0 +1,206 @@
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from espn_api.requests.espn_requests import EspnFantasyRequests
+from transport import http_get
+
+# --- Configuration ---
+# Where cached ESPN responses are stored. Override with the ESPN_CACHE_DIR environment variable.
+DEFAULT_CACHE_DIR = ".espn_cache"
+
+# How long (in seconds) a response stays fresh unless it was fetched after its season
+# ended. Completed seasons never change, so those responses never expire.
+CURRENT_SEASON_TTL = 300
+
+# The NFL season for year N wraps up by early February of N + 1; after this month
+# and day the season's data is considered final.
+SEASON_FINAL_MONTH_DAY = (3, 1)
+
+_offline = os.environ.get("ESPN_OFFLINE", "").lower() in ("1", "true", "yes")
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+_recording = threading.local()
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a requested view has not been cached yet."""
+
+
+def set_offline(offline: bool = True):
+    """Serve every request from the cache only, never touching the network."""
+    global _offline
+    _offline = offline
+
+
+def is_offline() -> bool:
+    return _offline
+
+
+def cache_dir() -> str:
+    return os.environ.get("ESPN_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def season_final_date(season: int) -> datetime.date:
+    """Returns the date from which a season's data is considered final."""
+    month, day = SEASON_FINAL_MONTH_DAY
+    return datetime.date(season + 1, month, day)
+
+
+def is_season_complete(season: int, today: datetime.date = None) -> bool:
+    """Returns True once a season can no longer change (drafted, played and finalized)."""
+    return (today or datetime.date.today()) >= season_final_date(season)
+
+
+def is_final_fetch(season: int, fetched_at: float) -> bool:
+    """Returns True if data fetched at `fetched_at` (epoch seconds) was fetched after its season ended."""
+    return is_season_complete(season, today=datetime.date.fromtimestamp(fetched_at))
+
+
+class FetchRecord:
+    """The season and fetch time of every response served while record_fetches() is active."""
+
+    def __init__(self, season: int):
+        self.season = season
+        self.fetches: List[Tuple[int, float]] = []
+
+    @property
+    def final(self) -> bool:
+        """Whether the season is over and every response was fetched after its season ended."""
+        return is_season_complete(self.season) and all(
+            is_final_fetch(season, fetched_at) for season, fetched_at in self.fetches)
+
+
+@contextlib.contextmanager
+def record_fetches(season: int) -> Iterator[FetchRecord]:
+    """
+    Records when each response cached_json serves on this thread was fetched:
+    now for a network fetch, or when the cache entry was written for a hit.
+    Callers use it to tell data fetched after the season ended, which is final,
+    from an older cached copy that may still be served offline.
+    """
+    record = FetchRecord(season)
+    records = getattr(_recording, "records", None)
+    if records is None:
+        records = _recording.records = []
+    records.append(record)
+    try:
+        yield record
+    finally:
+        records.remove(record)
+
+
+def _record_fetch(season: int, fetched_at: float):
+    for record in getattr(_recording, "records", None) or ():
+        record.fetches.append((season, fetched_at))
+
+
+def cache_stats() -> Dict[str, int]:
+    """Returns a copy of the hit/miss counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def print_cache_stats():
+    stats = cache_stats()
+    mode = " (offline)" if _offline else ""
+    print(f"Cache{mode}: {stats['hits']} hits, {stats['misses']} misses")
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _cache_path(league_id: int, season: int, view: str, request_key: Dict[str, Any]) -> str:
+    """Content-addresses a request by hashing everything that affects the response."""
+    digest = hashlib.sha256(json.dumps(request_key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    safe_view = "".join(c if c.isalnum() or c in "-_" else "_" for c in view) or "default"
+    return os.path.join(cache_dir(), str(league_id), str(season), f"{safe_view}-{digest[:16]}.json")
+
+
+def _view_name(params: Optional[Dict[str, Any]], extend: str = "") -> str:
+    view = (params or {}).get("view", "")
+    if isinstance(view, (list, tuple)):
+        view = "+".join(view)
+    return view or extend.strip("/").replace("/", "_")
+
+
+def cached_json(league_id: int, season: int, view: str, request_key: Dict[str, Any],
+                fetch: Callable[[], Any]) -> Any:
+    """
+    Returns the cached JSON payload for a request, calling fetch() on a miss.
+
+    :param league_id: The ESPN league ID the request belongs to.
+    :param season: The season year; an entry written after the season ended never expires.
+    :param view: The ESPN view name, used to keep the cache directory readable.
+    :param request_key: Everything that identifies the request (endpoint, params, headers).
+    :param fetch: Callable performing the real HTTP request and returning decoded JSON.
+    """
+    path = _cache_path(league_id, season, view, request_key)
+
+    if os.path.exists(path):
+        # An entry cached while the season was still in progress keeps expiring after it ends
+        written = os.path.getmtime(path)
+        fresh = is_final_fetch(season, written) or (time.time() - written) < CURRENT_SEASON_TTL
+        if fresh or _offline:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                _count("hits")
+                _record_fetch(season, written)
+                return data
+            except (OSError, json.JSONDecodeError):
+                pass  # Unreadable entry; fall through and refetch it
+
+    _count("misses")
+    if _offline:
+        raise CacheMissError(f"No cached '{view}' data for league {league_id}, season {season} (offline mode).")
+
+    data = fetch()
+    _record_fetch(season, time.time())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    return data
+
+
+class CachedEspnRequests(EspnFantasyRequests):
+    """
+    EspnFantasyRequests that reads and writes every response through the local cache.
+
+    Cache misses are fetched through the shared pooled session in transport, so
+    every league and season in the process reuses the same connections.
+    """
+
+    def _fetch_league_view(self, params: dict = None, headers: dict = None, extend: str = ""):
+        r = http_get(self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, cookies=self.cookies)
+        alternate_response = self.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers)
+        response = alternate_response if alternate_response else r.json()
+        return response[0] if isinstance(response, list) else response
+
+    def _fetch_season_view(self, params: dict = None, headers: dict = None, extend: str = ""):
+        r = http_get(self.ENDPOINT + extend, params=params, headers=headers, cookies=self.cookies)
+        if r.status_code == 404:
+            return self.checkRequestStatus(r.status_code, extend=extend)
+        self.checkRequestStatus(r.status_code)
+        return r.json()
+
+    def league_get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        request_key = {"kind": "league", "league_id": self.league_id, "season": self.year,
+                       "extend": extend, "params": params, "headers": headers}
+        return cached_json(self.league_id, self.year, _view_name(params, extend), request_key,
+                           lambda: self._fetch_league_view(params, headers, extend))
+
+    def get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        request_key = {"kind": "season", "endpoint": self.ENDPOINT, "extend": extend,
+                       "params": params, "headers": headers}
+        return cached_json(self.league_id, self.year, _view_name(params, extend), request_key,
+                           lambda: self._fetch_season_view(params, headers, extend))
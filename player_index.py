@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from espn_api.football import League
+from league_cache import cache_dir
+import instrumentation
+from transport import FetchError
+
+# How many player IDs to request per player card call. ESPN accepts a list of IDs
+# in the x-fantasy-filter header, so a full draft resolves in a handful of requests.
+PLAYER_BATCH_SIZE = 50
+
+INDEX_FILENAME = "players.json"
+
+
+class PlayerRecord(NamedTuple):
+    """The player details the reports display, as of the season they were fetched for."""
+    playerId: int
+    name: str
+    position: str
+    proTeam: str
+    season: int
+
+
+def is_player_id(player_id: Optional[int]) -> bool:
+    """Whether an ESPN player ID names a player: -1 (or no ID) marks an empty slot, and D/ST IDs are negative."""
+    return player_id is not None and player_id != -1
+
+
+class PlayerIndex:
+    """
+    A memoized playerId -> PlayerRecord lookup shared across seasons and scripts.
+
+    Missing players are resolved in batched player card requests and the index is
+    persisted next to the ESPN response cache. A record fetched for a season is
+    reused for that season and any earlier one; a newer season refetches it so
+    details such as the pro team stay current.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(cache_dir(), INDEX_FILENAME)
+        self._records: Dict[int, PlayerRecord] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        for fields in raw.values():
+            record = PlayerRecord(*fields)
+            self._records[record.playerId] = record
+
+    def save(self):
+        with self._lock:
+            raw = {str(pid): list(record) for pid, record in self._records.items()}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(raw, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, player_id: int) -> Optional[PlayerRecord]:
+        return self._records.get(player_id)
+
+    def _is_known(self, player_id: int, season: int) -> bool:
+        record = self._records.get(player_id)
+        return record is not None and record.season >= season
+
+    def resolve(self, league: League, player_ids: Iterable[int]) -> Dict[int, PlayerRecord]:
+        """
+        Returns a mapping of playerId to PlayerRecord for every ID that could be found.
+
+        IDs that are not yet indexed for league.year are fetched in batches of
+        PLAYER_BATCH_SIZE; IDs ESPN does not know about are left out of the result.
+        A batch that fails after every retry raises FetchError; other failures
+        leave the batch out with a warning.
+        """
+        wanted = list(dict.fromkeys(pid for pid in player_ids if is_player_id(pid)))
+        missing = [pid for pid in wanted if not self._is_known(pid, league.year)]
+
+        fetched = 0
+        for start in range(0, len(missing), PLAYER_BATCH_SIZE):
+            batch = missing[start:start + PLAYER_BATCH_SIZE]
+            try:
+                with instrumentation.stage("player_lookup"):
+                    players = league.player_info(playerId=batch)
+            except FetchError:
+                raise  # Failed after every retry; run_script or the batch runner reports it
+            except Exception as e:
+                print(f"Warning: Could not fetch details for {len(batch)} players. Error: {e}")
+                continue
+            if players is None:
+                continue
+            if not isinstance(players, list):
+                players = [players]
+            with self._lock:
+                for player in players:
+                    self._records[player.playerId] = PlayerRecord(
+                        player.playerId,
+                        getattr(player, "name", None) or f"Unknown (ID: {player.playerId})",
+                        getattr(player, "position", "N/A"),
+                        getattr(player, "proTeam", "N/A"),
+                        league.year,
+                    )
+                    fetched += 1
+
+        if fetched:
+            try:
+                self.save()
+            except OSError as e:
+                print(f"Warning: Could not save the player index. Error: {e}")
+
+        return {pid: self._records[pid] for pid in wanted if pid in self._records}
+
+
+_default_index: Optional[PlayerIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_player_index() -> PlayerIndex:
+    """Returns the process-wide PlayerIndex, loading it from disk on first use."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = PlayerIndex()
+        return _default_index
+
+
+def reset_player_index():
+    """Drops the process-wide index so the next lookup reloads it from the current cache directory."""
+    global _default_index
+    with _default_lock:
+        _default_index = None
+
+
+def resolve_players(league: League, player_ids: Iterable[int]) -> Dict[int, PlayerRecord]:
+    """Resolves player IDs against the shared index. See PlayerIndex.resolve."""
+    return get_player_index().resolve(league, player_ids)
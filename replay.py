@@ -0,0 +1,321 @@
+import copy
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+# --- Configuration ---
+# Set ESPN_REPLAY_DIR to serve every ESPN request from a fixture directory instead of
+# the network, or ESPN_RECORD_DIR to save every live response into one.
+REPLAY_DIR_ENV = "ESPN_REPLAY_DIR"
+RECORD_DIR_ENV = "ESPN_RECORD_DIR"
+
+# The recorded mKeeperRosters response checked into the repository. Its settings,
+# members and roster entries are the templates for synthetic fixtures.
+KEEPER_SAMPLE = "keeper_response.json"
+
+PLAYER_CARD_VIEW = "kona_playercard"
+LEAGUE_VIEW = "mTeam+mRoster+mMatchup+mSettings+mStandings"
+
+
+def _request_season_and_view(url: str) -> Tuple[Optional[int], str]:
+    """Identifies an ESPN request by its season and view (the last path segment if there is no view)."""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    match = re.search(r"/seasons/(\d+)", parts.path)
+    season = int(match.group(1)) if match else int(query.get("seasonId", [0])[0]) or None
+    view = "+".join(query.get("view", [])) or parts.path.rstrip("/").rsplit("/", 1)[-1]
+    return season, view
+
+
+def fixture_path(root: str, season: int, view: str, fantasy_filter: str = None) -> str:
+    """
+    The file a view's payload is recorded in: <root>/<season>/<view>.json, or
+    <root>/<season>/<view>-<filter hash>.json for a request with an x-fantasy-filter
+    header, so e.g. each page of the transaction feed gets its own fixture.
+    """
+    if fantasy_filter is None:
+        return os.path.join(root, str(season), f"{view}.json")
+    try:
+        fantasy_filter = json.dumps(json.loads(fantasy_filter), sort_keys=True)
+    except ValueError:
+        pass  # Hash the header as sent
+    digest = hashlib.sha256(fantasy_filter.encode("utf-8")).hexdigest()
+    return os.path.join(root, str(season), f"{view}-{digest[:12]}.json")
+
+
+def _fixture_filter(request: requests.PreparedRequest, view: str) -> Optional[str]:
+    """The x-fantasy-filter that picks a request's fixture. Player cards share one fixture per season."""
+    return None if view == PLAYER_CARD_VIEW else request.headers.get("x-fantasy-filter")
+
+
+def _requested_player_ids(request: requests.PreparedRequest) -> Optional[List[int]]:
+    try:
+        fantasy_filter = json.loads(request.headers.get("x-fantasy-filter", "{}"))
+        return fantasy_filter["players"]["filterIds"]["value"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class _Body(io.BytesIO):
+    """An in-memory response body that can stand in for urllib3's raw response when streaming."""
+    decode_content = True
+
+
+def _json_response(request: requests.PreparedRequest, status_code: int, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "OK" if status_code == 200 else "Not Found"
+    response.headers["Content-Type"] = "application/json"
+    response.encoding = "utf-8"
+    response.raw = _Body(body)
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    A requests transport adapter that answers ESPN requests from a fixture directory.
+
+    Payloads are looked up by season, view and x-fantasy-filter (see fixture_path)
+    regardless of the league ID or cookies, falling back to the view's unfiltered
+    fixture. Player card requests are narrowed to the IDs in their filter
+    instead. Unknown views get a 404, as ESPN would.
+    """
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = root
+        self._payloads: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _payload(self, path: str) -> Any:
+        with self._lock:
+            if path not in self._payloads:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._payloads[path] = json.load(f)
+                except FileNotFoundError:
+                    self._payloads[path] = None
+            return self._payloads[path]
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        season, view = _request_season_and_view(request.url)
+        fantasy_filter = _fixture_filter(request, view)
+        payload = None
+        if fantasy_filter is not None:
+            payload = self._payload(fixture_path(self.root, season, view, fantasy_filter))
+        if payload is None:
+            payload = self._payload(fixture_path(self.root, season, view))
+        if payload is None:
+            return _json_response(request, 404, b"{}")
+
+        if view == PLAYER_CARD_VIEW:
+            wanted = set(_requested_player_ids(request) or [])
+            payload = {"players": [player for player in payload.get("players", []) if player.get("id") in wanted]}
+        return _json_response(request, 200, json.dumps(payload).encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    A pooled HTTPAdapter that also saves every successful ESPN response as a fixture.
+
+    Requests with an x-fantasy-filter header are saved per filter, except player
+    card responses, which are merged into one fixture per season so a later
+    replay can answer any batch of the recorded players.
+    """
+
+    def __init__(self, root: str, **kwargs):
+        super().__init__(**kwargs)
+        self.root = root
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        body = response.content
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return response
+        season, view = _request_season_and_view(request.url)
+        self._save(fixture_path(self.root, season, view, _fixture_filter(request, view)), view, payload)
+
+        if stream:
+            # The body has been read to record it; hand the caller a fresh stream over the same bytes
+            response.raw = _Body(body)
+            response._content_consumed = False
+            response._content = False
+        return response
+
+    def _save(self, path: str, view: str, payload: Any):
+        with self._lock:
+            if view == PLAYER_CARD_VIEW and os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    players = {player.get("id"): player for player in json.load(f).get("players", [])}
+                players.update((player.get("id"), player) for player in payload.get("players", []))
+                payload = dict(payload, players=list(players.values()))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+
+
+def adapter_from_environment(pool_size: int) -> Optional[BaseAdapter]:
+    """Returns the adapter selected by ESPN_REPLAY_DIR or ESPN_RECORD_DIR, if either is set."""
+    replay_dir = os.environ.get(REPLAY_DIR_ENV)
+    if replay_dir:
+        return ReplayAdapter(replay_dir)
+    record_dir = os.environ.get(RECORD_DIR_ENV)
+    if record_dir:
+        return RecordingAdapter(record_dir, pool_connections=pool_size, pool_maxsize=pool_size)
+    return None
+
+
+@contextmanager
+def replaying(root: str):
+    """Serves every request made through the shared session from `root` inside the block."""
+    from transport import get_session
+
+    session = get_session()
+    previous = session.adapters.get("https://")
+    session.mount("https://", ReplayAdapter(root))
+    try:
+        yield
+    finally:
+        session.mount("https://", previous)
+
+
+# --- Synthetic fixtures ---
+
+def _synthetic_player(template: Dict[str, Any], player_id: int, season: int, rng: random.Random) -> Dict[str, Any]:
+    """Copies a recorded player under a new ID, moving its stats to `season` with randomized points."""
+    player = copy.deepcopy(template)
+    player["id"] = player_id
+    player["fullName"] = f"Player {player_id}"
+    player["firstName"], player["lastName"] = "Player", str(player_id)
+    # The sample was recorded before its season started, so anchor on the newest season with actual points
+    actual = [stats["seasonId"] for stats in player.get("stats", [])
+              if stats.get("statSourceId") == 0 and stats.get("appliedTotal") and "seasonId" in stats]
+    newest = max(actual, default=season)
+    factor = rng.uniform(0.3, 1.7)
+    for stats in player.get("stats", []):
+        stats["seasonId"] = stats.get("seasonId", newest) + season - newest
+        for key in ("appliedTotal", "appliedAverage"):
+            if key in stats:
+                stats[key] = round(stats[key] * factor, 2)
+    return player
+
+
+def synthesize_fixtures(root: str, teams: int = 10, rounds: int = 16, seasons: int = 3, last_season: int = 2025,
+                        keepers: int = 3, keep_rate: float = 0.6, seed: int = 0):
+    """
+    Writes a replayable league history to `root`, built from the recorded keeper sample.
+
+    Every season gets the league view, mDraftDetail, mKeeperRosters, player card,
+    players_wl and proTeamSchedules_wl payloads. Each team's roster is its draft,
+    and each of its picks in the first `keepers` rounds is kept the next season
+    with probability `keep_rate`, so multi-season keeper streaks appear.
+
+    :param root: The fixture directory to write.
+    :param teams: Teams in the league (IDs 1..teams).
+    :param rounds: Draft rounds per season.
+    :param seasons: Seasons of history, ending with `last_season`.
+    """
+    rng = random.Random(seed)
+    with open(KEEPER_SAMPLE, "r", encoding="utf-8") as f:
+        sample = json.load(f)
+    templates = [entry["playerPoolEntry"]["player"] for team in sample["teams"] for entry in team["roster"]["entries"]]
+    entry_template = {key: value for key, value in sample["teams"][0]["roster"]["entries"][0].items()
+                      if key != "playerPoolEntry"}
+    members = sample.get("members", [])
+
+    settings = copy.deepcopy(sample["settings"])
+    settings["size"] = teams
+    settings.setdefault("draftSettings", {})["keeperCount"] = keepers
+
+    first_season = last_season - seasons + 1
+    next_player = 1
+    kept: Dict[int, List[int]] = {}
+    all_players: Dict[int, str] = {}
+    for season in range(first_season, last_season + 1):
+        picks, rosters, next_kept = [], {}, {}
+        overall = 0
+        for round_num in range(1, rounds + 1):
+            for team_id in range(1, teams + 1):
+                overall += 1
+                team_kept = kept.get(team_id, [])
+                if round_num <= len(team_kept):
+                    player_id, keeper = team_kept[round_num - 1], True
+                else:
+                    player_id, keeper = next_player, False
+                    next_player += 1
+                picks.append({"id": overall, "overallPickNumber": overall, "roundId": round_num,
+                              "roundPickNumber": team_id, "teamId": team_id, "playerId": player_id,
+                              "keeper": keeper, "bidAmount": 0, "nominatingTeamId": 0})
+                rosters.setdefault(team_id, []).append(player_id)
+                if round_num <= keepers and rng.random() < keep_rate:
+                    next_kept.setdefault(team_id, []).append(player_id)
+
+        players = {}
+        for player_id in (pid for roster in rosters.values() for pid in roster):
+            template = templates[player_id % len(templates)]
+            players[player_id] = _synthetic_player(template, player_id, season, rng)
+            all_players[player_id] = players[player_id]["fullName"]
+
+        league_teams = []
+        for team_id, roster in rosters.items():
+            wins = rng.randint(0, 14)
+            member = members[team_id - 1]["id"] if team_id <= len(members) else None
+            entries = [
+                dict(entry_template, playerId=player_id, lineupSlotId=20,
+                     playerPoolEntry={"id": player_id, "onTeamId": team_id, "appliedStatTotal": 0,
+                                      "player": players[player_id]})
+                for player_id in roster
+            ]
+            league_teams.append({
+                "id": team_id, "abbrev": f"T{team_id}", "name": f"Team {team_id}", "divisionId": 0,
+                "owners": [member] if member else [], "playoffSeed": team_id,
+                "record": {"overall": {"wins": wins, "losses": 14 - wins, "ties": 0,
+                                       "pointsFor": round(rng.uniform(1200, 1900), 2),
+                                       "pointsAgainst": round(rng.uniform(1200, 1900), 2),
+                                       "streakLength": 1, "streakType": "WIN"}},
+                "roster": {"entries": entries},
+                "draftStrategy": {"keeperPlayerIds": kept.get(team_id, [])},
+            })
+
+        status = dict(sample["status"], previousSeasons=list(range(first_season, season)))
+        league_view = {"id": sample.get("id", 1), "gameId": sample.get("gameId", 1), "segmentId": 0,
+                       "seasonId": season, "scoringPeriodId": 18, "status": status, "settings": settings,
+                       "members": members, "schedule": [], "teams": league_teams}
+        keeper_view = {"teams": [{"id": team["id"], "name": team["name"], "draftStrategy": team["draftStrategy"]}
+                                 for team in league_teams]}
+        payloads = {
+            LEAGUE_VIEW: league_view,
+            "mDraftDetail": {"draftDetail": {"drafted": True, "inProgress": False, "picks": picks}},
+            "mKeeperRosters": keeper_view,
+            PLAYER_CARD_VIEW: {"players": [{"id": pid, "onTeamId": 0, "player": player}
+                                           for pid, player in players.items()]},
+            "players_wl": [{"id": pid, "fullName": name} for pid, name in all_players.items()],
+            "proTeamSchedules_wl": {"settings": {"proTeams": []}},
+        }
+        for view, payload in payloads.items():
+            path = fixture_path(root, season, view)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+        kept = next_kept
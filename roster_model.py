@@ -0,0 +1,170 @@
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from espn_api.football.constant import PLAYER_STATS_MAP, POSITION_MAP, PRO_TEAM_MAP
+from espn_api.utils.logger import Logger
+from league_cache import CachedEspnRequests, record_fetches
+import instrumentation
+
+# ESPN's eligibleSlots id for the bench, never a player's position.
+_BENCH_SLOT = 25
+
+
+class RosterPlayer:
+    """
+    A rostered player read straight from a raw ESPN roster entry.
+
+    The fields the reports read (IDs, name, position, pro team, lineup slot and
+    season points) are set on construction from a single pass over the entry.
+    The per-period `stats` breakdown that espn_api builds for every player is
+    only built the first time it is read, from the season's stat blocks, which
+    are held until then as compact JSON.
+    """
+
+    __slots__ = ("playerId", "name", "position", "proTeam", "lineupSlot", "acquisitionType", "injuryStatus",
+                 "onTeamId", "total_points", "projected_total_points", "_stat_blocks", "_stats")
+
+    def __init__(self, entry: Dict[str, Any], year: int):
+        """
+        :param entry: A roster entry (mRoster) or a player card entry (kona_playercard).
+        :param year: The season whose stat blocks count.
+        """
+        player = (entry.get("playerPoolEntry") or {}).get("player") or entry.get("player") or entry
+        self.playerId = player.get("id", entry.get("playerId"))
+        self.name = player.get("fullName", "")
+        self.proTeam = PRO_TEAM_MAP.get(player.get("proTeamId"), "None")
+        self.lineupSlot = POSITION_MAP.get(entry.get("lineupSlotId"), "")
+        self.acquisitionType = entry.get("acquisitionType", "")
+        self.injuryStatus = player.get("injuryStatus", "")
+        self.onTeamId = entry.get("onTeamId", 0)
+        self.position = ""
+        # Same rule as espn_api: the first eligible slot that is a single position
+        for slot in player.get("eligibleSlots") or ():
+            position = POSITION_MAP.get(slot, "")
+            if (slot != _BENCH_SLOT and "/" not in position) or "/" in self.name:
+                self.position = position
+                break
+
+        self.total_points = 0
+        self.projected_total_points = 0
+        blocks = [block for block in player.get("stats") or ()
+                  if block.get("seasonId") == year and block.get("statSplitTypeId") != 2]
+        for block in blocks:
+            if not block.get("scoringPeriodId"):
+                if block.get("statSourceId") == 0:
+                    self.total_points = round(block.get("appliedTotal", 0), 2)
+                else:
+                    self.projected_total_points = round(block.get("appliedTotal", 0), 2)
+        # The stat blocks are kept as compact JSON, a fraction of the size of the parsed dicts
+        self._stat_blocks = json.dumps(blocks, separators=(",", ":")).encode() if blocks else b""
+        self._stats: Optional[Dict[int, Dict[str, Any]]] = None
+
+    def __repr__(self) -> str:
+        return f"RosterPlayer({self.name})"
+
+    @property
+    def stats(self) -> Dict[int, Dict[str, Any]]:
+        """The per-scoring-period points and stat breakdowns, keyed like espn_api's Player.stats."""
+        if self._stats is None:
+            with instrumentation.stage("stats_hydration"):
+                self._stats = _hydrate_stats(json.loads(self._stat_blocks) if self._stat_blocks else [])
+        return self._stats
+
+    @property
+    def avg_points(self) -> float:
+        return self.stats.get(0, {}).get("avg_points", 0)
+
+    @property
+    def projected_avg_points(self) -> float:
+        return self.stats.get(0, {}).get("projected_avg_points", 0)
+
+
+def _hydrate_stats(blocks: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    stats: Dict[int, Dict[str, Any]] = {}
+    for block in blocks:
+        prefix = "" if block.get("statSourceId") == 0 else "projected_"
+        period = stats.setdefault(block.get("scoringPeriodId"), {})
+        period[f"{prefix}points"] = round(block.get("appliedTotal", 0), 2)
+        period[f"{prefix}breakdown"] = {PLAYER_STATS_MAP.get(int(k), k): v
+                                        for k, v in (block.get("stats") or {}).items()}
+        period[f"{prefix}points_breakdown"] = {PLAYER_STATS_MAP.get(int(k), k): v
+                                               for k, v in (block.get("appliedStats") or {}).items()}
+        period[f"{prefix}avg_points"] = round(block.get("appliedAverage", 0), 2)
+    return stats
+
+
+class RosterTeam(NamedTuple):
+    team_id: int
+    team_name: str
+    roster: List[RosterPlayer]
+
+
+class RosterPick(NamedTuple):
+    team: Optional[RosterTeam]
+    playerId: int
+    round_num: int
+    round_pick: int
+    keeper_status: bool
+
+
+class RosterLeague:
+    """
+    A lightweight, read-only stand-in for espn_api's League, for roster and draft reports.
+
+    It is built from the same cached league and draft views League downloads,
+    but skips the pro player map and pro schedules and keeps each player as a
+    slotted RosterPlayer. It exposes what the roster and draft reports use
+    (year, teams with rosters, draft, player_info and espn_request), so they run
+    unchanged on it, like they do on warehouse.WarehouseLeague.
+    """
+
+    def __init__(self, league_id: int, year: int, espn_request: CachedEspnRequests,
+                 data: Dict[str, Any], draft_data: Dict[str, Any]):
+        self.league_id = league_id
+        self.year = year
+        self.espn_request = espn_request
+        # Set by load_roster_league: whether the views were fetched after the season ended
+        self.fetched_final = False
+        status = data.get("status") or {}
+        self.scoringPeriodId = data.get("scoringPeriodId")
+        self.finalScoringPeriod = status.get("finalScoringPeriod")
+        self.currentMatchupPeriod = status.get("currentMatchupPeriod")
+
+        seasonId = data.get("seasonId", year)
+        teams = {}
+        for team in sorted(data.get("teams") or [], key=lambda team: team["id"]):
+            name = team.get("name") or f"{team.get('location', 'Unknown')} {team.get('nickname', 'Unknown')}"
+            entries = (team.get("roster") or {}).get("entries") or []
+            teams[team["id"]] = RosterTeam(team["id"], name, [RosterPlayer(entry, seasonId) for entry in entries])
+        self.teams = list(teams.values())
+
+        detail = (draft_data or {}).get("draftDetail") or {}
+        self.draft = [
+            RosterPick(teams.get(pick.get("teamId")), pick.get("playerId"), pick.get("roundId"),
+                       pick.get("roundPickNumber"), bool(pick.get("keeper")))
+            for pick in detail.get("picks") or []
+        ] if detail.get("drafted") else []
+
+    def player_info(self, playerId: Union[int, List[int]] = None) -> Union[RosterPlayer, List[RosterPlayer], None]:
+        """Looks players up through the player card view, like League.player_info."""
+        ids = playerId if isinstance(playerId, list) else [playerId]
+        data = self.espn_request.get_player_card(ids, self.finalScoringPeriod)
+        players = [RosterPlayer(entry, self.year) for entry in data.get("players") or []]
+        if not players:
+            return None
+        return players if isinstance(playerId, list) else players[0]
+
+
+def load_roster_league(league_id: int, year: int, espn_s2: str = None, swid: str = None) -> RosterLeague:
+    """
+    Loads a season as a RosterLeague through the response cache.
+
+    Raises the underlying exception if the league cannot be loaded.
+    """
+    cookies = {"espn_s2": espn_s2, "SWID": swid} if espn_s2 and swid else None
+    request = CachedEspnRequests(sport="nfl", year=year, league_id=league_id, cookies=cookies,
+                                 logger=Logger(name="nfl league"))
+    with instrumentation.stage("league_load"), record_fetches(year) as fetches:
+        league = RosterLeague(league_id, year, request, request.get_league(), request.get_league_draft())
+    league.fetched_final = fetches.final
+    return league
@@ -0,0 +1,66 @@
+from contextlib import closing
+
+from common import (DEFAULT_MAX_WORKERS, DEFAULT_SEASON_TIMEOUT, build_arg_parser, get_league,
+                    get_league_config, get_leagues, parse_args, run_script)
+from get_keepers import fetch_keeper_json
+from league_cache import is_season_complete, print_cache_stats
+import warehouse
+
+
+def sync(max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = DEFAULT_SEASON_TIMEOUT,
+         path: str = None, full: bool = False):
+    """
+    Copies the league's full history into the local warehouse.
+
+    Every season the league has existed is discovered from the most recent one
+    (SEASON_ID). Completed seasons already in the warehouse are skipped, and so
+    is the season in progress while its scoring period and draft are unchanged
+    since the last sync, so only what is new is downloaded.
+
+    :param path: Optional. The warehouse file; defaults to ESPN_WAREHOUSE or espn_warehouse.sqlite.
+    :param full: Re-download every season, even those already synced.
+    """
+    league_id, season_id, espn_s2, swid = get_league_config()
+    with closing(warehouse.connect(path)) as conn:
+        latest = get_league(year=season_id)
+        all_seasons = sorted(set(latest.previousSeasons) | {season_id}, reverse=True)
+        # The season in progress is already loaded, so its scoring period and draft are known for free
+        current = {"scoring_period": getattr(latest, "scoringPeriodId", None), "picks": len(latest.draft or [])}
+        to_sync = [season for season in all_seasons if full or warehouse.needs_sync(
+            conn, league_id, season, **(current if season == season_id else {}))]
+
+        print(f"League {league_id} has {len(all_seasons)} seasons; {len(to_sync)} need syncing.")
+        if not to_sync:
+            return
+
+        leagues = {season_id: latest} if season_id in to_sync else {}
+        leagues.update(get_leagues([season for season in to_sync if season != season_id],
+                                   max_workers=max_workers, timeout=timeout))
+
+        for season, league in sorted(leagues.items()):
+            keeper_data = None
+            # Keeper selections are only live before a season is finished
+            if espn_s2 and swid and not is_season_complete(season):
+                keeper_data = fetch_keeper_json(str(league_id), season, {"espn_s2": espn_s2, "SWID": swid})
+            warehouse.store_season(conn, league, keeper_data)
+            print(f"Synced the {season} season ({len(league.draft)} picks, "
+                  f"{sum(len(team.roster) for team in league.teams)} rostered players).")
+
+
+def main():
+    """Main function to sync the league history into the local warehouse."""
+    parser = build_arg_parser("Sync the league's history into a local SQLite warehouse.", output_file=False)
+    parser.add_argument("--path", default=None,
+                        help=f"Warehouse file (default: ESPN_WAREHOUSE or {warehouse.DEFAULT_WAREHOUSE_PATH}).")
+    parser.add_argument("--full", action="store_true", help="Re-download every season, even those already synced.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Number of seasons to download at once (default: {DEFAULT_MAX_WORKERS}).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_SEASON_TIMEOUT,
+                        help=f"Seconds allowed to load each season (default: {DEFAULT_SEASON_TIMEOUT}).")
+    args = parse_args(parser)
+    sync(max_workers=args.workers, timeout=args.timeout, path=args.path, full=args.full)
+    print_cache_stats()
+
+
+if __name__ == "__main__":
+    run_script(main)
@@ -0,0 +1,50 @@
+import contextlib
+import os
+
+import pytest
+
+import league_cache
+from get_keepers import LEAGUE_YEAR
+from player_index import reset_player_index
+from replay import replaying, synthesize_fixtures
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The season the synthetic fixtures end with: the keeper season get_keepers.py reports on.
+LAST_SEASON = LEAGUE_YEAR
+FIXTURE_SEASONS = 3
+FIXTURE_TEAMS = 10
+FIXTURE_ROUNDS = 16
+
+
+@pytest.fixture(autouse=True)
+def espn_cache(tmp_path, monkeypatch):
+    """Gives every test its own empty response cache and player index, and league 1 as the configured league."""
+    cache = tmp_path / "espn_cache"
+    monkeypatch.setenv("ESPN_CACHE_DIR", str(cache))
+    monkeypatch.setenv("LEAGUE_ID", "1")
+    monkeypatch.setenv("SEASON_ID", str(LAST_SEASON))
+    monkeypatch.delenv("ESPN_S2", raising=False)
+    monkeypatch.delenv("SWID", raising=False)
+    league_cache.set_offline(False)
+    reset_player_index()
+    yield cache
+    league_cache.set_offline(False)
+    reset_player_index()
+
+
+@pytest.fixture(scope="session")
+def fixture_dir(tmp_path_factory):
+    """A replayable history of league 1: FIXTURE_SEASONS seasons ending with LAST_SEASON."""
+    root = tmp_path_factory.mktemp("fixtures")
+    with contextlib.chdir(REPO_ROOT):
+        synthesize_fixtures(str(root), teams=FIXTURE_TEAMS, rounds=FIXTURE_ROUNDS, seasons=FIXTURE_SEASONS,
+                            last_season=LAST_SEASON)
+    return str(root)
+
+
+@pytest.fixture
+def replay(fixture_dir):
+    """Serves every ESPN request from the synthetic fixtures for the duration of the test."""
+    with replaying(fixture_dir):
+        yield fixture_dir
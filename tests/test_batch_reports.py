@@ -0,0 +1,14 @@
+import get_keeper_analysis
+from batch_reports import LeagueCredentials, run_league
+
+
+def test_keeper_analysis_follows_the_batch_season(tmp_path, monkeypatch):
+    requested = []
+
+    def get_leagues(years, **kwargs):
+        requested.extend(years)
+        return {}
+
+    monkeypatch.setattr(get_keeper_analysis, "get_leagues", get_leagues)
+    run_league(LeagueCredentials(1, None, None), 2021, ["keeper-analysis"], str(tmp_path))
+    assert requested == [2021, 2020, 2019]
@@ -0,0 +1,161 @@
+"""
+Performance regression tests over the replay fixtures and the synthetic data of benchmarks.py.
+
+Each benchmark's fastest round must stay within BENCHMARK_TOLERANCE times its
+time in benchmark_baseline.json, and each end-to-end report must not make more
+ESPN requests than the baseline records. Request counts are exact under replay,
+so they hold on any machine; times are only comparable on similar hardware,
+hence the tolerance.
+
+Run with UPDATE_BENCHMARK_BASELINE=1 to rewrite the baseline from this run
+instead of checking it, and with --benchmark-skip to run only the behavior tests.
+"""
+import contextlib
+import json
+import os
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import instrumentation
+from benchmarks import synthetic_store
+from common import create_league
+from conftest import FIXTURE_ROUNDS, FIXTURE_SEASONS, FIXTURE_TEAMS, LAST_SEASON, REPO_ROOT
+from draft_simulator import DraftSlot, PickModel, simulate_scenarios
+from get_draft_data import display_draft_recap
+from get_keeper_analysis import analyze_keepers
+from get_keepers import display_keepers
+from get_rosters import display_rosters
+from keeper_optimizer import KeeperCandidate, optimize_keepers
+from keeper_streaks import store_streaks
+from player_index import reset_player_index
+from replay import replaying, synthesize_fixtures
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "3.0"))
+UPDATE_BASELINE = os.environ.get("UPDATE_BENCHMARK_BASELINE", "").lower() in ("1", "true", "yes")
+
+# League sizes the end-to-end reports are replayed at: (teams, rounds, seasons).
+# The scale-up is the largest league the reports are expected to handle; it is
+# marked slow, so `-m "not slow"` leaves it out.
+SCALES = {
+    "default": (FIXTURE_TEAMS, FIXTURE_ROUNDS, FIXTURE_SEASONS),
+    "scale-up": (20, 30, 15),
+}
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    measured = {"min_ms": {}, "http_requests": {}}
+    yield stored, measured
+    if UPDATE_BASELINE:
+        for section, values in measured.items():
+            stored.setdefault(section, {}).update(values)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def _check_time(benchmark, baseline, name: str):
+    if not benchmark.enabled:
+        return  # --benchmark-disable runs each benchmark once, untimed
+    stored, measured = baseline
+    elapsed_ms = benchmark.stats.stats.min * 1000
+    measured["min_ms"][name] = round(elapsed_ms, 1)
+    if UPDATE_BASELINE:
+        return
+    limit = stored["min_ms"][name] * TOLERANCE
+    assert elapsed_ms <= limit, f"{name} took {elapsed_ms:.1f} ms, over {limit:.1f} ms ({TOLERANCE:g}x the baseline)"
+
+
+def _check_requests(baseline, name: str, requests: int):
+    stored, measured = baseline
+    measured["http_requests"][name] = requests
+    if not UPDATE_BASELINE:
+        assert requests <= stored["http_requests"][name], \
+            f"{name} made {requests} ESPN requests, the baseline is {stored['http_requests'][name]}"
+
+
+# --- End to end, replayed ---
+
+END_TO_END = {
+    "display_rosters": lambda output, seasons: display_rosters(
+        create_league(1, LAST_SEASON, roster_only=True), os.path.join(output, "rosters.csv")),
+    "display_draft_recap": lambda output, seasons: display_draft_recap(
+        create_league(1, LAST_SEASON, roster_only=True), os.path.join(output, "draft.csv")),
+    "analyze_keepers": lambda output, seasons: analyze_keepers(num_years=seasons, league_id=1),
+    "display_keepers": lambda output, seasons: display_keepers("1", "", ""),
+}
+
+
+@pytest.fixture(scope="module")
+def scale_up_dir(tmp_path_factory):
+    """The replay fixtures for the scale-up league."""
+    teams, rounds, seasons = SCALES["scale-up"]
+    root = tmp_path_factory.mktemp("scale_up_fixtures")
+    with contextlib.chdir(REPO_ROOT):
+        synthesize_fixtures(str(root), teams=teams, rounds=rounds, seasons=seasons, last_season=LAST_SEASON)
+    return str(root)
+
+
+@pytest.mark.parametrize("scale", ["default", pytest.param("scale-up", marks=pytest.mark.slow)])
+@pytest.mark.parametrize("name", END_TO_END)
+def test_end_to_end(name, scale, benchmark, baseline, request, tmp_path, monkeypatch, capsys):
+    report = END_TO_END[name]
+    seasons = SCALES[scale][2]
+    fixtures = request.getfixturevalue("fixture_dir" if scale == "default" else "scale_up_dir")
+    key = name if scale == "default" else f"{name}[{scale}]"
+    requests = []
+    runs = iter(range(1000))
+
+    def cold_run():
+        # Every round starts from an empty cache and player index, as a first run would
+        monkeypatch.setenv("ESPN_CACHE_DIR", str(tmp_path / f"cache-{next(runs)}"))
+        reset_player_index()
+        before = instrumentation.summary()["http_requests"]
+        report(str(tmp_path), seasons)
+        requests.append(instrumentation.summary()["http_requests"] - before)
+
+    with replaying(fixtures):
+        benchmark.pedantic(cold_run, rounds=3, iterations=1)
+    capsys.readouterr()
+    assert len(set(requests)) == 1, f"Replayed runs made different numbers of requests: {requests}"
+    _check_requests(baseline, key, requests[0])
+    _check_time(benchmark, baseline, key)
+
+
+# --- Engines on synthetic data ---
+
+def test_keeper_streaks(benchmark, baseline):
+    store = synthetic_store(leagues=50, seasons=30)
+    summaries = benchmark(store_streaks, store, 2025)
+    assert summaries
+    _check_time(benchmark, baseline, "store_streaks")
+
+
+def test_keeper_optimizer(benchmark, baseline):
+    rng = random.Random(0)
+    replacement = {round_num: 200.0 - 10 * round_num for round_num in range(1, 17)}
+    teams = [[KeeperCandidate(player, f"Player {player}", "RB", rng.randint(1, 16), rng.uniform(0, 300))
+              for player in range(30)] for _ in range(12)]
+    choices = benchmark(lambda: [optimize_keepers(team, replacement, 5, True) for team in teams])
+    assert all(len(team_choices) <= 5 for team_choices in choices)
+    _check_time(benchmark, baseline, "optimize_keepers")
+
+
+def test_draft_simulator(benchmark, baseline):
+    teams, rounds, players = 10, 16, 400
+    board = [DraftSlot(overall, (overall - 1) // teams + 1, (overall - 1) % teams + 1, False)
+             for overall in range(1, teams * rounds + 1)]
+    positions = ("QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "D/ST")
+    model = PickModel(range(players), (positions[i % len(positions)] for i in range(players)),
+                      (i + 1.0 for i in range(players)), (max(2.0, 0.15 * (i + 1)) for i in range(players)),
+                      (350.0 - 0.8 * i for i in range(players)))
+    scenarios = {"no keepers": {}, "one keeper": {0: 1}}
+    results = benchmark(simulate_scenarios, board, model, 1, scenarios, simulations=500, workers=1)
+    assert [result.simulations for result in results] == [500, 500]
+    _check_time(benchmark, baseline, "simulate_scenarios")
@@ -0,0 +1,14 @@
+from common import build_arg_parser
+
+
+def test_profile_leaves_the_output_file_alone():
+    args = build_arg_parser("Test").parse_args(["--profile", "rosters.csv"])
+    assert args.profile
+    assert args.output_file == "rosters.csv"
+    assert args.profile_path is None
+
+
+def test_profile_path_names_the_dump():
+    args = build_arg_parser("Test").parse_args(["rosters.csv", "--profile-path", "run.pstats"])
+    assert args.output_file == "rosters.csv"
+    assert args.profile_path == "run.pstats"
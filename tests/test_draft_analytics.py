@@ -0,0 +1,25 @@
+from draft_analytics import DraftAnalytics
+from draft_store import DraftStore
+from exporters import UPSERT, RowExporter
+from get_draft_analytics import ADP_FIELDS, ADP_KEY, adp_rows
+
+
+def _analytics():
+    store = DraftStore()
+    store.add_pick(2024, 1, 1, 1, 100, False)
+    store.add_pick(2024, 2, 1, 2, 200, False)
+    store.add_pick(2024, 3, 1, 3, 300, False)
+    return DraftAnalytics(store, {}, {100: "RB", 200: "WR", 300: "TE"})
+
+
+def test_players_sharing_a_name_keep_their_own_adp_rows(tmp_path):
+    # Two players named alike, and one ESPN no longer knows
+    names = {100: "Mike Williams", 200: "Mike Williams"}
+    path = str(tmp_path / "adp.csv")
+    for _ in range(2):
+        with RowExporter(path, ADP_FIELDS, mode=UPSERT, key=ADP_KEY) as out:
+            out.write_rows(adp_rows(_analytics(), names))
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [line.split(",")[:2] for line in lines[1:]] == [
+        ["100", "Mike Williams"], ["200", "Mike Williams"], ["300", "Unknown (ID: 300)"]]
@@ -0,0 +1,49 @@
+import draft_simulator
+from draft_simulator import DraftSlot, PickModel, open_slots, simulate_scenarios
+
+TEAMS, ROUNDS = 4, 8
+POSITIONS = ("QB", "RB", "WR", "TE")
+
+
+def _board():
+    return [DraftSlot(overall, (overall - 1) // TEAMS + 1, (overall - 1) % TEAMS + 1, False)
+            for overall in range(1, TEAMS * ROUNDS + 1)]
+
+
+def _model(players=80, unreachable=()):
+    """Players in ADP order, except the `unreachable` ones: far past the last pick, and in no lineup slot."""
+    adp = [5000.0 + i if i in unreachable else i + 1.0 for i in range(players)]
+    positions = ["N/A" if i in unreachable else POSITIONS[i % len(POSITIONS)] for i in range(players)]
+    return PickModel(range(players), positions, adp,
+                     (max(2.0, 0.15 * (i + 1)) for i in range(players)), (300.0 - 3 * i for i in range(players)))
+
+
+def test_keepers_take_their_team_slot_in_their_round():
+    slots = open_slots(_board(), {2: {100: 1}, 3: {101: 99}})
+    assert len(slots) == TEAMS * ROUNDS - 1  # A keeper round without a pick uses no slot
+    assert slots[:TEAMS - 1] == [1, 3, 4]
+
+
+def test_results_repeat_for_the_same_seed():
+    first = simulate_scenarios(_board(), _model(), 1, {"none": {}}, simulations=50, workers=1, seed=3)
+    second = simulate_scenarios(_board(), _model(), 1, {"none": {}}, simulations=50, workers=1, seed=3)
+    assert first == second
+
+
+def test_results_do_not_depend_on_the_worker_count(monkeypatch):
+    monkeypatch.setattr(draft_simulator, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(draft_simulator, "SIMULATIONS_PER_CHUNK", 20)
+    results = [simulate_scenarios(_board(), _model(), 1, {"none": {}}, simulations=70, workers=workers, seed=3)
+               for workers in (1, 2, 3)]
+    assert results[0] == results[1] == results[2]
+    assert results[0][0].simulations == 70
+
+
+def test_scenarios_share_their_random_draws():
+    # Keeping player 0 in a round the team has no pick in removes them from the pool and changes nothing
+    # else. Every pool position after theirs shifts, but each player must keep the same draw in every draft.
+    model = _model(unreachable={0} | set(range(50, 80)))
+    scenarios = {"none": {}, "unreachable keeper": {0: 99}}
+    results = simulate_scenarios(_board(), model, 1, scenarios, simulations=200, workers=1)
+    assert results[0].simulations == results[1].simulations == 200
+    assert results[0][2:] == results[1][2:]
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+import draft_watch
+from draft_watch import DraftWatcher
+from player_index import PlayerRecord
+
+
+class _Response:
+    def __init__(self, status_code, payload=None, etag=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+def _pick(overall, player_id, team_id=1):
+    return {"overallPickNumber": overall, "roundId": 1, "teamId": team_id, "playerId": player_id}
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    """A watcher whose polls return the queued responses and whose player lookups name every ID."""
+    responses = []
+    requests_seen = []
+
+    def http_get(url, params=None, headers=None, cookies=None):
+        requests_seen.append(dict(headers or {}))
+        return responses.pop(0)
+
+    monkeypatch.setattr(draft_watch, "http_get", http_get)
+    monkeypatch.setattr(draft_watch, "resolve_players", lambda league, ids: {
+        pid: PlayerRecord(pid, f"Player {pid}", "RB", "NE", 2024) for pid in ids})
+    league = SimpleNamespace(year=2024, teams=[SimpleNamespace(team_id=1, team_name="Team One")],
+                             espn_request=SimpleNamespace(LEAGUE_ENDPOINT="https://example.test", cookies=None))
+    watcher = DraftWatcher(league)
+    watcher.responses = responses
+    watcher.requests_seen = requests_seen
+    return watcher
+
+
+def _detail(picks, drafted=False, in_progress=True):
+    return {"draftDetail": {"picks": picks, "drafted": drafted, "inProgress": in_progress}}
+
+
+def test_each_poll_returns_only_new_picks(watcher):
+    watcher.responses += [
+        _Response(200, _detail([_pick(1, 100), _pick(2, -1)]), etag="a"),
+        _Response(200, _detail([_pick(1, 100), _pick(2, 200)]), etag="b"),
+    ]
+    assert [row["Player Name"] for row in watcher.poll()] == ["Player 100"]
+    assert [row["Player Name"] for row in watcher.poll()] == ["Player 200"]
+    assert watcher.requests_seen[1]["If-None-Match"] == "a"
+    assert watcher.next_index == 2
+
+
+def test_unchanged_draft_returns_nothing(watcher):
+    watcher.responses += [_Response(200, _detail([_pick(1, 100)]), etag="a"), _Response(304)]
+    watcher.poll()
+    assert watcher.poll() == []
+    assert watcher.next_index == 1
+
+
+def test_draft_completes_when_drafted_and_not_in_progress(watcher):
+    watcher.responses.append(_Response(200, _detail([_pick(1, 100)], drafted=True, in_progress=False)))
+    rows = watcher.poll()
+    assert watcher.complete
+    assert rows[0]["Team"] == "Team One"
+
+
+def test_defense_picks_are_made_picks(watcher):
+    watcher.responses.append(_Response(200, _detail([_pick(1, 100), _pick(2, -16002), _pick(3, 200)],
+                                                    drafted=True, in_progress=False)))
+    assert [row["Player Name"] for row in watcher.poll()] == ["Player 100", "Player -16002", "Player 200"]
+    assert watcher.complete
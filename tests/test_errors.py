@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+import get_draft_data
+import league_cache
+from common import LeagueLoadError, create_league, get_league_config, run_script
+from conftest import LAST_SEASON
+from exporters import APPEND
+from get_draft_data import display_draft_recap
+from get_keeper_analysis import analyze_keepers
+from transport import FetchTimeout
+from weekly_stats import load_weekly_stats
+
+
+def test_missing_configuration_raises(monkeypatch):
+    monkeypatch.delenv("LEAGUE_ID")
+    with pytest.raises(LeagueLoadError):
+        get_league_config()
+
+
+def test_run_script_exits_on_typed_errors(capsys):
+    def main():
+        raise FetchTimeout("timed out", "https://example.test")
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_script(main)
+    assert exit_info.value.code == 1
+    assert "Error: timed out" in capsys.readouterr().out
+
+
+def test_reports_let_fetch_errors_through(replay, monkeypatch):
+    league = create_league(1, LAST_SEASON, roster_only=True)
+
+    def http_get(url, params=None, headers=None, cookies=None):
+        raise FetchTimeout("timed out", url)
+
+    # Every player lookup from here on misses the cache and fails after its retries
+    monkeypatch.setattr(league_cache, "http_get", http_get)
+    with pytest.raises(FetchTimeout):
+        display_draft_recap(league)
+    with pytest.raises(FetchTimeout):
+        load_weekly_stats(league, [player.playerId for team in league.teams for player in team.roster])
+
+
+def test_keeper_analysis_lets_configuration_errors_through(monkeypatch):
+    monkeypatch.setenv("LEAGUE_ID", "not a number")
+    with pytest.raises(LeagueLoadError):
+        analyze_keepers(num_years=1)
+
+
+def test_export_errors_are_reported_without_a_traceback(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(get_draft_data, "resolve_players", lambda league, player_ids: {})
+    output_file = tmp_path / "draft.csv"
+    output_file.write_text("Other,Columns\n1,2\n", encoding="utf-8")
+    team = SimpleNamespace(team_id=1, team_name="Team One", roster=[])
+    league = SimpleNamespace(year=2024, teams=[team],
+                             draft=[SimpleNamespace(team=team, playerId=100, round_num=1, keeper_status=False)])
+    display_draft_recap(league, str(output_file), mode=APPEND)
+    assert "cannot add rows to it" in capsys.readouterr().out
+    assert output_file.read_text(encoding="utf-8") == "Other,Columns\n1,2\n"
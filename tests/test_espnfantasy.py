@@ -0,0 +1,30 @@
+import get_keeper_analysis
+import get_original_draft_round
+from common import create_league, share_leagues
+from conftest import LAST_SEASON
+from espnfantasy import build_parser, run_keeper_analysis, run_original_rounds
+
+
+def test_roster_only_requests_reuse_a_full_league(replay):
+    share_leagues()
+    try:
+        league = create_league(1, LAST_SEASON)
+        assert create_league(1, LAST_SEASON, roster_only=True) is league
+    finally:
+        share_leagues(False)
+
+
+def test_original_rounds_follow_year(monkeypatch):
+    years = []
+    monkeypatch.setattr(get_original_draft_round, "get_keeper_draft_details", lambda year=2024: years.append(year))
+    run_original_rounds(build_parser().parse_args(["--year", "2021", "original-rounds"]), None)
+    run_original_rounds(build_parser().parse_args(["original-rounds"]), None)
+    assert years == [2021, 2024]
+
+
+def test_analysis_reports_keep_their_own_default_years(monkeypatch):
+    calls = []
+    monkeypatch.setattr(get_keeper_analysis, "analyze_keepers", lambda output_file, **kwargs: calls.append(kwargs))
+    run_keeper_analysis(build_parser().parse_args(["report", "keeper-analysis"]), None)
+    run_keeper_analysis(build_parser().parse_args(["report", "keeper-analysis", "--years", "5"]), None)
+    assert [call["num_years"] for call in calls] == [3, 5]
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+
+import pytest
+
+from exporters import APPEND, UPSERT, RowExporter, export_format
+
+FIELDS = ["Team", "Player Name", "Points"]
+
+
+def _write(path, rows, **kwargs):
+    with RowExporter(str(path), FIELDS, **kwargs) as out:
+        out.write_rows(rows)
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_format_follows_the_extension():
+    assert export_format("out.CSV") == "csv"
+    assert export_format("out.ndjson") == "jsonl"
+    assert export_format("out.parquet") == "parquet"
+    assert export_format("out.txt") is None
+    assert export_format(None) is None
+
+
+def test_unsupported_files_and_modes_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        RowExporter(str(tmp_path / "out.txt"), FIELDS)
+    with pytest.raises(ValueError):
+        RowExporter(str(tmp_path / "out.csv"), FIELDS, mode="merge")
+    with pytest.raises(ValueError):
+        RowExporter(str(tmp_path / "out.csv"), FIELDS, mode=UPSERT)
+
+
+def test_write_replaces_the_file(tmp_path):
+    path = tmp_path / "out.csv"
+    _write(path, [{"Team": "A", "Player Name": "One", "Points": 1}])
+    _write(path, [{"Team": "B", "Player Name": "Two", "Points": 2}])
+    assert _read_csv(path) == [{"Team": "B", "Player Name": "Two", "Points": "2"}]
+
+
+def test_failed_export_leaves_the_previous_file(tmp_path):
+    path = tmp_path / "out.csv"
+    _write(path, [{"Team": "A", "Player Name": "One", "Points": 1}])
+    with pytest.raises(RuntimeError):
+        with RowExporter(str(path), FIELDS) as out:
+            out.write({"Team": "B", "Player Name": "Two", "Points": 2})
+            raise RuntimeError("report failed")
+    assert _read_csv(path) == [{"Team": "A", "Player Name": "One", "Points": "1"}]
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_append_adds_rows(tmp_path):
+    path = tmp_path / "out.jsonl"
+    _write(path, [{"Team": "A", "Player Name": "One", "Points": 1}])
+    _write(path, [{"Team": "B", "Player Name": "Two", "Points": 2}], mode=APPEND)
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["Team"] for line in f] == ["A", "B"]
+
+
+def test_append_refuses_different_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    _write(path, [{"Team": "A", "Player Name": "One", "Points": 1}])
+    with pytest.raises(ValueError):
+        RowExporter(str(path), ["Team"], mode=APPEND)
+
+
+def test_upsert_replaces_matching_rows_and_appends_the_rest(tmp_path):
+    path = tmp_path / "out.csv"
+    key = ["Team", "Player Name"]
+    _write(path, [{"Team": "A", "Player Name": "One", "Points": 1},
+                  {"Team": "A", "Player Name": "Two", "Points": 2}])
+    _write(path, [{"Team": "A", "Player Name": "Two", "Points": 20},
+                  {"Team": "B", "Player Name": "Three", "Points": 3}], mode=UPSERT, key=key)
+    assert [(row["Player Name"], row["Points"]) for row in _read_csv(path)] == [("One", "1"), ("Two", "20"),
+                                                                                ("Three", "3")]
+
+
+def test_upsert_of_unchanged_rows_leaves_the_file_untouched(tmp_path):
+    path = tmp_path / "out.csv"
+    rows = [{"Team": "A", "Player Name": "One", "Points": 1}]
+    _write(path, rows)
+    os.utime(path, (0, 0))
+    _write(path, rows, mode=UPSERT, key=["Team", "Player Name"])
+    assert os.path.getmtime(path) == 0
+
+
+def test_parquet_upsert_of_unchanged_mixed_rows_leaves_the_file_untouched(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "out.parquet"
+    rows = [{"Team": "A", "Player Name": "One", "Points": 1}, {"Team": "B", "Player Name": "Two", "Points": "N/A"}]
+    _write(path, rows)
+    os.utime(path, (0, 0))
+    _write(path, rows, mode=UPSERT, key=["Team", "Player Name"])
+    assert os.path.getmtime(path) == 0
@@ -0,0 +1,168 @@
+import datetime
+import json
+import os
+from types import SimpleNamespace
+
+from keeper_eligibility import (TRADE_MESSAGE, TRANSACTIONS_PAGE_SIZE, KeeperIndex, KeeperStatus, Transaction,
+                                fetch_transactions, load_keeper_index)
+import league_cache
+from league_cache import CacheMissError, cached_json
+
+
+def _league(year, picks, rosters, trades=()):
+    """A season without a transaction feed: picks are (team_id, player_id, round, keeper)."""
+    teams = {team_id: SimpleNamespace(team_id=team_id, roster=[
+        SimpleNamespace(playerId=player_id, acquisitionType="TRADE" if player_id in trades else "DRAFT")
+        for player_id in player_ids]) for team_id, player_ids in rosters.items()}
+    draft = [SimpleNamespace(team=teams.get(team_id), playerId=player_id, round_num=round_num, keeper_status=keeper)
+             for team_id, player_id, round_num, keeper in picks]
+    return SimpleNamespace(year=year, draft=draft, teams=list(teams.values()))
+
+
+def test_keeper_years_carry_over_while_the_same_team_keeps_the_player(tmp_path):
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_league(2022, [(1, 100, 3, False)], {1: [100]}))
+    index.update(_league(2023, [(1, 100, 3, True)], {1: [100]}))
+    index.update(_league(2024, [(1, 100, 3, True)], {1: [100]}))
+    assert index.status(100) == KeeperStatus(100, 1, 3, 2, 2022)
+    assert index.keeper_years(100, 1) == 2
+    assert index.is_eligible(100, 1, max_keeper_years=3)
+    assert not index.is_eligible(100, 1, max_keeper_years=2)
+    assert not index.is_eligible(100, 2)
+
+
+def test_traded_players_keep_their_round(tmp_path):
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_league(2024, [(1, 100, 2, False), (2, 200, 2, False)], {1: [200], 2: [100]}, trades={100, 200}))
+    assert index.keeper_round(100, 2, default=16) == 2
+    assert index.keeper_round(200, 1, default=16) == 2
+
+
+def test_pickups_cost_the_default_round(tmp_path):
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_league(2024, [(1, 100, 2, False)], {1: [300]}))
+    assert index.status(100) is None  # Dropped: on no roster at the end of the season
+    assert index.keeper_round(300, 1, default=16) == 16
+
+
+def test_transactions_move_players(tmp_path):
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_league(2024, [(1, 100, 2, False)], {}))
+    index._apply_transaction(2024, Transaction(1, "TRADE", 100, 1, 2))
+    assert index.status(100) == KeeperStatus(100, 2, 2, 0, 2024)
+    index._apply_transaction(2024, Transaction(2, "DROP", 100, 2, None))
+    index._apply_transaction(2024, Transaction(3, "ADD", 100, None, 3))
+    assert index.status(100) == KeeperStatus(100, 3, None, 0, 2024)
+
+
+def test_saved_index_loads_back(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = KeeperIndex(1, 2022, path=path)
+    index.update(_league(2022, [(1, 100, 3, False)], {1: [100]}))
+    index.save()
+
+    loaded = KeeperIndex.load(1, 2022, path=path)
+    assert loaded.seasons == [2022]
+    assert loaded.status(100) == index.status(100)
+    assert not loaded.needs_update(2022)
+    assert loaded.needs_update(2023)
+
+
+class _Feed:
+    """A transaction feed served newest first, one page per request; pages listed in `fail` raise instead."""
+
+    def __init__(self, topics, fail=()):
+        self.topics = sorted(topics, key=lambda topic: -topic["date"])
+        self.fail = set(fail)
+        self.pages = 0
+
+    def league_get(self, extend=None, params=None, headers=None):
+        page = self.pages
+        self.pages += 1
+        if page in self.fail:
+            raise CacheMissError("No cached 'kona_league_communication' data (offline mode).")
+        offset = json.loads(headers["x-fantasy-filter"])["topics"]["offset"]
+        return {"topics": self.topics[offset:offset + TRANSACTIONS_PAGE_SIZE]}
+
+
+class _CachedFeed(_Feed):
+    """A transaction feed whose pages go through the response cache, like CachedEspnRequests."""
+
+    def league_get(self, extend=None, params=None, headers=None):
+        return cached_json(1, 2024, "kona_league_communication", {"headers": headers},
+                           lambda: super(_CachedFeed, self).league_get(extend, params, headers))
+
+
+def _trade(date, player_id, from_team, to_team):
+    return {"date": date, "messages": [{"messageTypeId": TRADE_MESSAGE, "targetId": player_id,
+                                        "from": from_team, "to": to_team}]}
+
+
+def _feed_league(feed):
+    league = _league(2024, [(1, 100, 2, False)], {})
+    league.espn_request = feed
+    return league
+
+
+def test_the_feed_is_applied_and_remembered(tmp_path):
+    topics = [_trade(date, 100, 1, 2 if date % 2 else 1) for date in range(1, TRANSACTIONS_PAGE_SIZE + 2)]
+    feed = _Feed(topics)
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_feed_league(feed))
+    assert feed.pages == 2
+    assert index._seasons[2024]["last_transaction"] == TRANSACTIONS_PAGE_SIZE + 1
+    assert not index.needs_update(2024)
+
+
+def test_a_failed_page_keeps_the_season_pending(tmp_path):
+    topics = [_trade(date, 100, 1, 2) for date in range(1, TRANSACTIONS_PAGE_SIZE + 2)]
+    feed = fetch_transactions(_feed_league(_Feed(topics, fail={1})))
+    assert not feed.complete
+    assert len(feed.transactions) == TRANSACTIONS_PAGE_SIZE
+
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_feed_league(_Feed(topics, fail={1})))
+    assert index._seasons[2024]["last_transaction"] == 0
+    assert index.needs_update(2024)
+
+    retry = _Feed(topics)
+    index.update(_feed_league(retry))
+    assert retry.pages == 2  # The whole feed is read again
+    assert not index.needs_update(2024)
+
+
+def test_later_seasons_wait_for_a_failed_season():
+    topics = [_trade(1, 100, 1, 2)]
+    older = _feed_league(_Feed(topics, fail={0}))
+    older.year = 2023
+    newer = _league(2024, [(1, 100, 2, True)], {1: [100]})
+    index = load_keeper_index(1, 2024, seasons=2, loaded={2023: older, 2024: newer})
+    assert index.seasons == [2023]
+    assert index.needs_update(2023)
+
+    older.espn_request = _Feed(topics)
+    index = load_keeper_index(1, 2024, seasons=2, loaded={2023: older, 2024: newer})
+    assert index.seasons == [2023, 2024]
+    assert not index.needs_update(2023)
+
+
+def test_a_feed_cached_mid_season_keeps_the_season_pending(tmp_path, espn_cache):
+    topics = [_trade(1, 100, 1, 2)]
+    index = KeeperIndex(1, 2024, path=str(tmp_path / "index.json"))
+    index.update(_feed_league(_CachedFeed(topics)))
+    assert not index.needs_update(2024)
+    mid_season = datetime.datetime(2024, 11, 1).timestamp()
+    for path in espn_cache.rglob("*.json"):
+        os.utime(path, (mid_season, mid_season))
+
+    stale = KeeperIndex(1, 2024, path=str(tmp_path / "stale.json"))
+    league_cache.set_offline(True)
+    stale.update(_feed_league(_CachedFeed(topics)))
+    assert stale.status(100).team_id == 2
+    assert stale.needs_update(2024)
+
+    league_cache.set_offline(False)
+    refetched = _CachedFeed(topics)
+    stale.update(_feed_league(refetched))
+    assert refetched.pages == 1
+    assert not stale.needs_update(2024)
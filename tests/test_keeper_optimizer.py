@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from keeper_optimizer import KeeperCandidate, optimize_keepers, replacement_values
+
+
+def _candidate(player_id, round_num, points):
+    return KeeperCandidate(player_id, f"Player {player_id}", "RB", round_num, points)
+
+
+def test_replacement_values_never_rise_in_later_rounds():
+    team = SimpleNamespace(roster=[SimpleNamespace(playerId=1, total_points=100),
+                                   SimpleNamespace(playerId=2, total_points=60),
+                                   SimpleNamespace(playerId=3, total_points=80)])
+    draft = [SimpleNamespace(playerId=1, round_num=1), SimpleNamespace(playerId=2, round_num=2),
+             SimpleNamespace(playerId=3, round_num=4)]
+    league = SimpleNamespace(teams=[team], draft=draft)
+    # Round 3 has no picks and takes round 4's value; round 2 is raised to the rounds after it
+    assert replacement_values(league, 4) == {1: 100, 2: 80, 3: 80, 4: 80}
+
+
+def test_keepers_only_count_when_they_beat_their_round():
+    replacement = {1: 100.0, 2: 50.0, 3: 20.0}
+    choices = optimize_keepers([_candidate(1, 1, 90), _candidate(2, 3, 60)], replacement, max_keepers=2)
+    assert [(choice.candidate.player_id, choice.round, choice.value) for choice in choices] == [(2, 3, 40.0)]
+
+
+def test_two_keepers_cannot_share_a_round():
+    replacement = {1: 100.0, 2: 50.0, 3: 20.0}
+    candidates = [_candidate(1, 3, 60), _candidate(2, 3, 80)]
+    assert [choice.candidate.player_id for choice in optimize_keepers(candidates, replacement, 2)] == [2]
+
+
+def test_earlier_rounds_resolve_conflicts_when_allowed():
+    replacement = {1: 100.0, 2: 50.0, 3: 20.0}
+    candidates = [_candidate(1, 3, 60), _candidate(2, 3, 80)]
+    choices = optimize_keepers(candidates, replacement, 2, allow_earlier_round=True)
+    # Keeping both (80 in round 2 and 60 in round 3, or the other way round) beats either alone
+    assert sorted(choice.candidate.player_id for choice in choices) == [1, 2]
+    assert sorted(choice.round for choice in choices) == [2, 3]
+    assert sum(choice.value for choice in choices) == 70.0
+
+
+def test_max_keepers_keeps_the_most_valuable():
+    replacement = {round_num: 10.0 for round_num in range(1, 6)}
+    candidates = [_candidate(i, i, 10.0 + 10 * i) for i in range(1, 6)]
+    choices = optimize_keepers(candidates, replacement, max_keepers=2)
+    assert [choice.candidate.player_id for choice in choices] == [4, 5]
@@ -0,0 +1,57 @@
+from draft_store import DraftStore
+from keeper_streaks import Streak, find_streaks, keeper_counts, store_streaks
+
+
+def test_consecutive_seasons_form_one_streak():
+    summaries = find_streaks([7, 7, 7], [1, 1, 1], [2022, 2023, 2024])
+    summary = summaries[(7, 1)]
+    assert summary.current == summary.longest == 3
+    assert summary.streaks == (Streak(7, 1, 2022, 2024),)
+    assert summary.broken == ()
+
+
+def test_a_gap_breaks_the_streak():
+    summary = find_streaks([7, 7, 7], [1, 1, 1], [2020, 2021, 2023])[(7, 1)]
+    assert summary.streaks == (Streak(7, 1, 2020, 2021), Streak(7, 1, 2023, 2023))
+    assert (summary.current, summary.longest) == (1, 2)
+    assert summary.broken == (Streak(7, 1, 2020, 2021),)
+
+
+def test_streaks_are_per_team():
+    summaries = find_streaks([7, 7], [1, 2], [2023, 2024])
+    assert summaries[(7, 1)].current == 0
+    assert summaries[(7, 2)].current == 1
+
+
+def test_latest_season_decides_what_is_current():
+    summaries = find_streaks([7, 7], [1, 1], [2022, 2023], latest_season=2024)
+    assert summaries[(7, 1)].current == 0
+    assert summaries[(7, 1)].longest == 2
+
+
+def test_no_keepers_no_streaks():
+    assert find_streaks([], [], []) == {}
+
+
+def test_store_streaks_reads_only_keeper_picks():
+    store = DraftStore()
+    store.add_pick(2023, 1, 1, 1, 100, False)
+    store.add_pick(2023, 2, 1, 2, 200, False)
+    store.add_pick(2024, 1, 1, 1, 100, True)
+    store.add_pick(2024, 2, 1, 2, 300, False)
+    assert list(store_streaks(store)) == [(100, 1)]
+    assert keeper_counts(store) == {(1, 2024): 1}
+
+
+def test_large_team_ids_and_defense_ids_round_trip():
+    # Multi-league stores number teams past 16 bits; D/ST player IDs are negative
+    summaries = find_streaks([-16002, -16002, 5], [70011, 70011, 70012], [2023, 2024, 2024])
+    assert summaries[(-16002, 70011)].streaks == (Streak(-16002, 70011, 2023, 2024),)
+    assert summaries[(5, 70012)].current == 1
+
+
+def test_store_accepts_team_ids_past_16_bits():
+    store = DraftStore()
+    store.add_pick(2024, 1, 1, 35011, 100, True)
+    assert store.pick(0).team_id == 35011
+    assert list(store_streaks(store)) == [(100, 35011)]
@@ -0,0 +1,87 @@
+import datetime
+import os
+
+import pytest
+
+import league_cache
+from league_cache import CacheMissError, cached_json, is_season_complete
+
+
+def test_cached_json_fetches_once_per_request():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    before = league_cache.cache_stats()
+    first = cached_json(1, 2020, "mTeam", {"view": "mTeam"}, fetch)
+    second = cached_json(1, 2020, "mTeam", {"view": "mTeam"}, fetch)
+    after = league_cache.cache_stats()
+
+    assert first == second == {"value": 1}
+    assert len(calls) == 1
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_cached_json_keys_on_the_whole_request():
+    cached_json(1, 2020, "mTeam", {"view": "mTeam", "scoringPeriodId": 1}, lambda: {"week": 1})
+    assert cached_json(1, 2020, "mTeam", {"view": "mTeam", "scoringPeriodId": 2}, lambda: {"week": 2}) == {"week": 2}
+
+
+def test_offline_miss_raises_and_never_fetches():
+    league_cache.set_offline(True)
+
+    def fetch():
+        raise AssertionError("offline mode must not fetch")
+
+    with pytest.raises(CacheMissError):
+        cached_json(1, 2020, "mTeam", {"view": "mTeam"}, fetch)
+
+
+def test_offline_serves_cached_entries():
+    cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"cached": True})
+    league_cache.set_offline(True)
+    assert cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: None) == {"cached": True}
+
+
+def test_season_completes_after_the_final_date():
+    month, day = league_cache.SEASON_FINAL_MONTH_DAY
+    final = datetime.date(2024 + 1, month, day)
+    assert not is_season_complete(2024, today=final - datetime.timedelta(days=1))
+    assert is_season_complete(2024, today=final)
+
+
+def _written_on(paths, date):
+    for path in paths:
+        timestamp = datetime.datetime.combine(date, datetime.time(12)).timestamp()
+        os.utime(path, (timestamp, timestamp))
+
+
+def test_entries_cached_mid_season_expire_after_the_season_ends(espn_cache):
+    cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 10})
+    _written_on(espn_cache.rglob("*.json"), datetime.date(2020, 12, 1))
+    assert cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 17}) == {"week": 17}
+
+    # Refetched after the season ended, the entry is final
+    assert cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 18}) == {"week": 17}
+    _written_on(espn_cache.rglob("*.json"), league_cache.season_final_date(2020))
+    assert cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 18}) == {"week": 17}
+
+
+def test_fetch_records_tell_final_data_from_stale_copies(espn_cache):
+    cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 10})
+    _written_on(espn_cache.rglob("*.json"), datetime.date(2020, 12, 1))
+    league_cache.set_offline(True)
+    with league_cache.record_fetches(2020) as stale:
+        cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: None)
+    assert not stale.final
+
+    league_cache.set_offline(False)
+    with league_cache.record_fetches(2020) as fetched:
+        cached_json(1, 2020, "mTeam", {"view": "mTeam"}, lambda: {"week": 17})
+    assert fetched.final
+    with league_cache.record_fetches(2099) as in_progress:
+        pass
+    assert not in_progress.final
@@ -0,0 +1,84 @@
+import threading
+from types import SimpleNamespace
+
+from player_index import PlayerIndex, PlayerRecord, is_player_id
+
+
+class _League:
+    """Answers player lookups like League.player_info and records each batch requested."""
+
+    def __init__(self, year, unknown=()):
+        self.year = year
+        self.unknown = set(unknown)
+        self.batches = []
+
+    def player_info(self, playerId):
+        self.batches.append(list(playerId))
+        return [SimpleNamespace(playerId=pid, name=f"Player {pid}", position="RB", proTeam="NE")
+                for pid in playerId if pid not in self.unknown]
+
+
+def test_resolve_fetches_only_missing_players(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.json"))
+    league = _League(2024)
+    assert index.resolve(league, [1, 2, 2])[2] == PlayerRecord(2, "Player 2", "RB", "NE", 2024)
+    index.resolve(league, [1, 3])
+    assert league.batches == [[1, 2], [3]]
+
+
+def test_resolve_batches_large_lookups(tmp_path, monkeypatch):
+    monkeypatch.setattr("player_index.PLAYER_BATCH_SIZE", 2)
+    league = _League(2024)
+    PlayerIndex(str(tmp_path / "players.json")).resolve(league, [1, 2, 3])
+    assert league.batches == [[1, 2], [3]]
+
+
+def test_newer_seasons_refetch_players(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.json"))
+    index.resolve(_League(2023), [1])
+    assert index.resolve(_League(2022), [1])[1].season == 2023  # Reused for earlier seasons
+    newer = _League(2024)
+    index.resolve(newer, [1])
+    assert newer.batches == [[1]]
+
+
+def test_unknown_players_are_left_out(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.json"))
+    assert list(index.resolve(_League(2024, unknown={2}), [1, 2])) == [1]
+
+
+def test_defenses_are_players_but_empty_slots_are_not(tmp_path):
+    assert is_player_id(-16001)
+    assert not is_player_id(-1)
+    assert not is_player_id(None)
+    league = _League(2024)
+    index = PlayerIndex(str(tmp_path / "players.json"))
+    assert list(index.resolve(league, [-16001, -1, None, 1])) == [-16001, 1]
+    assert league.batches == [[-16001, 1]]
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    index = PlayerIndex(str(tmp_path / "players.json"))
+    index.resolve(_League(2024), [1])
+    errors = []
+
+    def save():
+        try:
+            for _ in range(50):
+                index.save()
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert PlayerIndex(index.path).get(1) is not None
+
+
+def test_index_persists(tmp_path):
+    path = str(tmp_path / "players.json")
+    PlayerIndex(path).resolve(_League(2024), [1])
+    assert PlayerIndex(path).get(1) == PlayerRecord(1, "Player 1", "RB", "NE", 2024)
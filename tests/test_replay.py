@@ -0,0 +1,43 @@
+import json
+
+import requests
+
+from replay import RecordingAdapter, ReplayAdapter, fixture_path
+
+URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024/segments/0/leagues/1/communication/"
+
+
+def _page_request(offset):
+    headers = {"x-fantasy-filter": json.dumps({"topics": {"offset": offset, "limit": 25}})}
+    return requests.Request("GET", URL, params={"view": "kona_league_communication"}, headers=headers).prepare()
+
+
+def _json(status_code, payload):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+def test_pages_of_one_view_are_recorded_and_replayed_apart(tmp_path, monkeypatch):
+    def send(adapter, request, stream=False, **kwargs):
+        offset = json.loads(request.headers["x-fantasy-filter"])["topics"]["offset"]
+        return _json(200, {"topics": [{"date": offset}]})
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    recorder = RecordingAdapter(str(tmp_path))
+    for offset in (0, 25):
+        recorder.send(_page_request(offset))
+
+    replay = ReplayAdapter(str(tmp_path))
+    assert [replay.send(_page_request(offset)).json() for offset in (0, 25)] == [
+        {"topics": [{"date": 0}]}, {"topics": [{"date": 25}]}]
+    assert replay.send(_page_request(50)).status_code == 404
+
+
+def test_filtered_requests_fall_back_to_the_view_fixture(tmp_path):
+    path = fixture_path(str(tmp_path), 2024, "kona_league_communication")
+    (tmp_path / "2024").mkdir()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"topics": []}, f)
+    assert ReplayAdapter(str(tmp_path)).send(_page_request(0)).json() == {"topics": []}
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+import warehouse
+
+
+@pytest.fixture
+def conn():
+    conn = warehouse.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def _league(season, scoring_period, picks=0, fetched_final=True):
+    team = SimpleNamespace(team_id=1, team_name="Team One", roster=[])
+    draft = [SimpleNamespace(round_num=1, round_pick=1, team=team, playerId=100 + i, keeper_status=False)
+             for i in range(picks)]
+    return SimpleNamespace(league_id=1, year=season, scoringPeriodId=scoring_period, teams=[team], draft=draft,
+                           fetched_final=fetched_final)
+
+
+def test_completed_seasons_sync_once(conn):
+    assert warehouse.needs_sync(conn, 1, 2020)
+    warehouse.store_season(conn, _league(2020, 17))
+    assert not warehouse.needs_sync(conn, 1, 2020)
+    assert not warehouse.needs_sync(conn, 1, 2020, scoring_period=18)
+
+
+def test_season_in_progress_syncs_when_the_scoring_period_moves_on(conn, monkeypatch):
+    monkeypatch.setattr(warehouse, "resolve_players", lambda league, ids: {})
+    warehouse.store_season(conn, _league(2025, 5, picks=2, fetched_final=False))
+    assert not warehouse.needs_sync(conn, 1, 2025, scoring_period=5, picks=2)
+    assert warehouse.needs_sync(conn, 1, 2025, scoring_period=6, picks=2)
+    # The preseason draft happens within one scoring period
+    assert warehouse.needs_sync(conn, 1, 2025, scoring_period=5, picks=3)
+    # Without the current period there is nothing to compare with
+    assert warehouse.needs_sync(conn, 1, 2025)
+
+
+def test_a_season_loaded_from_a_stale_copy_is_synced_again(conn, monkeypatch):
+    monkeypatch.setattr(warehouse, "resolve_players", lambda league, ids: {})
+    warehouse.store_season(conn, _league(2020, 12, fetched_final=False))
+    assert warehouse.needs_sync(conn, 1, 2020)
+    warehouse.store_season(conn, _league(2020, 18))
+    assert not warehouse.needs_sync(conn, 1, 2020)
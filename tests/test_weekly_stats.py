@@ -0,0 +1,55 @@
+import math
+from types import SimpleNamespace
+
+from draft_analytics import season_points
+from weekly_stats import POINTS, load_weekly_stats
+
+
+def _player(player_id, position_id, weekly_points, season=2024):
+    blocks = [{"seasonId": season, "statSourceId": 0, "statSplitTypeId": 1, "scoringPeriodId": week,
+               "appliedTotal": points} for week, points in enumerate(weekly_points, start=1)]
+    blocks.append({"seasonId": season, "statSourceId": 0, "statSplitTypeId": 0, "appliedTotal": sum(weekly_points)})
+    return {"id": player_id, "defaultPositionId": position_id, "stats": blocks}
+
+
+class _Request:
+    """Answers player card requests from a fixed set of players and records each batch."""
+
+    def __init__(self, players):
+        self.players = {player["id"]: player for player in players}
+        self.batches = []
+
+    def get_player_card(self, player_ids, max_scoring_period):
+        self.batches.append(list(player_ids))
+        return {"players": [{"player": self.players[pid]} for pid in player_ids if pid in self.players]}
+
+
+def _league(players, roster=()):
+    return SimpleNamespace(year=2024, finalScoringPeriod=3, espn_request=_Request(players),
+                           teams=[SimpleNamespace(team_id=1, roster=list(roster))])
+
+
+def test_weekly_stats_are_read_per_week():
+    league = _league([_player(100, 2, [10.0, 0.0, 12.5])])
+    stats = load_weekly_stats(league, [100])
+    assert stats.series(100, POINTS) == [10.0, 0.0, 12.5]
+    assert stats.season_total(100) == 22.5
+
+
+def test_missed_weeks_are_nan():
+    stats = load_weekly_stats(_league([_player(100, 2, [10.0])]), [100])
+    assert math.isnan(stats.series(100, POINTS)[1])
+
+
+def test_defenses_get_weekly_stats_but_empty_slots_are_skipped():
+    league = _league([_player(-16002, 16, [8.0, 4.0, 6.0])])
+    stats = load_weekly_stats(league, [-16002, -1, None])
+    assert league.espn_request.batches == [[-16002]]
+    assert stats.season_total(-16002) == 18.0
+
+
+def test_dropped_defenses_keep_their_points_and_position():
+    league = _league([_player(-16002, 16, [8.0, 4.0, 6.0])])
+    points, positions = season_points(league, [-16002])
+    assert points[-16002] == 18.0
+    assert positions[-16002] == "D/ST"
@@ -0,0 +1,240 @@
+import json
+import random
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+from replay import adapter_from_environment
+
+# --- Configuration ---
+# Connections kept open per host. Raise it when running many leagues in parallel.
+POOL_SIZE = 32
+
+# The default limit on requests per second across all threads (None for no limit).
+DEFAULT_RATE_LIMIT = None
+
+# (connect, read) timeouts in seconds for every request.
+DEFAULT_TIMEOUT = (10, 60)
+
+# Failed requests are retried up to MAX_RETRIES times. Before retry n the caller
+# sleeps a random time between 0 and min(BACKOFF_MAX, BACKOFF_BASE * 2 ** n) seconds,
+# or as long as a Retry-After header asks (capped at BACKOFF_MAX).
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# Responses worth retrying: rate limiting and server-side failures.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchError(requests.exceptions.RequestException):
+    """Raised when an ESPN request still fails after every retry."""
+
+    def __init__(self, message: str, url: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+
+
+class FetchTimeout(FetchError):
+    """Every attempt at the request timed out or lost its connection."""
+
+
+class FetchStatusError(FetchError):
+    """The server kept answering with a retryable error status (see RETRY_STATUSES)."""
+
+
+class _NoStoredCookies(DefaultCookiePolicy):
+    """
+    Keeps the shared session from remembering cookies set by responses, so one
+    league's credentials never leak into requests made for another league.
+    Cookies passed explicitly with each request are still sent.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+class RateLimiter:
+    """
+    A token bucket shared by all threads: `rate` tokens are added per second, up
+    to `burst`, and every request takes one. Callers that find the bucket empty
+    reserve the next token and sleep until it arrives, so waiting threads are
+    served in order without holding the lock while they sleep.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        self._lock = threading.Lock()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: Optional[float], burst: int = 1):
+        with self._lock:
+            self._rate = rate or 0.0
+            self._burst = max(1, burst)
+            self._tokens = float(self._burst)
+            self._updated = time.monotonic()
+
+    def wait(self):
+        if not self._rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_rate_limiter = RateLimiter(DEFAULT_RATE_LIMIT)
+
+# Requests in flight, by request key, so identical concurrent requests share one response
+_in_flight: Dict[Tuple[str, ...], "_PendingRequest"] = {}
+_in_flight_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.cookies.set_policy(_NoStoredCookies())
+            # ESPN_REPLAY_DIR / ESPN_RECORD_DIR swap in a fixture-backed adapter (see replay.py)
+            adapter = (adapter_from_environment(POOL_SIZE)
+                       or HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def set_rate_limit(rate: Optional[float], burst: int = 1):
+    """
+    Limits the whole process to `rate` requests per second (None removes the limit),
+    allowing up to `burst` requests at once after a quiet period.
+    """
+    _rate_limiter.set_rate(rate, burst)
+
+
+def _view_label(url: str, params: Optional[dict]) -> str:
+    """Names a request by its ESPN view, falling back to the last path segment of the URL."""
+    view = (params or {}).get("view")
+    if not view and "view=" in url:
+        view = url.rsplit("view=", 1)[-1]
+    if isinstance(view, (list, tuple)):
+        view = "+".join(view)
+    return view or url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _backoff_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if given, else full-jitter backoff."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # An HTTP date; fall back to the computed backoff
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _get_with_retries(url: str, params: Optional[dict], headers: Optional[dict], cookies: Optional[dict],
+                      stream: bool) -> requests.Response:
+    """
+    Performs a GET, retrying timeouts, dropped connections and RETRY_STATUSES.
+
+    Other error statuses (404, 401, ...) are returned to the caller as they are.
+    :raises FetchTimeout: If every attempt timed out or failed to connect.
+    :raises FetchStatusError: If every attempt got a retryable error status.
+    """
+    view = _view_label(url, params)
+    for attempt in range(MAX_RETRIES + 1):
+        _rate_limiter.wait()
+        start = time.perf_counter()
+        try:
+            response = get_session().get(url, params=params, headers=headers, cookies=cookies, stream=stream,
+                                         timeout=DEFAULT_TIMEOUT)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            instrumentation.record_request(view, time.perf_counter() - start, 0)
+            if attempt == MAX_RETRIES:
+                raise FetchTimeout(f"Request for '{view}' failed after {attempt + 1} attempts: {e}", url) from e
+            delay = _backoff_delay(attempt)
+        else:
+            nbytes = 0 if stream else len(response.content)
+            instrumentation.record_request(view, time.perf_counter() - start, nbytes)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == MAX_RETRIES:
+                response.close()
+                raise FetchStatusError(f"Request for '{view}' failed after {attempt + 1} attempts "
+                                       f"with HTTP {response.status_code}.", url, response.status_code)
+            delay = _backoff_delay(attempt, response)
+            response.close()
+        instrumentation.count("retries")
+        time.sleep(delay)
+
+
+class _PendingRequest:
+    """A request in flight that identical concurrent requests wait on instead of sending their own."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+def _request_key(url: str, params: Optional[dict], headers: Optional[dict],
+                 cookies: Optional[dict]) -> Tuple[str, ...]:
+    return (url,) + tuple(json.dumps(part, sort_keys=True, default=str) for part in (params, headers, cookies))
+
+
+def http_get(url: str, params: dict = None, headers: dict = None, cookies: dict = None,
+             stream: bool = False) -> requests.Response:
+    """
+    Performs a GET through the shared session, honouring the global rate limit.
+
+    Requests time out after DEFAULT_TIMEOUT and transient failures are retried
+    with jittered exponential backoff (see MAX_RETRIES). Identical requests made
+    at the same time by several threads are coalesced: one is sent and the
+    others receive its response. Streamed requests are never coalesced, since
+    their body can only be read once.
+
+    Each request is recorded in instrumentation under its ESPN view. Streamed
+    bodies are not read here, so callers using stream=True count their own bytes.
+
+    :raises FetchError: If the request still fails after every retry.
+    """
+    if stream:
+        return _get_with_retries(url, params, headers, cookies, stream=True)
+
+    key = _request_key(url, params, headers, cookies)
+    with _in_flight_lock:
+        pending = _in_flight.get(key)
+        leader = pending is None
+        if leader:
+            pending = _in_flight[key] = _PendingRequest()
+    if not leader:
+        instrumentation.count("coalesced_requests")
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.response
+
+    try:
+        pending.response = _get_with_retries(url, params, headers, cookies, stream=False)
+        return pending.response
+    except BaseException as e:
+        pending.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        pending.done.set()
@@ -0,0 +1,277 @@
+import datetime
+import os
+import sqlite3
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from espn_api.football import League
+from player_index import PlayerRecord, resolve_players
+
+# Where the warehouse lives. Override with the ESPN_WAREHOUSE environment variable.
+DEFAULT_WAREHOUSE_PATH = "espn_warehouse.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    scoring_period INTEGER,
+    complete INTEGER NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (league_id, season)
+);
+CREATE TABLE IF NOT EXISTS teams (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    name TEXT,
+    PRIMARY KEY (league_id, season, team_id)
+);
+CREATE TABLE IF NOT EXISTS picks (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    overall INTEGER NOT NULL,
+    round INTEGER,
+    round_pick INTEGER,
+    team_id INTEGER,
+    player_id INTEGER,
+    keeper INTEGER NOT NULL,
+    PRIMARY KEY (league_id, season, overall)
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    lineup_slot TEXT,
+    total_points REAL,
+    PRIMARY KEY (league_id, season, team_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS keepers (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    PRIMARY KEY (league_id, season, team_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT,
+    position TEXT,
+    pro_team TEXT,
+    season INTEGER
+);
+CREATE INDEX IF NOT EXISTS picks_by_player ON picks (league_id, player_id, team_id);
+CREATE INDEX IF NOT EXISTS rosters_by_player ON rosters (league_id, player_id);
+"""
+
+
+def warehouse_path() -> str:
+    return os.environ.get("ESPN_WAREHOUSE", DEFAULT_WAREHOUSE_PATH)
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """Opens the warehouse, creating its tables on first use."""
+    conn = sqlite3.connect(path or warehouse_path())
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# --- Sync ---
+
+def needs_sync(conn: sqlite3.Connection, league_id: int, season: int, scoring_period: int = None,
+               picks: int = None) -> bool:
+    """
+    Completed seasons are synced once. A season in progress is synced again when
+    its scoring period has moved on since the last sync, or when its number of
+    draft picks has changed (the draft happens before the first period ends).
+    Without the current `scoring_period`, a season in progress is always synced.
+
+    :param scoring_period: The season's current scoringPeriodId, if known.
+    :param picks: The number of picks in the season's draft so far, if known.
+    """
+    row = conn.execute(
+        "SELECT complete, scoring_period FROM seasons WHERE league_id = ? AND season = ?", (league_id, season)
+    ).fetchone()
+    if row is None:
+        return True
+    complete, stored_period = row
+    if complete:
+        return False
+    if scoring_period is None or stored_period != scoring_period:
+        return True
+    if picks is not None:
+        stored_picks = conn.execute(
+            "SELECT COUNT(*) FROM picks WHERE league_id = ? AND season = ?", (league_id, season)
+        ).fetchone()[0]
+        return stored_picks != picks
+    return False
+
+
+def store_season(conn: sqlite3.Connection, league: League, keeper_data: Optional[dict] = None):
+    """
+    Replaces everything stored for one season with the contents of a loaded League.
+
+    The season is stored as complete only if the league was built from views
+    fetched after the season ended (see common.create_league); a copy cached
+    while it was in progress is synced again next time.
+
+    :param keeper_data: Optional. The season's mKeeperRosters response (see
+                        get_keepers.fetch_keeper_json) for recording keeper selections.
+    """
+    league_id, season = league.league_id, league.year
+    complete = getattr(league, "fetched_final", False)
+    players: Dict[int, PlayerRecord] = {}
+
+    with conn:
+        for table in ("teams", "picks", "rosters", "keepers"):
+            conn.execute(f"DELETE FROM {table} WHERE league_id = ? AND season = ?", (league_id, season))
+
+        conn.executemany(
+            "INSERT INTO teams VALUES (?, ?, ?, ?)",
+            [(league_id, season, team.team_id, team.team_name) for team in league.teams],
+        )
+        conn.executemany(
+            "INSERT INTO picks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (league_id, season, overall, pick.round_num, pick.round_pick,
+                 pick.team.team_id if pick.team else 0, pick.playerId, 1 if pick.keeper_status else 0)
+                for overall, pick in enumerate(league.draft or [], start=1)
+            ],
+        )
+
+        roster_rows = []
+        for team in league.teams:
+            for player in team.roster:
+                roster_rows.append((league_id, season, team.team_id, player.playerId,
+                                    getattr(player, "lineupSlot", ""), getattr(player, "total_points", 0)))
+                players[player.playerId] = PlayerRecord(
+                    player.playerId, player.name, getattr(player, "position", "N/A"),
+                    getattr(player, "proTeam", "N/A"), season,
+                )
+        conn.executemany("INSERT OR REPLACE INTO rosters VALUES (?, ?, ?, ?, ?, ?)", roster_rows)
+
+        keeper_rows = []
+        for team in (keeper_data or {}).get("teams", []):
+            for player_id in team.get("draftStrategy", {}).get("keeperPlayerIds", []):
+                keeper_rows.append((league_id, season, team.get("id"), player_id))
+        conn.executemany("INSERT OR REPLACE INTO keepers VALUES (?, ?, ?, ?)", keeper_rows)
+
+        # Drafted or kept players who are no longer rostered still need names
+        unknown = [pick.playerId for pick in league.draft or [] if pick.playerId not in players]
+        unknown += [row[3] for row in keeper_rows if row[3] not in players]
+        players.update(resolve_players(league, unknown))
+
+        # Keep the most recent season's details for each player
+        conn.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (player_id) DO UPDATE SET name = excluded.name, position = excluded.position, "
+            "pro_team = excluded.pro_team, season = excluded.season WHERE excluded.season >= players.season",
+            [tuple(record[:5]) for record in players.values()],
+        )
+
+        conn.execute(
+            "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?, ?)",
+            (league_id, season, getattr(league, "scoringPeriodId", None), 1 if complete else 0,
+             datetime.datetime.now().isoformat(timespec="seconds")),
+        )
+
+
+def synced_seasons(conn: sqlite3.Connection, league_id: int) -> List[int]:
+    """Returns the seasons stored for a league, most recent first."""
+    rows = conn.execute("SELECT season FROM seasons WHERE league_id = ? ORDER BY season DESC", (league_id,))
+    return [row[0] for row in rows]
+
+
+# --- Reading the warehouse back as League-like objects ---
+
+class WarehouseTeam(NamedTuple):
+    team_id: int
+    team_name: str
+    roster: list
+
+
+class WarehousePlayer(NamedTuple):
+    playerId: int
+    name: str
+    position: str
+    proTeam: str
+    total_points: float
+    lineupSlot: str
+
+
+class WarehousePick(NamedTuple):
+    team: Optional[WarehouseTeam]
+    playerId: int
+    round_num: int
+    round_pick: int
+    keeper_status: bool
+
+
+class WarehouseLeague:
+    """
+    A read-only stand-in for espn_api's League, built from one warehouse season.
+
+    It exposes the attributes the report scripts use (year, teams with rosters,
+    draft and player_info), so they run unchanged without any network access.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, league_id: int, season: int):
+        self.league_id = league_id
+        self.year = season
+        self._conn = conn
+
+        teams = {
+            team_id: WarehouseTeam(team_id, name, [])
+            for team_id, name in conn.execute(
+                "SELECT team_id, name FROM teams WHERE league_id = ? AND season = ? ORDER BY team_id",
+                (league_id, season),
+            )
+        }
+        self.teams = list(teams.values())
+
+        for team_id, player_id, slot, points, name, position, pro_team in conn.execute(
+            "SELECT r.team_id, r.player_id, r.lineup_slot, r.total_points, p.name, p.position, p.pro_team "
+            "FROM rosters r LEFT JOIN players p ON p.player_id = r.player_id "
+            "WHERE r.league_id = ? AND r.season = ? ORDER BY r.rowid",
+            (league_id, season),
+        ):
+            teams[team_id].roster.append(WarehousePlayer(
+                player_id, name or f"Unknown (ID: {player_id})", position or "N/A", pro_team or "N/A", points or 0, slot,
+            ))
+
+        self.draft = [
+            WarehousePick(teams.get(team_id), player_id, round_num, round_pick, bool(keeper))
+            for team_id, player_id, round_num, round_pick, keeper in conn.execute(
+                "SELECT team_id, player_id, round, round_pick, keeper FROM picks "
+                "WHERE league_id = ? AND season = ? ORDER BY overall",
+                (league_id, season),
+            )
+        ]
+
+    def player_info(self, playerId=None):
+        """Answers player lookups from the warehouse's players table, like League.player_info."""
+        ids = playerId if isinstance(playerId, list) else [playerId]
+        placeholders = ",".join("?" * len(ids))
+        players = [
+            WarehousePlayer(player_id, name, position, pro_team, 0, "")
+            for player_id, name, position, pro_team in self._conn.execute(
+                f"SELECT player_id, name, position, pro_team FROM players WHERE player_id IN ({placeholders})", ids,
+            )
+        ]
+        if not players:
+            return None
+        return players if isinstance(playerId, list) else players[0]
+
+
+def load_league(league_id: int, season: int, path: str = None) -> Optional[WarehouseLeague]:
+    """Returns a season from the warehouse, or None if it has not been synced."""
+    conn = connect(path)
+    if season not in synced_seasons(conn, league_id):
+        return None
+    return WarehouseLeague(conn, league_id, season)
+
+
+def load_leagues(league_id: int, seasons: Iterable[int], path: str = None) -> Dict[int, WarehouseLeague]:
+    """Returns every requested season that has been synced, keyed by year."""
+    conn = connect(path)
+    available = set(synced_seasons(conn, league_id))
+    return {season: WarehouseLeague(conn, league_id, season) for season in seasons if season in available}
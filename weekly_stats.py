@@ -0,0 +1,243 @@
+import math
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from espn_api.football import League
+import instrumentation
+from player_index import PLAYER_BATCH_SIZE, is_player_id
+from transport import FetchError
+
+# --- Configuration ---
+# ESPN stat blocks: statSourceId 0 is actual and 1 is projected; statSplitTypeId 0 is the
+# season total and 1 a single scoring period.
+ACTUAL_SOURCE = 0
+PROJECTED_SOURCE = 1
+SEASON_SPLIT = 0
+WEEKLY_SPLIT = 1
+
+# The stats kept for every player and week, in store order.
+STATS = ("points", "projected")
+POINTS, PROJECTED = range(len(STATS))
+
+# Scoring periods kept per season (regular season and playoffs).
+MAX_WEEKS = 18
+
+# ESPN's defaultPositionId for each fantasy position.
+POSITIONS = {1: "QB", 2: "RB", 3: "WR", 4: "TE", 5: "K", 16: "D/ST"}
+
+# Starters per team at each position. The replacement level at a position is the
+# points per game of the player ranked (teams x starters) there.
+REPLACEMENT_STARTERS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "D/ST": 1}
+
+DEFAULT_ROLLING_WINDOW = 3
+
+_MISSING = float("nan")
+
+
+class PlayerAggregates(NamedTuple):
+    """A player's weekly scoring summarized over one season."""
+    player_id: int
+    position: str
+    games: int
+    total: float
+    per_game: float
+    std_dev: float
+    above_replacement: float
+
+
+class WeeklyStats:
+    """
+    A compact player x week x stat store of one season's scoring.
+
+    Every value lives in a single flat array of doubles, laid out row by row as
+    [player][week][stat], with NaN marking a week the player did not play. A
+    player's weekly series for one stat is a strided slice of that array, so the
+    aggregates below read whole columns at a time instead of walking dicts.
+    """
+
+    def __init__(self, season: int, weeks: int = MAX_WEEKS):
+        self.season = season
+        self.weeks = weeks
+        self.player_ids = array("l")
+        self.positions: List[str] = []
+        self.values = array("d")
+        # Actual season totals as ESPN reports them, for players whose weekly blocks are missing
+        self.season_totals: Dict[int, float] = {}
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._rows
+
+    def _row(self, player_id: int, position: str = "N/A") -> int:
+        row = self._rows.get(player_id)
+        if row is None:
+            row = self._rows[player_id] = len(self.player_ids)
+            self.player_ids.append(player_id)
+            self.positions.append(position)
+            self.values.extend(array("d", [_MISSING]) * (self.weeks * len(STATS)))
+        elif position != "N/A":
+            self.positions[row] = position
+        return row
+
+    def set(self, player_id: int, week: int, stat: int, value: float, position: str = "N/A"):
+        """Stores one stat for one week (1-based). Weeks beyond the store's range are ignored."""
+        if 1 <= week <= self.weeks:
+            row = self._row(player_id, position)
+            self.values[(row * self.weeks + week - 1) * len(STATS) + stat] = value
+
+    # --- Ingestion ---
+
+    def add_player(self, player: Dict[str, Any]):
+        """
+        Reads the weekly stat blocks of one raw ESPN player object, as found in
+        kona_playercard responses and in mRoster/mKeeperRosters roster entries.
+        The actual season total is kept in season_totals; other seasons' blocks are skipped.
+        """
+        player_id = player.get("id")
+        if player_id is None:
+            return
+        position = POSITIONS.get(player.get("defaultPositionId"), "N/A")
+        self._row(player_id, position)
+        for block in player.get("stats") or ():
+            if block.get("seasonId") != self.season:
+                continue
+            source = block.get("statSourceId")
+            if block.get("statSplitTypeId") == SEASON_SPLIT:
+                if source == ACTUAL_SOURCE and block.get("appliedTotal") is not None:
+                    self.season_totals[player_id] = block["appliedTotal"]
+                continue
+            if block.get("statSplitTypeId") != WEEKLY_SPLIT:
+                continue
+            stat = POINTS if source == ACTUAL_SOURCE else PROJECTED if source == PROJECTED_SOURCE else None
+            if stat is not None and block.get("appliedTotal") is not None:
+                self.set(player_id, block.get("scoringPeriodId") or 0, stat, block["appliedTotal"], position)
+
+    def add_payload(self, payload: Dict[str, Any]):
+        """Ingests every player in a kona_playercard response or a league view with rosters."""
+        for entry in payload.get("players") or ():
+            self.add_player(entry.get("player") or entry)
+        for team in payload.get("teams") or ():
+            for entry in (team.get("roster") or {}).get("entries") or ():
+                self.add_player((entry.get("playerPoolEntry") or {}).get("player") or {})
+
+    # --- Queries ---
+
+    def series(self, player_id: int, stat: int = POINTS) -> List[float]:
+        """Returns a player's value for each week (NaN for weeks not played), or [] if unknown."""
+        row = self._rows.get(player_id)
+        if row is None:
+            return []
+        width = len(STATS)
+        start = row * self.weeks * width + stat
+        return list(self.values[start:start + self.weeks * width:width])
+
+    def season_total(self, player_id: int, stat: int = POINTS) -> Optional[float]:
+        """
+        Returns a player's season points: the sum of their weekly values, or ESPN's
+        season total if no weekly values are stored. None if the player is unknown.
+        """
+        played = [value for value in self.series(player_id, stat) if not math.isnan(value)]
+        if played:
+            return math.fsum(played)
+        return self.season_totals.get(player_id) if stat == POINTS else None
+
+    def rolling_average(self, player_id: int, window: int = DEFAULT_ROLLING_WINDOW,
+                        stat: int = POINTS) -> List[Optional[float]]:
+        """
+        Returns, for each week, the average of the player's last `window` games up
+        to and including that week (None until they have played one).
+        """
+        averages: List[Optional[float]] = []
+        recent: List[float] = []
+        for value in self.series(player_id, stat):
+            if not math.isnan(value):
+                recent.append(value)
+                if len(recent) > window:
+                    recent.pop(0)
+            averages.append(sum(recent) / len(recent) if recent else None)
+        return averages
+
+    def _rows_summary(self, stat: int) -> Iterator[PlayerAggregates]:
+        """Summarizes every player's weekly series, with above_replacement left at 0."""
+        width = len(STATS)
+        stride = self.weeks * width
+        values = self.values
+        for row, player_id in enumerate(self.player_ids):
+            played = [value for value in values[row * stride + stat:(row + 1) * stride:width] if value == value]
+            games = len(played)
+            total = math.fsum(played)
+            mean = total / games if games else 0.0
+            variance = math.fsum((value - mean) ** 2 for value in played) / games if games else 0.0
+            yield PlayerAggregates(player_id, self.positions[row], games, total, mean, math.sqrt(variance), 0.0)
+
+    def aggregates(self, teams: int, stat: int = POINTS) -> Dict[int, PlayerAggregates]:
+        """
+        Returns points per game, their standard deviation (lower is more consistent)
+        and points above replacement for every player in the store.
+
+        Replacement level is set per position from REPLACEMENT_STARTERS and the
+        number of `teams`: a player's points above replacement is their points per
+        game over that level, times the games they played.
+        """
+        summaries = list(self._rows_summary(stat))
+        by_position = defaultdict(list)
+        for summary in summaries:
+            if summary.games:
+                by_position[summary.position].append(summary.per_game)
+
+        replacement = {}
+        for position, per_game in by_position.items():
+            per_game.sort(reverse=True)
+            rank = teams * REPLACEMENT_STARTERS.get(position, 1)
+            replacement[position] = per_game[min(rank, len(per_game)) - 1]
+
+        return {
+            summary.player_id: summary._replace(
+                above_replacement=(summary.per_game - replacement[summary.position]) * summary.games
+                if summary.games else 0.0)
+            for summary in summaries
+        }
+
+
+def load_weekly_stats(league: League, player_ids: Iterable[int]) -> WeeklyStats:
+    """
+    Fetches the season's weekly stats for the given players into a WeeklyStats store.
+
+    Players are requested PLAYER_BATCH_SIZE at a time through the league's player
+    card view, which goes through the response cache, so a completed season is
+    only ever downloaded once. Leagues read from the warehouse have no ESPN
+    connection and return an empty store. A batch that fails after every retry
+    raises FetchError.
+    """
+    weeks = getattr(league, "finalScoringPeriod", None) or MAX_WEEKS
+    store = WeeklyStats(league.year, weeks)
+    request = getattr(league, "espn_request", None)
+    if request is None:
+        print("Warning: Weekly stats are only available for seasons loaded from ESPN.")
+        return store
+
+    wanted = list(dict.fromkeys(pid for pid in player_ids if is_player_id(pid)))
+    for start in range(0, len(wanted), PLAYER_BATCH_SIZE):
+        batch = wanted[start:start + PLAYER_BATCH_SIZE]
+        try:
+            with instrumentation.stage("weekly_stats"):
+                store.add_payload(request.get_player_card(batch, weeks) or {})
+        except FetchError:
+            raise  # Failed after every retry; run_script or the batch runner reports it
+        except Exception as e:
+            print(f"Warning: Could not fetch weekly stats for {len(batch)} players. Error: {e}")
+    return store
+
+
+def league_aggregates(league: League, extra_player_ids: Iterable[int] = ()) -> Dict[int, PlayerAggregates]:
+    """
+    Loads weekly stats for every rostered player (plus `extra_player_ids`) and
+    returns their season aggregates, ready to join into a report by player ID.
+    """
+    player_ids = [player.playerId for team in league.teams for player in team.roster]
+    player_ids += list(extra_player_ids)
+    return load_weekly_stats(league, player_ids).aggregates(teams=len(league.teams))